@@ -2,33 +2,58 @@
 API Dependencies Module
 """
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
-from app.api.v1.endpoints.auth import get_current_user
-from app.models.user import UserModel
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.endpoints.auth import get_current_principal
+from app.core.database import get_async_db, get_replica_sessionmaker
+from app.core.read_routing import READ_PRIMARY_COOKIE, reads_pinned_to_primary
+from app.core.permissions import permission_registry
+from app.core.principal import Principal
 
-def check_permission(required_permission: str):
+def require_permissions(*required_permissions: str):
     """
-    Dependency to check if the current user has the required permission.
+    Dependency to check that the current user holds all of the given permissions.
+    The requirement is compiled once, so each request is a single mask check.
     """
-    def dependency(
-        current_user: Annotated[UserModel, Depends(get_current_user)],
-    ) -> UserModel:
-        # Admin has all permissions
-        if current_user.role and current_user.role.name == "admin":
-            return current_user
-
-        # Check specific permission
-        user_permissions = []
-        if current_user.role and current_user.role.permissions:
-            user_permissions = [p.strip() for p in current_user.role.permissions.split(",")]
+    required_mask = permission_registry.mask(required_permissions)
+    detail = f"Not enough permissions. Required: {', '.join(required_permissions)}"
 
-        if required_permission not in user_permissions:
+    def dependency(
+        principal: Annotated[Principal, Depends(get_current_principal)],
+    ) -> Principal:
+        # Admin has all permissions (compiled to a mask with every bit set)
+        if not principal.has_permissions(required_mask):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Not enough permissions. Required: {required_permission}",
+                detail=detail,
             )
-        return current_user
+        return principal
     return dependency
 
+def check_permission(required_permission: str):
+    """
+    Dependency to check if the current user has the required permission.
+    """
+    return require_permissions(required_permission)
+
+async def get_read_db(
+    request: Request,
+    principal: Annotated[Principal, Depends(get_current_principal)],
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Dependency for read-only endpoints. Yields a replica session when a replica
+    is configured, unless the user wrote recently (read-your-writes), in which
+    case the primary session is used.
+    """
+    replica_sessionmaker = get_replica_sessionmaker()
+    if replica_sessionmaker is None or reads_pinned_to_primary(
+        str(principal.id), request.cookies.get(READ_PRIMARY_COOKIE)
+    ):
+        yield db
+        return
+    async with replica_sessionmaker() as replica_db:
+        yield replica_db
+
 # Helper for endpoints that just need any valid user but we might expand logic later
-# For now, get_current_user is sufficient for authentication.
+# For now, get_current_principal is sufficient for authentication.
@@ -1,16 +1,27 @@
 """
 Authentication Endpoints Module
 """
-from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import timedelta
+from typing import Annotated, Dict, Iterable, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from jose import JWTError
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.principal import (
+    Principal,
+    is_token_revoked,
+    principal_cache,
+    record_token_versions,
+)
 from app.core.security import (
-    verify_password,
+    PasswordHashQueueFullError,
+    verify_password_async,
     create_access_token,
     decode_access_token,
 )
@@ -28,33 +39,87 @@ router = APIRouter(
 )
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[UserModel]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserModel]:
     """
     Retrieve a user by email from the database.
     """
-    return db.query(UserModel).filter(UserModel.email == email).first()
+    return await db.scalar(select(UserModel).where(UserModel.email == email).limit(1))
+
 
+async def _get_user_with_role(db: AsyncSession, **filters) -> Optional[UserModel]:
+    return await db.scalar(
+        select(UserModel)
+        .options(joinedload(UserModel.role))
+        .filter_by(**filters)
+        .limit(1)
+    )
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[UserModel]:
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[UserModel]:
     """
     Authenticate a user by checking email and password.
+    Hashing runs on the bounded hashing pool so it never blocks the event loop.
     """
-    user = get_user_by_email(db, email=email)
+    user = await _get_user_with_role(db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
     if not user.is_active:
         return None
     return user
 
 
-async def get_current_user(
+async def revoke_user_tokens(db: AsyncSession, user_ids: Iterable[UUID]) -> None:
+    """
+    Bump the token version of users so stateless tokens issued to them before
+    now are rejected. Only needed with AUTH_STATELESS: otherwise every request
+    re-reads the principal from the database.
+    """
+    user_ids = list(user_ids)
+    if not settings.AUTH_STATELESS or not user_ids:
+        return
+    await db.execute(
+        update(UserModel)
+        .where(UserModel.id.in_(user_ids))
+        .values(token_version=UserModel.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    rows = await db.execute(
+        select(UserModel.id, UserModel.token_version).where(UserModel.id.in_(user_ids))
+    )
+    versions: Dict[UUID, Optional[int]] = dict(rows.all())
+    record_token_versions(versions)
+
+
+async def _is_token_revoked(db: AsyncSession, user_id: str, version: int) -> bool:
+    """
+    Check a stateless token's version against the user's row, read at most once
+    per PRINCIPAL_CACHE_TTL_SECONDS so revocations reach every worker.
+    """
+    revoked = is_token_revoked(user_id, version)
+    if revoked is None:
+        row = (await db.execute(
+            select(UserModel.token_version, UserModel.is_active)
+            .where(UserModel.id == UUID(user_id))
+        )).first()
+        current = (row.token_version or 0) if row is not None and row.is_active else None
+        record_token_versions({UUID(user_id): current})
+        revoked = is_token_revoked(user_id, version)
+    return revoked
+
+
+async def get_current_principal(
+    request: Request,
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db),
-) -> UserModel:
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
     """
-    Dependency to get the current authenticated user from the JWT token.
+    Dependency to get the authenticated principal from the JWT token.
+    Principals are cached in-process, so most requests need no auth queries.
+    With AUTH_STATELESS, tokens carrying identity claims are authorized from
+    the claims; only the user's token version is read, through a TTL cache.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,35 +135,78 @@ async def get_current_user(
     except JWTError as exc:
         raise credentials_exception from exc
 
-    user = get_user_by_email(db, email=email)
-    if user is None:
+    if settings.AUTH_STATELESS and "uid" in payload and "ver" in payload:
+        try:
+            if await _is_token_revoked(db, payload["uid"], payload["ver"]):
+                raise credentials_exception
+            principal = Principal.from_claims(payload)
+        except (TypeError, ValueError) as exc:
+            raise credentials_exception from exc
+        request.state.principal_id = str(principal.id)
+        return principal
+
+    principal = principal_cache.get(email)
+    if principal is None:
+        user = await _get_user_with_role(db, email=email)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(email, principal)
+
+    if not principal.is_active:
         raise credentials_exception
+    # Lets ReadYourWritesMiddleware attribute writes to the principal
+    request.state.principal_id = str(principal.id)
+    return principal
+
+async def get_current_user(
+    principal: Annotated[Principal, Depends(get_current_principal)],
+    db: AsyncSession = Depends(get_async_db),
+) -> UserModel:
+    """
+    Dependency to load the full user record of the authenticated principal.
+    """
+    user = await _get_user_with_role(db, id=principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 async def get_current_admin_user(
-    current_user: Annotated[UserModel, Depends(get_current_user)],
-) -> UserModel:
+    principal: Annotated[Principal, Depends(get_current_principal)],
+) -> Principal:
     """
     Dependency to ensure the current user is an admin.
     """
-    # Assumes UserModel.role relationship is loaded
-    if not current_user.role or current_user.role.name != "admin":
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required.",
         )
-    return current_user
+    return principal
 
 @router.post("/login", response_model=Token, summary="Login and get JWT token")
 async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Token:
     """
     Login endpoint to authenticate users and Issue JWT tokens.
     """
     # We treat "username" field as email
-    user = authenticate_user(db, email=form_data.username, password=form_data.password)
+    try:
+        user = await authenticate_user(
+            db, email=form_data.username, password=form_data.password
+        )
+    except PasswordHashQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -108,10 +216,21 @@ async def login(
 
     role_name = user.role.name if user.role else None
     role_perms = user.role.permissions if user.role else None
+    expires_delta = None
+    if settings.AUTH_STATELESS:
+        # Other workers see revocations only after PRINCIPAL_CACHE_TTL_SECONDS
+        expires_delta = timedelta(minutes=settings.STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=user.email,
         role=role_name,
-        permissions=role_perms
+        permissions=role_perms,
+        expires_delta=expires_delta,
+        extra_claims={
+            "uid": str(user.id),
+            "ver": user.token_version or 0,
+            "rid": str(user.role_id) if user.role_id else None,
+            "name": user.full_name,
+        },
     )
     return Token(access_token=access_token, token_type="bearer")
 
@@ -0,0 +1,52 @@
+"""
+Delivery Metrics Endpoints Module
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import check_permission, get_read_db
+from app.core.principal import Principal
+from app.reports.delivery_metrics import query_delivery_metrics
+from app.schemas.metrics import DeliveryMetrics
+
+router = APIRouter(prefix="/metrics/delivery", tags=["metrics"])
+
+# Longest range one request may aggregate
+MAX_RANGE_DAYS = 731
+
+
+@router.get("/", response_model=DeliveryMetrics)
+async def get_delivery_metrics(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    group_by: List[Literal["day", "service", "environment"]] = Query(["day"]),
+    environment_id: List[UUID] = Query([]),
+    service_id: List[UUID] = Query([]),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Deployment frequency, change failure rate and lead time (release creation
+    to first successful deployment of each service per environment) between
+    `start` and `end` inclusive, defaulting to the last 30 days (UTC).
+    Served from the daily rollups, never from raw deployment history.
+    """
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end",
+        )
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {MAX_RANGE_DAYS} days",
+        )
+    return await query_delivery_metrics(
+        db, start, end, group_by, environment_ids=environment_id, service_ids=service_id
+    )
@@ -5,10 +5,14 @@ API endpoints for managing environments.
 from uuid import UUID
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import get_read_db
+from app.core.database import get_async_db
+from app.core.http_cache import conditional_response, make_etag, table_versions
+from app.core.serialization import json_response
 from app.models.environment import EnvironmentModel
 from app.models.service import ServiceModel  # used to protect deletes
 from app.schemas.environment import (
@@ -24,9 +28,20 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[Environment], summary="List environments")
-def list_environments(db: Session = Depends(get_db)) -> List[Environment]:
-    """List all environments."""
-    return db.query(EnvironmentModel).order_by(EnvironmentModel.name).all()
+async def list_environments(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+) -> List[Environment]:
+    """List all environments; 304 for a current If-None-Match."""
+    etag = make_etag("environments", *await table_versions(db, EnvironmentModel))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    rows = (
+        await db.scalars(select(EnvironmentModel).order_by(EnvironmentModel.name))
+    ).all()
+    return json_response(List[Environment], rows, response)
 
 
 @router.post(
@@ -35,16 +50,16 @@ def list_environments(db: Session = Depends(get_db)) -> List[Environment]:
     status_code=status.HTTP_201_CREATED,
     summary="Create environment",
 )
-def create_environment(
+async def create_environment(
     payload: EnvironmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Environment:
     """Create a new environment."""
     # Enforce unique name
-    existing = (
-        db.query(EnvironmentModel)
-        .filter(EnvironmentModel.name == payload.name)
-        .first()
+    existing = await db.scalar(
+        select(EnvironmentModel)
+        .where(EnvironmentModel.name == payload.name)
+        .limit(1)
     )
     if existing:
         raise HTTPException(
@@ -57,8 +72,8 @@ def create_environment(
         description=payload.description,
     )
     db.add(env)
-    db.commit()
-    db.refresh(env)
+    await db.commit()
+    await db.refresh(env)
     return env
 
 
@@ -67,16 +82,12 @@ def create_environment(
     response_model=Environment,
     summary="Get environment by ID",
 )
-def get_environment(
+async def get_environment(
     environment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Environment:
     """Get specific environment by ID."""
-    env = (
-        db.query(EnvironmentModel)
-        .filter(EnvironmentModel.id == environment_id)
-        .first()
-    )
+    env = await db.get(EnvironmentModel, environment_id)
     if not env:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -90,17 +101,13 @@ def get_environment(
     response_model=Environment,
     summary="Update environment",
 )
-def update_environment(
+async def update_environment(
     environment_id: UUID,
     payload: EnvironmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Environment:
     """Update environment details."""
-    env = (
-        db.query(EnvironmentModel)
-        .filter(EnvironmentModel.id == environment_id)
-        .first()
-    )
+    env = await db.get(EnvironmentModel, environment_id)
     if not env:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -111,10 +118,10 @@ def update_environment(
     data = payload.model_dump(exclude_unset=True)
     new_name = data.get("name")
     if new_name and new_name != env.name:
-        existing = (
-            db.query(EnvironmentModel)
-            .filter(EnvironmentModel.name == new_name)
-            .first()
+        existing = await db.scalar(
+            select(EnvironmentModel)
+            .where(EnvironmentModel.name == new_name)
+            .limit(1)
         )
         if existing:
             raise HTTPException(
@@ -125,8 +132,8 @@ def update_environment(
     for field, value in data.items():
         setattr(env, field, value)
 
-    db.commit()
-    db.refresh(env)
+    await db.commit()
+    await db.refresh(env)
     return env
 
 
@@ -135,16 +142,12 @@ def update_environment(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete environment",
 )
-def delete_environment(
+async def delete_environment(
     environment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> None:
     """Delete environment if unused."""
-    env = (
-        db.query(EnvironmentModel)
-        .filter(EnvironmentModel.id == environment_id)
-        .first()
-    )
+    env = await db.get(EnvironmentModel, environment_id)
     if not env:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,10 +155,10 @@ def delete_environment(
         )
 
     # Protect deletion if services still reference this environment
-    attached_service = (
-        db.query(ServiceModel)
-        .filter(ServiceModel.environment_id == environment_id)
-        .first()
+    attached_service = await db.scalar(
+        select(ServiceModel.id)
+        .where(ServiceModel.environment_id == environment_id)
+        .limit(1)
     )
     if attached_service:
         raise HTTPException(
@@ -163,5 +166,5 @@ def delete_environment(
             detail="Environment has attached services; reassign or remove them before deleting.",
         )
 
-    db.delete(env)
-    db.commit()
+    await db.delete(env)
+    await db.commit()
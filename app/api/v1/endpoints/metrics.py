@@ -0,0 +1,23 @@
+"""
+Internal Metrics Endpoints Module
+"""
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+
+from app.api.v1.endpoints.auth import get_current_admin_user
+from app.core.db_metrics import pool_snapshots
+from app.core.principal import Principal
+from app.schemas.metrics import DatabaseMetrics
+
+router = APIRouter(prefix="/internal/metrics", tags=["metrics"])
+
+
+@router.get("/db", response_model=DatabaseMetrics, summary="Database pool metrics (admin only)")
+async def get_database_metrics(
+    _current_admin: Annotated[Principal, Depends(get_current_admin_user)],
+) -> Any:
+    """
+    Pool size, saturation and checkout wait times of this worker's database pools.
+    """
+    return {"pools": pool_snapshots()}
@@ -1,188 +1,829 @@
 """
 Release Endpoints Module
 """
-from typing import List, Any
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Literal, Optional, Set
 from uuid import UUID
-from io import BytesIO
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-
-from app.core.database import get_db
-from app.models.release import ReleaseModel, DeploymentModel, ReleaseServiceLinkModel
-from app.models.service import ServiceModel # pylint: disable=unused-import
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.events import event_stream_response, release_events
+from app.core.http_cache import (
+    conditional_response,
+    http_date,
+    is_not_modified,
+    make_etag,
+    table_versions,
+    version_columns,
+)
+from app.core.principal import Principal
+from app.core.serialization import json_response
+from app.core.pagination import InvalidCursorError, apply_keyset, build_page
+from app.models.release import (
+    ReleaseModel,
+    DeploymentHistoryArchiveModel,
+    DeploymentHistoryModel,
+    DeploymentModel,
+    ReleaseServiceLinkModel,
+    deployment_history_rows,
+    release_loader_options,
+    upsert_deployments,
+)
 from app.models.environment import EnvironmentModel
+from app.models.service import ServiceModel
 from app.models.user import UserModel
-from app.api.v1.dependencies import check_permission
-from app.schemas.release import Release, ReleaseCreate, ReleaseUpdate, Deployment, DeploymentCreate
+from app.api.v1.dependencies import check_permission, get_read_db
+from app.reports.jobs import ReportQueueFullError, report_jobs
+from app.reports.pdf import render_release_report
+from app.reports.release_report import (
+    build_report_context,
+    invalidate_report,
+    report_cache,
+    report_version,
+)
+from app.reports.delivery_metrics import record_deployments
+from app.reports.rollout import build_rollouts
+from app.schemas.release import (
+    Release,
+    ReleaseCreate,
+    ReleaseServiceLinkCreate,
+    ReleaseUpdate,
+    ReleaseUpdateResult,
+    ServiceLinkChanges,
+    ReleaseSummary,
+    ReleaseRollout,
+    ReportJob,
+    Deployment,
+    DeploymentCreate,
+    DeploymentHistoryEntry,
+    BulkDeploymentCreate,
+)
+from app.schemas.pagination import CursorPage
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Release])
-def list_releases(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:releases"))
+ReleaseSort = Literal["created_at", "planned_release_date", "name"]
+SortOrder = Literal["asc", "desc"]
+
+# Sort key -> (column, nullable). Each is backed by a (column, id) index.
+RELEASE_SORT_COLUMNS = {
+    "created_at": (ReleaseModel.created_at, False),
+    "planned_release_date": (ReleaseModel.planned_release_date, True),
+    "name": (ReleaseModel.name, False),
+}
+
+# Rows per multi-row link INSERT, well under driver bind parameter limits
+LINK_INSERT_BATCH_SIZE = 1000
+
+
+def release_event(event_type: str, release_id: UUID, data: Any) -> dict:
+    """An event for the release stream; `data` carries the change itself."""
+    return {"type": event_type, "release_id": str(release_id), "data": data}
+
+
+async def record_deployment_history(db: AsyncSession, deployments: List[Any], action: str):
+    """Append stored (or just deleted) deployment rows to the history log."""
+    if deployments:
+        await db.execute(
+            insert(DeploymentHistoryModel).values(deployment_history_rows(deployments, action))
+        )
+
+
+async def touch_release(db: AsyncSession, release_id: UUID) -> None:
+    """
+    Bump a release's updated_at after a change to its links or deployments,
+    and drop its cached report.
+    """
+    await db.execute(
+        update(ReleaseModel)
+        .where(ReleaseModel.id == release_id)
+        .values(updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    invalidate_report(release_id)
+
+
+async def load_release(db: AsyncSession, release_id: UUID, profile: str = "detail"):
+    """
+    Load a release with the relationships of a loader profile, or None.
+    Already-loaded instances are refreshed so the profile's eager loads apply.
+    """
+    return await db.scalar(
+        select(ReleaseModel)
+        .options(*release_loader_options(profile))
+        .where(ReleaseModel.id == release_id)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def get_release_or_404(db: AsyncSession, release_id: UUID) -> ReleaseModel:
+    """
+    Load a bare release row, or raise 404.
+    """
+    release = await db.get(ReleaseModel, release_id)
+    if not release:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
+        )
+    return release
+
+
+def ensure_unique_services(links: List[ReleaseServiceLinkCreate]) -> Set[UUID]:
+    """
+    Return the service ids of release links, or raise 400 if one repeats.
+    """
+    counts = Counter(link.service_id for link in links)
+    duplicates = [service_id for service_id, count in counts.items() if count > 1]
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Services listed more than once: "
+            + ", ".join(sorted(str(service_id) for service_id in duplicates)),
+        )
+    return set(counts)
+
+
+async def get_services_or_400(
+    db: AsyncSession, links: List[ReleaseServiceLinkCreate]
+) -> Dict[UUID, ServiceModel]:
+    """
+    Load the services referenced by release links in one query, or raise 400
+    for duplicate or unknown service ids.
+    """
+    unique_ids = ensure_unique_services(links)
+    if not unique_ids:
+        return {}
+
+    services = {
+        service.id: service
+        for service in await db.scalars(
+            select(ServiceModel).where(ServiceModel.id.in_(unique_ids))
+        )
+    }
+    if len(services) != len(unique_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Services not found: "
+            + ", ".join(sorted(str(service_id) for service_id in unique_ids - set(services))),
+        )
+    return services
+
+
+async def get_users_or_400(
+    db: AsyncSession, assignments: Dict[str, Optional[UUID]]
+) -> Dict[str, Optional[UserModel]]:
+    """
+    Resolve release role assignments (relationship name -> user id) to users in
+    one query, or raise 400 for unknown ids.
+    """
+    user_ids = {user_id for user_id in assignments.values() if user_id is not None}
+    users = {
+        user.id: user
+        for user in await db.scalars(select(UserModel).where(UserModel.id.in_(user_ids)))
+    } if user_ids else {}
+    if len(users) != len(user_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Users not found: "
+            + ", ".join(sorted(str(user_id) for user_id in user_ids - set(users))),
+        )
+    return {
+        relationship: users[user_id] if user_id is not None else None
+        for relationship, user_id in assignments.items()
+    }
+
+
+async def insert_service_links(
+    db: AsyncSession, release_id: UUID, links: List[ReleaseServiceLinkCreate]
+) -> List[ReleaseServiceLinkModel]:
+    """
+    Insert service links of a release with multi-row INSERTs and return them
+    as (unattached) model instances.
+    """
+    rows = [
+        {
+            "release_id": release_id,
+            "service_id": link.service_id,
+            "pipeline_link": link.pipeline_link,
+            "version": link.version,
+        }
+        for link in links
+    ]
+    for start in range(0, len(rows), LINK_INSERT_BATCH_SIZE):
+        await db.execute(
+            insert(ReleaseServiceLinkModel).values(rows[start:start + LINK_INSERT_BATCH_SIZE])
+        )
+    return [ReleaseServiceLinkModel(**row) for row in rows]
+
+
+async def sync_service_links(
+    db: AsyncSession, release: ReleaseModel, links: List[ReleaseServiceLinkCreate]
+) -> ServiceLinkChanges:
+    """
+    Make a release's service links match `links`, touching only the rows that
+    differ: one DELETE for removed services, multi-row INSERTs for new ones and
+    one batched UPDATE for links whose pipeline link or version changed.
+    """
+    ensure_unique_services(links)
+    existing = {link.service_id: link for link in release.service_links}
+    desired = {link.service_id: link for link in links}
+
+    removed = sorted(existing.keys() - desired.keys())
+    added = [link for service_id, link in desired.items() if service_id not in existing]
+    updated = [
+        {
+            "release_id": release.id,
+            "service_id": service_id,
+            "pipeline_link": link.pipeline_link,
+            "version": link.version,
+        }
+        for service_id, link in desired.items()
+        if service_id in existing
+        and (existing[service_id].pipeline_link, existing[service_id].version)
+        != (link.pipeline_link, link.version)
+    ]
+
+    await get_services_or_400(db, added)
+    if removed:
+        await db.execute(
+            delete(ReleaseServiceLinkModel)
+            .where(ReleaseServiceLinkModel.release_id == release.id)
+            .where(ReleaseServiceLinkModel.service_id.in_(removed))
+            .execution_options(synchronize_session=False)
+        )
+    await insert_service_links(db, release.id, added)
+    if updated:
+        # ORM bulk UPDATE by primary key: one statement, executed as a batch
+        await db.execute(update(ReleaseServiceLinkModel), updated)
+
+    return ServiceLinkChanges(
+        added=[link.service_id for link in added],
+        updated=[row["service_id"] for row in updated],
+        removed=removed,
+    )
+
+
+async def releases_not_modified(
+    db: AsyncSession, request: Request, response: Response, view: str
+) -> Optional[Response]:
+    """
+    Conditional GET for release listings. Every change to a release, its links
+    or its deployments bumps the release's updated_at; embedded services and
+    users are covered by their own tables' versions.
+    """
+    etag = make_etag(
+        "releases",
+        view,
+        request.url.query,
+        *await table_versions(db, ReleaseModel, ServiceModel, UserModel),
+    )
+    return conditional_response(request, response, etag)
+
+
+def paginate_releases(query, sort: str, order: str, cursor: Optional[str], limit: int):
+    """
+    Apply keyset pagination on (sort column, id) to a releases query.
+    """
+    column, nullable = RELEASE_SORT_COLUMNS[sort]
+    try:
+        return apply_keyset(
+            query,
+            column,
+            ReleaseModel.id,
+            sort=sort,
+            order=order,
+            cursor=cursor,
+            limit=limit,
+            nullable=nullable,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/", response_model=CursorPage[Release])
+async def list_releases(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor taken from a previous page's next_cursor.",
+    ),
+    limit: int = Query(default=100, ge=1, le=500),
+    sort: ReleaseSort = "created_at",
+    order: SortOrder = "desc",
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    List releases, one keyset page at a time.
+    Answers If-None-Match with 304 while no release, service or user changed.
+    """
+    not_modified = await releases_not_modified(db, request, response, "list")
+    if not_modified:
+        return not_modified
+
+    query = paginate_releases(
+        select(ReleaseModel).options(*release_loader_options("list")),
+        sort,
+        order,
+        cursor,
+        limit,
+    )
+    rows = (await db.scalars(query)).all()
+    items, next_cursor = build_page(rows, sort=sort, order=order, limit=limit)
+    return json_response(CursorPage[Release], {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "limit": limit,
+        "sort": sort,
+        "order": order,
+    }, response)
+
+@router.get("/summary", response_model=CursorPage[ReleaseSummary])
+async def list_release_summaries(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor taken from a previous page's next_cursor.",
+    ),
+    limit: int = Query(default=100, ge=1, le=500),
+    sort: ReleaseSort = "created_at",
+    order: SortOrder = "desc",
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
 ) -> Any:
     """
-    List all releases.
+    List releases as lightweight summaries with per-environment rollout counts.
+    Runs column-only queries; no ORM relationships are loaded.
     """
-    releases = db.query(ReleaseModel).offset(skip).limit(limit).all()
-    return releases
+    not_modified = await releases_not_modified(db, request, response, "summary")
+    if not_modified:
+        return not_modified
+
+    service_count = (
+        select(func.count())
+        .where(ReleaseServiceLinkModel.release_id == ReleaseModel.id)
+        .correlate(ReleaseModel)
+        .scalar_subquery()
+    )
+    query = select(
+        ReleaseModel.id,
+        ReleaseModel.name,
+        ReleaseModel.version,
+        ReleaseModel.created_at,
+        ReleaseModel.planned_release_date,
+        ReleaseModel.owner_id,
+        service_count.label("service_count"),
+    )
+    rows = (await db.execute(paginate_releases(query, sort, order, cursor, limit))).all()
+    rows, next_cursor = build_page(rows, sort=sort, order=order, limit=limit)
+
+    # Distinct linked services with a successful deployment, per (release, environment)
+    rollout = {row.id: [] for row in rows}
+    if rollout:
+        counts = await db.execute(
+            select(
+                DeploymentModel.release_id,
+                DeploymentModel.environment_id,
+                func.count(func.distinct(DeploymentModel.service_id)),
+            )
+            .join(
+                ReleaseServiceLinkModel,
+                (ReleaseServiceLinkModel.release_id == DeploymentModel.release_id)
+                & (ReleaseServiceLinkModel.service_id == DeploymentModel.service_id),
+            )
+            .where(
+                DeploymentModel.release_id.in_(list(rollout)),
+                DeploymentModel.status == "success",
+            )
+            .group_by(DeploymentModel.release_id, DeploymentModel.environment_id)
+        )
+        for release_id, environment_id, deployed_count in counts:
+            rollout[release_id].append(
+                {"environment_id": environment_id, "deployed_count": deployed_count}
+            )
+
+    return json_response(CursorPage[ReleaseSummary], {
+        "items": [{**row._asdict(), "rollout": rollout[row.id]} for row in rows],
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "limit": limit,
+        "sort": sort,
+        "order": order,
+    }, response)
+
+@router.get("/rollout", response_model=List[ReleaseRollout])
+async def list_release_rollouts(
+    release_id: List[UUID] = Query(..., max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Get the service x environment rollout matrix for several releases.
+    Unknown release IDs are skipped.
+    """
+    existing = (
+        await db.scalars(select(ReleaseModel.id).where(ReleaseModel.id.in_(release_id)))
+    ).all()
+    rollouts = await build_rollouts(db, existing)
+    return [rollouts[rid] for rid in dict.fromkeys(release_id) if rid in rollouts]
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_all_release_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Server-Sent Events feed of deployment and release changes across releases.
+    """
+    # Return the auth session's connection to the pool for the stream's lifetime
+    await db.close()
+    return event_stream_response(request, release_events)
+
+@router.get("/report/jobs/{job_id}", response_model=ReportJob)
+def get_report_job(
+    job_id: str,
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Poll the status of a report generation job.
+    """
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found",
+        )
+    return job
+
+@router.get(
+    "/report/jobs/{job_id}/download",
+    response_class=FileResponse,
+    responses={200: {"content": {"application/pdf": {}}}},
+)
+def download_report_job(
+    job_id: str,
+    _current_user: Principal = Depends(check_permission("read:releases"))
+):
+    """
+    Download the PDF produced by a finished report job.
+    """
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found",
+        )
+    if job["status"] != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job is {job['status']}",
+        )
+    return FileResponse(
+        report_jobs.artifact_path(job_id),
+        media_type="application/pdf",
+        filename=job["filename"],
+    )
 
 @router.post("/", response_model=Release)
-def create_release(
+async def create_release(
     release_in: ReleaseCreate,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
 ) -> Any:
     """
-    Create a new release.
+    Create a new release and its service links in one transaction.
+    Referenced services and users are validated with one IN query each and the
+    links are inserted with multi-row INSERTs; the response is assembled from
+    those rows instead of being read back.
     """
-    # Create release object
+    services = await get_services_or_400(db, release_in.services)
+    users = await get_users_or_400(db, {
+        "owner": _current_user.id,
+        "product_owner": release_in.product_owner_id,
+        "qa": release_in.qa_id,
+        "security_analyst": release_in.security_analyst_id,
+    })
+
+    now = datetime.utcnow()
     new_release = ReleaseModel(
+        id=uuid.uuid4(),
         name=release_in.name,
         version=release_in.version,
         planned_release_date=release_in.planned_release_date,
+        created_at=now,
+        updated_at=now,
         owner_id=_current_user.id,
         product_owner_id=release_in.product_owner_id,
         qa_id=release_in.qa_id,
         security_analyst_id=release_in.security_analyst_id,
     )
-
     db.add(new_release)
-    db.commit() # Commit to get ID
-    db.refresh(new_release)
-
-    # Associate services via Link Table
-    for link_data in release_in.services:
-        link_obj = ReleaseServiceLinkModel(
-            release_id=new_release.id,
-            service_id=link_data.service_id,
-            pipeline_link=link_data.pipeline_link,
-            version=link_data.version
-        )
-        db.add(link_obj)
-
-    db.commit()
-    db.refresh(new_release)
+    await db.flush()
+    links = await insert_service_links(db, new_release.id, release_in.services)
+    await release_events.publish(db, [release_event("release.created", new_release.id, {
+        "name": new_release.name,
+        "version": new_release.version,
+    })])
+    await db.commit()
+
+    # Populate the response relationships without marking them as changes
+    for link in links:
+        set_committed_value(link, "service", services[link.service_id])
+    set_committed_value(new_release, "service_links", links)
+    set_committed_value(new_release, "deployments", [])
+    for relationship, user in users.items():
+        set_committed_value(new_release, relationship, user)
     return new_release
 
 @router.get("/{release_id}", response_model=Release)
-def get_release(
+async def get_release(
     release_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:releases"))
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
 ) -> Any:
     """
     Get a specific release by ID.
+    Answers If-None-Match with 304 while the release and the services and users
+    it embeds are unchanged.
     """
-    release = db.query(ReleaseModel).filter(ReleaseModel.id == release_id).first()
+    updated_at, *versions = (await db.execute(select(
+        select(ReleaseModel.updated_at).where(ReleaseModel.id == release_id).scalar_subquery(),
+        *version_columns(ServiceModel, UserModel),
+    ))).one()
+    if updated_at is not None:
+        etag = make_etag("release", release_id, updated_at, *versions)
+        not_modified = conditional_response(request, response, etag)
+        if not_modified:
+            return not_modified
+
+    release = await load_release(db, release_id)
     if not release:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Release not found",
         )
-    return release
+    return json_response(Release, release, response)
 
-@router.patch("/{release_id}", response_model=Release)
-def update_release(
+@router.get("/{release_id}/rollout", response_model=ReleaseRollout)
+async def get_release_rollout(
     release_id: UUID,
-    payload: ReleaseUpdate,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
 ) -> Any:
     """
-    Update release details.
+    Get the service x environment rollout matrix and per-environment progress.
     """
-    release = db.query(ReleaseModel).filter(ReleaseModel.id == release_id).first()
-    if not release:
+    exists = await db.scalar(select(ReleaseModel.id).where(ReleaseModel.id == release_id))
+    if not exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Release not found",
         )
+    return (await build_rollouts(db, [release_id]))[release_id]
 
-    data = payload.model_dump(exclude_unset=True)
+@router.get("/{release_id}/events", response_class=StreamingResponse)
+async def stream_release_events(
+    release_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Server-Sent Events feed of one release's deployment and release changes,
+    so clients can apply deltas instead of refetching after every action.
+    Events: deployment.created, deployment.deleted, release.updated and
+    release.deleted; `resync` asks the client to reload before reconnecting.
+    """
+    exists = await db.scalar(select(ReleaseModel.id).where(ReleaseModel.id == release_id))
+    if not exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
+        )
+    await db.close()
+    return event_stream_response(request, release_events, str(release_id))
 
-    # Handle services if present
-    if "services" in data:
-        services_data = data.pop("services")
-        # Remove existing links
-        db.query(ReleaseServiceLinkModel)\
-          .filter(ReleaseServiceLinkModel.release_id == release_id)\
-          .delete()
-
-        # Add new links
-        for link_data in services_data:
-             # link_data is a dict here since we dumped the model
-            link_obj = ReleaseServiceLinkModel(
-                release_id=release_id,
-                service_id=link_data['service_id'],
-                pipeline_link=link_data.get('pipeline_link'),
-                version=link_data.get('version')
-            )
-            db.add(link_obj)
+@router.get(
+    "/{release_id}/deployments/history", response_model=List[DeploymentHistoryEntry]
+)
+async def get_deployment_history(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    release_id: UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_archived: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Deployment and undeployment log of a release, newest first.
+    Without `since`, only the last DEPLOYMENT_HISTORY_HOT_DAYS are read, so the
+    query is pruned to the recent monthly partitions; pass `since` for older
+    history and `include_archived` to also read the archive table.
+    """
+    if since is None:
+        since = datetime.utcnow() - timedelta(days=settings.DEPLOYMENT_HISTORY_HOT_DAYS)
+    tables = [DeploymentHistoryModel]
+    if include_archived:
+        tables.append(DeploymentHistoryArchiveModel)
+
+    rows = []
+    for model in tables:
+        query = select(model).where(model.release_id == release_id, model.recorded_at >= since)
+        if until is not None:
+            query = query.where(model.recorded_at < until)
+        query = query.order_by(model.recorded_at.desc(), model.id.desc()).limit(limit)
+        rows.extend((await db.scalars(query)).all())
+    rows.sort(key=lambda row: (row.recorded_at, row.id), reverse=True)
+    return rows[:limit]
+
+@router.patch("/{release_id}", response_model=ReleaseUpdateResult)
+async def update_release(
+    release_id: UUID,
+    payload: ReleaseUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
+) -> Any:
+    """
+    Update release details. A `services` list replaces the release's service
+    links; only the links that differ are inserted, updated or deleted, and
+    the response reports which ones changed.
+    """
+    release = await get_release_or_404(db, release_id)
+
+    data = payload.model_dump(exclude_unset=True)
+    data.pop("services", None)
+    changes = ServiceLinkChanges()
+    if payload.services is not None:
+        changes = await sync_service_links(db, release, payload.services)
 
     for field, value in data.items():
         setattr(release, field, value)
-
-    db.commit()
-    db.refresh(release)
-    return release
+    # Link-only edits do not UPDATE the releases row, so bump explicitly
+    release.updated_at = datetime.utcnow()
+
+    await release_events.publish(db, [release_event("release.updated", release_id, {
+        "fields": data,
+        "updated_at": release.updated_at,
+        "service_link_changes": changes.model_dump(),
+    })])
+    await db.commit()
+    invalidate_report(release_id)
+    result = ReleaseUpdateResult.model_validate(await load_release(db, release_id))
+    result.service_link_changes = changes
+    return result
 
 @router.post("/{release_id}/deploy", response_model=Deployment)
-def deploy_release(
+async def deploy_release(
     release_id: UUID,
     deployment_in: DeploymentCreate,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
 ) -> Any:
     """
     Record a deployment for a specific release to an environment.
+    Recording the same (environment, service) again updates the existing row.
     """
-    release = db.query(ReleaseModel).filter(ReleaseModel.id == release_id).first()
-    if not release:
+    release = await get_release_or_404(db, release_id)
+
+    # Upsert deployment record
+    now = datetime.utcnow()
+    result = await db.execute(upsert_deployments(
+        db.bind.dialect.name,
+        [{
+            "id": uuid.uuid4(),
+            "release_id": release_id,
+            "environment_id": deployment_in.environment_id,
+            "service_id": deployment_in.service_id,
+            "status": deployment_in.status,
+            "deployed_at": now,
+        }],
+        release_level=deployment_in.service_id is None,
+    ))
+    deployment = result.mappings().one()
+    release.updated_at = now
+    await record_deployment_history(db, [deployment], "deployed")
+    await record_deployments(db, [deployment], release.created_at)
+
+    await release_events.publish(
+        db, [release_event("deployment.created", release_id, dict(deployment))]
+    )
+    await db.commit()
+    invalidate_report(release_id)
+    return deployment
+
+
+@router.post("/{release_id}/deploy/bulk", response_model=List[Deployment])
+async def deploy_release_bulk(
+    release_id: UUID,
+    payload: BulkDeploymentCreate,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
+) -> Any:
+    """
+    Record many service deployments of a release in one transaction.
+    Entries are validated against the release's service links in one query and
+    upserted with a single multi-row INSERT ... ON CONFLICT. With `environment_id`
+    instead of `deployments`, every linked service is deployed to that environment.
+    """
+    # Release existence and its linked services in one query
+    rows = (await db.execute(
+        select(ReleaseModel.created_at, ReleaseServiceLinkModel.service_id)
+        .outerjoin(ReleaseServiceLinkModel, ReleaseServiceLinkModel.release_id == ReleaseModel.id)
+        .where(ReleaseModel.id == release_id)
+    )).all()
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Release not found",
         )
+    linked = {service_id for _, service_id in rows if service_id is not None}
 
-    # Create deployment record
-    deployment = DeploymentModel(
-        release_id=release_id,
-        environment_id=deployment_in.environment_id,
-        service_id=deployment_in.service_id,
-        status=deployment_in.status
-    )
+    # (service_id, environment_id) -> status; a repeated pair keeps its last status
+    if payload.environment_id is not None:
+        entries = {(service_id, payload.environment_id): payload.status for service_id in linked}
+    else:
+        entries = {
+            (entry.service_id, entry.environment_id): entry.status
+            for entry in payload.deployments
+        }
+        unlinked = {service_id for service_id, _ in entries} - linked
+        if unlinked:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Services not linked to this release: "
+                + ", ".join(sorted(str(service_id) for service_id in unlinked)),
+            )
+    if not entries:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Release has no linked services to deploy",
+        )
 
-    db.add(deployment)
-    db.commit()
-    db.refresh(deployment)
-    return deployment
+    environment_ids = {environment_id for _, environment_id in entries}
+    known = (await db.scalars(
+        select(EnvironmentModel.id).where(EnvironmentModel.id.in_(environment_ids))
+    )).all()
+    if len(known) != len(environment_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Environments not found: "
+            + ", ".join(sorted(str(env_id) for env_id in environment_ids - set(known))),
+        )
+
+    now = datetime.utcnow()
+    deployments = [
+        {
+            "id": uuid.uuid4(),
+            "release_id": release_id,
+            "environment_id": environment_id,
+            "service_id": service_id,
+            "status": deployment_status,
+            "deployed_at": now,
+        }
+        for (service_id, environment_id), deployment_status in entries.items()
+    ]
+    result = await db.execute(upsert_deployments(db.bind.dialect.name, deployments))
+    stored = result.mappings().all()
+    await record_deployment_history(db, stored, "deployed")
+    await record_deployments(db, stored, rows[0].created_at)
+    await touch_release(db, release_id)
+    await release_events.publish(
+        db, [release_event("deployment.created", release_id, dict(row)) for row in stored]
+    )
+    await db.commit()
+    return stored
 
 
 @router.delete("/{release_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_release(
+async def delete_release(
     release_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
 ) -> None:
     """
     Delete a release.
     """
-    release = db.query(ReleaseModel).filter(ReleaseModel.id == release_id).first()
-    if not release:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Release not found",
-        )
+    release = await get_release_or_404(db, release_id)
 
     # Cascade delete should handle children if configured, but let's be explicit if needed
     # ReleaseModel.service_links cascade="all, delete-orphan" handles links
@@ -193,28 +834,30 @@ def delete_release(
     # So we should delete deployments first or ensure cascade is set.
     # For safety, let's manually delete deployments.
 
-    db.query(DeploymentModel).filter(DeploymentModel.release_id == release_id).delete()
-    db.delete(release)
-    db.commit()
+    await db.execute(delete(DeploymentModel).where(DeploymentModel.release_id == release_id))
+    await db.delete(release)
+    await release_events.publish(db, [release_event("release.deleted", release_id, {})])
+    await db.commit()
+    invalidate_report(release_id)
 
 
 @router.delete(
     "/{release_id}/deploy/{environment_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-def undeploy_release_from_environment(
+async def undeploy_release_from_environment(
     release_id: UUID,
     environment_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
 ) -> None:
     """
     Remove (undeploy) a release from a specific environment (Admin only).
     """
-    deployment = db.query(DeploymentModel).filter(
+    deployment = await db.scalar(select(DeploymentModel).where(
         DeploymentModel.release_id == release_id,
         DeploymentModel.environment_id == environment_id
-    ).first()
+    ).limit(1))
 
     if not deployment:
         raise HTTPException(
@@ -222,217 +865,132 @@ def undeploy_release_from_environment(
             detail="Deployment not found",
         )
 
-    db.delete(deployment)
-    db.commit()
+    await db.delete(deployment)
+    await record_deployment_history(db, [{
+        column.key: getattr(deployment, column.key) for column in DeploymentModel.__table__.c
+    }], "undeployed")
+    await touch_release(db, release_id)
+    await release_events.publish(db, [release_event("deployment.deleted", release_id, {
+        "id": deployment.id,
+        "environment_id": environment_id,
+        "service_id": deployment.service_id,
+    })])
+    await db.commit()
 
 
 @router.delete(
     "/{release_id}/deploy/{environment_id}/{service_id}",
     status_code=status.HTTP_204_NO_CONTENT
 )
-def undeploy_service_from_environment(
+async def undeploy_service_from_environment(
     release_id: UUID,
     environment_id: UUID,
     service_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:releases"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:releases"))
 ) -> None:
     """
     Remove (undeploy) a specific service from an environment for a release.
-    Deletes ALL deployment records matching the criteria (handles duplicates).
     """
-    # Delete all matching deployments (in case of duplicates)
-    deleted_count = db.query(DeploymentModel).filter(
+    # At most one row matches, enforced by uq_deployments_release_env_service
+    result = await db.execute(delete(DeploymentModel).where(
         DeploymentModel.release_id == release_id,
         DeploymentModel.environment_id == environment_id,
         DeploymentModel.service_id == service_id
-    ).delete(synchronize_session=False)
+    ).returning(*DeploymentModel.__table__.c).execution_options(synchronize_session=False))
+    deleted = result.mappings().one_or_none()
 
-    if deleted_count == 0:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Deployment not found for this service and environment",
         )
 
-    db.commit()
-
-
-@router.get("/{release_id}/report", response_class=StreamingResponse)
-def generate_release_report(
+    await record_deployment_history(db, [deleted], "undeployed")
+    await touch_release(db, release_id)
+    await release_events.publish(db, [release_event("deployment.deleted", release_id, {
+        "id": deleted["id"],
+        "environment_id": environment_id,
+        "service_id": service_id,
+    })])
+    await db.commit()
+
+
+@router.get(
+    "/{release_id}/report",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/pdf": {}}},
+        304: {"description": "Report unchanged since the client's copy"},
+    },
+)
+async def generate_release_report(
     release_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:releases"))
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
 ):
     """
     Generate a PDF report for a release containing all details.
+    Rendered reports are cached per content version and served with
+    ETag/Last-Modified validators, so unchanged reports cost a cache hit or a 304.
     """
-    # pylint: disable=too-many-locals, too-many-statements
-    release = db.query(ReleaseModel).filter(ReleaseModel.id == release_id).first()
-    if not release:
+    version = await report_version(db, release_id)
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Release not found",
         )
 
-    # Get environments for deployment info
-    environments = db.query(EnvironmentModel).all()
-
-    # Create PDF buffer
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        topMargin=0.5*inch,
-        bottomMargin=0.5*inch
-    )
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=20
-    )
-    elements.append(Paragraph(f"Release Report: {release.name}", title_style))
-    elements.append(Spacer(1, 12))
-
-    # Release Info Section
-    elements.append(Paragraph("Release Information", styles['Heading2']))
-    created_str = release.created_at.strftime("%Y-%m-%d %H:%M:%S") \
-        if release.created_at else "—"
-    planned_str = release.planned_release_date.strftime("%Y-%m-%d %H:%M:%S") \
-        if release.planned_release_date else "—"
-
-    release_info = [
-        ["Field", "Value"],
-        ["Release Name", release.name],
-        ["Version", release.version],
-        ["Created At", created_str],
-        ["Planned Date", planned_str],
-    ]
+    headers = {
+        "ETag": version.etag,
+        "Last-Modified": http_date(version.last_modified),
+        "Cache-Control": "private, no-cache",
+    }
+    if is_not_modified(request, version.etag, version.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = report_cache.get(release_id)
+    if cached and cached[0] == version.etag:
+        pdf = cached[1]
+    else:
+        context = await build_report_context(db, release_id)
+        # Rendering is CPU-bound; keep it off the event loop
+        pdf = await run_in_threadpool(render_release_report, context)
+        report_cache.set(release_id, (version.etag, pdf))
 
-    t = Table(release_info, colWidths=[2*inch, 4*inch])
-    t.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    elements.append(t)
-    elements.append(Spacer(1, 20))
-
-    # Role Assignments Section
-    elements.append(Paragraph("Role Assignments", styles['Heading2']))
-    def get_user_name(user):
-        if user:
-            return user.full_name or user.email
-        return "—"
-
-    roles_data = [
-        ["Role", "Assigned To"],
-        ["Release Owner", get_user_name(release.owner)],
-        ["Product Owner", get_user_name(release.product_owner)],
-        ["QA Engineer", get_user_name(release.qa)],
-        ["Security Analyst", get_user_name(release.security_analyst)],
-    ]
+    # Return as downloadable file
+    headers["Content-Disposition"] = f"attachment; filename={version.filename}"
+    return Response(content=pdf, media_type="application/pdf", headers=headers)
 
-    t2 = Table(roles_data, colWidths=[2*inch, 4*inch])
-    t2.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
-    elements.append(t2)
-    elements.append(Spacer(1, 20))
-
-    # Services Section
-    elements.append(Paragraph("Included Services", styles['Heading2']))
-    services_data = [["Service Name", "Owner", "Version", "Pipeline Link"]]
-
-    for link in release.service_links:
-        services_data.append([
-            link.service.name if link.service else "—",
-            link.service.owner if link.service and link.service.owner else "—",
-            link.version or "—",
-            link.pipeline_link or "—"
-        ])
-
-    if len(services_data) > 1:
-        t3 = Table(services_data, colWidths=[1.5*inch, 1.2*inch, 1*inch, 2.3*inch])
-        t3.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        elements.append(t3)
-    else:
-        elements.append(Paragraph("No services included.", styles['Normal']))
-
-    elements.append(Spacer(1, 20))
-
-    # Deployment Status Section
-    elements.append(Paragraph("Deployment Status", styles['Heading2']))
-
-    # Build deployment matrix
-    if release.service_links and environments:
-        deploy_header = ["Service"] + [e.name for e in environments]
-        deploy_data = [deploy_header]
-
-        for link in release.service_links:
-            row = [link.service.name if link.service else "—"]
-            for env in environments:
-                deployment = next(
-                    (d for d in release.deployments
-                     if str(d.environment_id) == str(env.id)
-                     and str(d.service_id) == str(link.service_id)
-                     and d.status == "success"),
-                    None
-                )
-                if deployment:
-                    row.append(deployment.deployed_at.strftime("%Y-%m-%d %H:%M"))
-                else:
-                    row.append("Not Deployed")
-            deploy_data.append(row)
-
-        col_widths = [1.5*inch] + [1.2*inch] * len(environments)
-        t4 = Table(deploy_data, colWidths=col_widths)
-        t4.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 7),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ]))
-        elements.append(t4)
-    else:
-        elements.append(Paragraph("No deployment data available.", styles['Normal']))
 
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
+@router.post(
+    "/{release_id}/report/jobs",
+    response_model=ReportJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_report_job(
+    release_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("read:releases"))
+) -> Any:
+    """
+    Queue a PDF report for background rendering.
+    Poll GET /releases/report/jobs/{job_id} and download the artifact when done.
+    """
+    version = await report_version(db, release_id)
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Release not found",
+        )
 
-    # Return as downloadable file
-    filename = f"release_report_{release.name.replace(' ', '_')}_{release.version}.pdf"
-    return StreamingResponse(
-        buffer,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
+    context = await build_report_context(db, release_id)
+    try:
+        return report_jobs.submit(release_id, version.filename, context)
+    except ReportQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
@@ -6,29 +6,46 @@ Role Endpoints Module
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.http_cache import conditional_response, make_etag, table_versions
+from app.core.serialization import json_response
+from app.core.permissions import permission_registry
+from app.core.principal import invalidate_all_principals
 from app.models.role import RoleModel
+from app.models.user import UserModel
+from app.api.v1.endpoints.auth import revoke_user_tokens
+from app.api.v1.dependencies import get_read_db
 from app.schemas.role import Role, RoleCreate, RoleUpdate
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
 
 @router.get("/", response_model=List[Role])
-def list_roles(db: Session = Depends(get_db)):
-    """List all roles"""
-    return db.query(RoleModel).order_by(RoleModel.name).all()
+async def list_roles(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List all roles; 304 for a current If-None-Match"""
+    etag = make_etag("roles", *await table_versions(db, RoleModel))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    rows = (await db.scalars(select(RoleModel).order_by(RoleModel.name))).all()
+    return json_response(List[Role], rows, response)
 
 
 @router.post("/", response_model=Role, status_code=status.HTTP_201_CREATED)
-def create_role(payload: RoleCreate, db: Session = Depends(get_db)):
+async def create_role(payload: RoleCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new role"""
-    existing = (
-        db.query(RoleModel)
-        .filter(RoleModel.name == payload.name)
-        .first()
+    existing = await db.scalar(
+        select(RoleModel)
+        .where(RoleModel.name == payload.name)
+        .limit(1)
     )
     if existing:
         raise HTTPException(
@@ -39,26 +56,31 @@ def create_role(payload: RoleCreate, db: Session = Depends(get_db)):
     role = RoleModel(
         name=payload.name,
         description=payload.description,
+        permissions=payload.permissions,
     )
     db.add(role)
-    db.commit()
-    db.refresh(role)
+    await db.commit()
+    await db.refresh(role)
     return role
 
 
 @router.get("/{role_id}", response_model=Role)
-def get_role(role_id: UUID, db: Session = Depends(get_db)):
+async def get_role(role_id: UUID, db: AsyncSession = Depends(get_read_db)):
     """Get a role by ID"""
-    role = db.query(RoleModel).filter(RoleModel.id == role_id).first()
+    role = await db.get(RoleModel, role_id)
     if not role:
         raise HTTPException(404, "Role not found")
     return role
 
 
 @router.patch("/{role_id}", response_model=Role)
-def update_role(role_id: UUID, payload: RoleUpdate, db: Session = Depends(get_db)):
+async def update_role(
+    role_id: UUID,
+    payload: RoleUpdate,
+    db: AsyncSession = Depends(get_async_db),
+):
     """Update a role"""
-    role = db.query(RoleModel).filter(RoleModel.id == role_id).first()
+    role = await db.get(RoleModel, role_id)
     if not role:
         raise HTTPException(404, "Role not found")
 
@@ -66,23 +88,37 @@ def update_role(role_id: UUID, payload: RoleUpdate, db: Session = Depends(get_db
 
     # Unique constraint check
     if "name" in data and data["name"] != role.name:
-        if db.query(RoleModel).filter(RoleModel.name == data["name"]).first():
+        if await db.scalar(select(RoleModel.id).where(RoleModel.name == data["name"])):
             raise HTTPException(409, "Role name already exists")
 
+    # Tokens embed the role name and permissions; revoke them if those change
+    stale = any(
+        field in data and data[field] != getattr(role, field)
+        for field in ("name", "permissions")
+    )
+
     for field, value in data.items():
         setattr(role, field, value)
 
-    db.commit()
-    db.refresh(role)
+    await db.commit()
+    if stale:
+        user_ids = await db.scalars(select(UserModel.id).where(UserModel.role_id == role_id))
+        await revoke_user_tokens(db, user_ids.all())
+    # Recompile the role's permissions and rebuild principals holding the old mask
+    permission_registry.invalidate(role_id)
+    invalidate_all_principals()
+    await db.refresh(role)
     return role
 
 
 @router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_role(role_id: UUID, db: Session = Depends(get_db)):
+async def delete_role(role_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Delete a role"""
-    role = db.query(RoleModel).filter(RoleModel.id == role_id).first()
+    role = await db.get(RoleModel, role_id)
     if not role:
         raise HTTPException(404, "Role not found")
 
-    db.delete(role)
-    db.commit()
+    await db.delete(role)
+    await db.commit()
+    permission_registry.invalidate(role_id)
+    invalidate_all_principals()
@@ -0,0 +1,153 @@
+"""
+Search Endpoints Module
+"""
+import re
+from typing import Annotated, Any, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import Float, String, case, cast, func, literal, literal_column, null, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import get_read_db
+from app.api.v1.endpoints.auth import get_current_principal
+from app.core.pagination import InvalidCursorError, apply_keyset, build_page, like_pattern
+from app.core.principal import Principal
+from app.models.release import RELEASE_SEARCH_DOCUMENT, ReleaseModel
+from app.models.service import SERVICE_SEARCH_DOCUMENT, ServiceModel
+from app.schemas.pagination import CursorPage
+from app.schemas.search import SearchHit
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+SearchType = Literal["release", "service"]
+
+# Permission needed to see hits of each type
+SEARCH_PERMISSIONS = {"release": "read:releases", "service": "read:services"}
+
+# Per hit type: full-text expression, and the columns shown as title,
+# subtitle and description (all of them searched)
+SEARCH_SOURCES = {
+    "release": (RELEASE_SEARCH_DOCUMENT, {
+        "title": ReleaseModel.name,
+        "subtitle": ReleaseModel.version,
+        "description": None,
+    }),
+    "service": (SERVICE_SEARCH_DOCUMENT, {
+        "title": ServiceModel.name,
+        "subtitle": ServiceModel.owner,
+        "description": ServiceModel.description,
+    }),
+}
+
+
+def prefix_tsquery(term: str) -> Optional[str]:
+    """
+    A to_tsquery string matching documents that contain every word of `term`,
+    the last one as a prefix, so results follow the user's typing.
+    """
+    words = re.findall(r"\w+", term.lower())
+    if not words:
+        return None
+    return " & ".join(words[:-1] + [f"{words[-1]}:*"])
+
+
+def search_hits(dialect: str, hit_type: str, term: str, document: str, fields: dict):
+    """
+    Rows of one table matching `term`, shaped as SearchHit. `fields` maps the
+    hit's title, subtitle and description to columns; `document` is the
+    table's full-text expression.
+
+    Postgres matches through the full-text GIN index and the trigram indexes
+    (which serve ILIKE '%term%'), ranking by ts_rank plus title similarity.
+    Other backends match substrings and rank exact, prefix and substring
+    title matches above matches in other fields.
+    """
+    title, description = fields["title"], fields["description"]
+    matches = [
+        column.ilike(like_pattern(term), escape="\\")
+        for column in fields.values() if column is not None
+    ]
+    if dialect == "postgresql":
+        rank = func.similarity(title, term)
+        tsquery = prefix_tsquery(term)
+        if tsquery:
+            # Literal SQL, so the planner recognizes the indexed expression
+            vector = literal_column(document)
+            query = func.to_tsquery(literal_column("'simple'"), tsquery)
+            matches.append(vector.op("@@")(query))
+            rank = rank + func.ts_rank(vector, query)
+    else:
+        rank = case(
+            (func.lower(title) == term.lower(), 3.0),
+            (title.ilike(like_pattern(term, prefix=True), escape="\\"), 2.0),
+            (title.ilike(like_pattern(term), escape="\\"), 1.0),
+            else_=0.5,
+        )
+    return select(
+        literal(hit_type, String).label("type"),
+        title.class_.id.label("id"),
+        title.label("title"),
+        fields["subtitle"].label("subtitle"),
+        (null() if description is None else description).label("description"),
+        cast(rank, Float).label("rank"),
+    ).where(or_(*matches))
+
+
+def all_search_hits(dialect: str, term: str, hit_types: List[str]):
+    """Subquery of the hits of every type in `hit_types`, in one list."""
+    selects = [
+        search_hits(dialect, hit_type, term, *SEARCH_SOURCES[hit_type]) for hit_type in hit_types
+    ]
+    return (selects[0] if len(selects) == 1 else selects[0].union_all(*selects[1:])).subquery()
+
+
+@router.get("/", response_model=CursorPage[SearchHit])
+async def search(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    principal: Annotated[Principal, Depends(get_current_principal)],
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    types: List[SearchType] = Query(["release", "service"], alias="type"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> Any:
+    """
+    Search releases (name, version) and services (name, owner, description).
+    Hits of both types come back in one list, most relevant first, limited
+    to the types the caller may read.
+    """
+    term = q.strip()
+    allowed = [t for t in dict.fromkeys(types) if principal.has_permission(SEARCH_PERMISSIONS[t])]
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to search "
+            + ", ".join(SEARCH_PERMISSIONS[t] for t in dict.fromkeys(types)),
+        )
+    if not term:
+        return {"items": [], "limit": limit, "sort": "rank", "order": "desc"}
+
+    hits = all_search_hits(db.bind.dialect.name, term, allowed)
+    try:
+        query = apply_keyset(
+            select(hits), hits.c.rank, hits.c.id,
+            sort="rank", order="desc", cursor=cursor, limit=limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    rows = (await db.execute(query)).mappings().all()
+    items, next_cursor = build_page(
+        [SearchHit.model_validate(dict(row)) for row in rows],
+        sort="rank", order="desc", limit=limit,
+    )
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "limit": limit,
+        "sort": "rank",
+        "order": "desc",
+    }
@@ -2,29 +2,103 @@
 Service Endpoints Module
 """
 from uuid import UUID
-from typing import List
+from typing import Any, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.schemas.pagination import CursorPage
 from app.schemas.service import Service, ServiceCreate, ServiceUpdate
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.http_cache import conditional_response, make_etag, table_versions
+from app.core.pagination import InvalidCursorError, apply_keyset, build_page, like_pattern
+from app.core.serialization import json_response
 from app.models.service import ServiceModel
-from app.models.user import UserModel
-from app.api.v1.dependencies import check_permission
+from app.core.principal import Principal
+from app.api.v1.dependencies import check_permission, get_read_db
 
 router = APIRouter(prefix="/service", tags=["service"])
 
-
-@router.get("/", response_model=List[Service], summary="List services")
-def list_services(
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:services"))
-) -> List[Service]:
-    """List all services."""
-    rows = db.query(ServiceModel).all()
-    # thanks to from_attributes=True, FastAPI converts ORM -> Pydantic
-    return rows
+ServiceSort = Literal["name", "created_at"]
+SortOrder = Literal["asc", "desc"]
+
+SERVICE_SORT_COLUMNS = {
+    "name": ServiceModel.name,
+    "created_at": ServiceModel.created_at,
+}
+
+
+@router.get("/", response_model=CursorPage[Service], summary="List services")
+async def list_services(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor taken from a previous page's next_cursor.",
+    ),
+    limit: int = Query(default=100, ge=1, le=500),
+    sort: ServiceSort = "name",
+    order: SortOrder = "asc",
+    environment_id: Optional[UUID] = None,
+    service_status: Optional[str] = Query(default=None, alias="status"),
+    owner: Optional[str] = None,
+    name_prefix: Optional[str] = Query(
+        default=None,
+        max_length=255,
+        description="Case-insensitive prefix of the service name.",
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:services"))
+) -> Any:
+    """
+    List services one keyset page at a time, optionally filtered by
+    environment, status, owner and name prefix. Pages carry no total count,
+    so deep pages cost the same as the first.
+    Answers If-None-Match with 304 while no service changed.
+    """
+    etag = make_etag("services", request.url.query, *await table_versions(db, ServiceModel))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    query = select(ServiceModel)
+    if environment_id is not None:
+        query = query.where(ServiceModel.environment_id == environment_id)
+    if service_status is not None:
+        query = query.where(ServiceModel.status == service_status)
+    if owner is not None:
+        query = query.where(ServiceModel.owner == owner)
+    if name_prefix:
+        query = query.where(
+            ServiceModel.name.ilike(like_pattern(name_prefix, prefix=True), escape="\\")
+        )
+    try:
+        query = apply_keyset(
+            query,
+            SERVICE_SORT_COLUMNS[sort],
+            ServiceModel.id,
+            sort=sort,
+            order=order,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    rows = (await db.scalars(query)).all()
+    items, next_cursor = build_page(rows, sort=sort, order=order, limit=limit)
+    return json_response(CursorPage[Service], {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+        "limit": limit,
+        "sort": sort,
+        "order": order,
+    }, response)
 
 
 @router.post(
@@ -33,10 +107,10 @@ def list_services(
     status_code=status.HTTP_201_CREATED,
     summary="Create service",
 )
-def create_service(
+async def create_service(
     payload: ServiceCreate,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:services"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:services"))
 ) -> Service:
     """Create a new service."""
     row = ServiceModel(
@@ -48,41 +122,33 @@ def create_service(
         repo_link=str(payload.repo_link) if payload.repo_link else None,
     )
     db.add(row)
-    db.commit()
-    db.refresh(row)
+    await db.commit()
+    await db.refresh(row)
     return row
 
 
 @router.get("/{service_id}", response_model=Service, summary="Get service by ID")
-def get_service(
+async def get_service(
     service_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:services"))
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:services"))
 ) -> Service:
     """Get a service by ID."""
-    row = (
-        db.query(ServiceModel)
-        .filter(ServiceModel.id == service_id)
-        .first()
-    )
+    row = await db.get(ServiceModel, service_id)
     if not row:
         raise HTTPException(status_code=404, detail="Service not found")
     return row
 
 
 @router.patch("/{service_id}", response_model=Service, summary="Update service")
-def update_service(
+async def update_service(
     service_id: UUID,
     payload: ServiceUpdate,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:services"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:services"))
 ) -> Service:
     """Update a service."""
-    row = (
-        db.query(ServiceModel)
-        .filter(ServiceModel.id == service_id)
-        .first()
-    )
+    row = await db.get(ServiceModel, service_id)
     if not row:
         raise HTTPException(status_code=404, detail="Service not found")
 
@@ -93,8 +159,8 @@ def update_service(
     for field, value in data.items():
         setattr(row, field, value)
 
-    db.commit()
-    db.refresh(row)
+    await db.commit()
+    await db.refresh(row)
     return row
 
 
@@ -103,19 +169,15 @@ def update_service(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete service",
 )
-def delete_service(
+async def delete_service(
     service_id: UUID,
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("create:services"))
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: Principal = Depends(check_permission("create:services"))
 ):
     """Delete a service."""
-    row = (
-        db.query(ServiceModel)
-        .filter(ServiceModel.id == service_id)
-        .first()
-    )
+    row = await db.get(ServiceModel, service_id)
     if not row:
         raise HTTPException(status_code=404, detail="Service not found")
 
-    db.delete(row)
-    db.commit()
+    await db.delete(row)
+    await db.commit()
@@ -6,16 +6,22 @@ User Endpoints Module
 from uuid import UUID
 from typing import List, Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
-from app.core.security import get_password_hash
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.http_cache import conditional_response, make_etag, table_versions
+from app.core.serialization import json_response
+from app.core.security import PasswordHashQueueFullError, get_password_hash, password_hasher
+from app.core.principal import Principal, invalidate_principal, record_token_versions
 from app.models.user import UserModel
 from app.models.role import RoleModel
 from app.schemas.user import UserCreate, UserRead, UserUpdate
-from app.api.v1.endpoints.auth import get_current_admin_user
-from app.api.v1.dependencies import check_permission
+from app.api.v1.endpoints.auth import get_current_admin_user, revoke_user_tokens
+from app.api.v1.dependencies import check_permission, get_read_db
 
 router = APIRouter(
     prefix="/users",
@@ -24,12 +30,58 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[UserRead], summary="List users")
-def list_users(
-    db: Session = Depends(get_db),
-    _current_user: UserModel = Depends(check_permission("read:users")),
+async def list_users(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    _current_user: Principal = Depends(check_permission("read:users")),
 ) -> List[UserRead]:
-    """List all users."""
-    return db.query(UserModel).order_by(UserModel.email).all()
+    """List all users; 304 for a current If-None-Match."""
+    # Users embed their role
+    etag = make_etag("users", *await table_versions(db, UserModel, RoleModel))
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    rows = (
+        await db.scalars(
+            select(UserModel)
+            .options(selectinload(UserModel.role))
+            .order_by(UserModel.email)
+        )
+    ).all()
+    return json_response(List[UserRead], rows, response)
+
+
+async def _get_user(db: AsyncSession, user_id: UUID) -> UserModel:
+    """Load a user with its role, or raise 404."""
+    user = await db.get(UserModel, user_id, options=[selectinload(UserModel.role)])
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found.",
+        )
+    return user
+
+
+async def _hash_password(password: str) -> str:
+    """Hash a password on the bounded hashing pool, like login verification."""
+    try:
+        return await password_hasher.run(get_password_hash, password)
+    except PasswordHashQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+
+
+async def _ensure_role_exists(db: AsyncSession, role_id: UUID) -> None:
+    """Raise 400 if the role does not exist."""
+    if not await db.get(RoleModel, role_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Role not found for given role_id.",
+        )
 
 
 @router.post(
@@ -38,17 +90,15 @@ def list_users(
     status_code=status.HTTP_201_CREATED,
     summary="Create user (admin only)",
 )
-def create_user(
+async def create_user(
     payload: UserCreate,
-    db: Session = Depends(get_db),
-    _current_admin: Annotated[UserModel, Depends(get_current_admin_user)] = None,
+    db: AsyncSession = Depends(get_async_db),
+    _current_admin: Annotated[Principal, Depends(get_current_admin_user)] = None,
 ) -> UserRead:
     """Create a new user."""
     # Ensure email is unique
-    existing = (
-        db.query(UserModel)
-        .filter(UserModel.email == payload.email)
-        .first()
+    existing = await db.scalar(
+        select(UserModel.id).where(UserModel.email == payload.email)
     )
     if existing:
         raise HTTPException(
@@ -59,23 +109,19 @@ def create_user(
     # If role_id provided, ensure role exists
     role_id = payload.role_id
     if role_id:
-        role = db.query(RoleModel).filter(RoleModel.id == role_id).first()
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Role not found for given role_id.",
-            )
+        await _ensure_role_exists(db, role_id)
 
     user = UserModel(
         email=payload.email,
         full_name=payload.full_name,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await _hash_password(payload.password),
         is_active=True,
         role_id=payload.role_id,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_principal(user.email)
+    await db.refresh(user, ["role"])
     return user
 
 
@@ -84,19 +130,13 @@ def create_user(
     response_model=UserRead,
     summary="Get user by ID (admin only)",
 )
-def get_user(
+async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    _current_admin: Annotated[UserModel, Depends(get_current_admin_user)] = None,
+    db: AsyncSession = Depends(get_read_db),
+    _current_admin: Annotated[Principal, Depends(get_current_admin_user)] = None,
 ) -> UserRead:
     """Get a user by ID."""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
-    return user
+    return await _get_user(db, user_id)
 
 
 @router.patch(
@@ -104,29 +144,28 @@ def get_user(
     response_model=UserRead,
     summary="Update user (admin only)",
 )
-def update_user(
+async def update_user(
     user_id: UUID,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
-    _current_admin: Annotated[UserModel, Depends(get_current_admin_user)] = None,
+    db: AsyncSession = Depends(get_async_db),
+    _current_admin: Annotated[Principal, Depends(get_current_admin_user)] = None,
 ) -> UserRead:
     """Update a user."""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
+    user = await _get_user(db, user_id)
 
     data = payload.model_dump(exclude_unset=True)
+    old_email = user.email
+    # Changes that make previously issued token claims stale
+    revoke = any(
+        field in data and data[field] != getattr(user, field)
+        for field in ("email", "is_active", "role_id")
+    ) or bool(data.get("password"))
 
     # If email is changing, ensure uniqueness
     new_email = data.get("email")
     if new_email and new_email != user.email:
-        existing = (
-            db.query(UserModel)
-            .filter(UserModel.email == new_email)
-            .first()
+        existing = await db.scalar(
+            select(UserModel.id).where(UserModel.email == new_email)
         )
         if existing:
             raise HTTPException(
@@ -136,27 +175,21 @@ def update_user(
 
     # If role_id is changing, ensure target role exists
     if "role_id" in data and data["role_id"] is not None:
-        role = (
-            db.query(RoleModel)
-            .filter(RoleModel.id == data["role_id"])
-            .first()
-        )
-        if not role:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Role not found for given role_id.",
-            )
+        await _ensure_role_exists(db, data["role_id"])
 
     # Handle password separately
     new_password = data.pop("password", None)
     if new_password:
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await _hash_password(new_password)
 
     for field, value in data.items():
         setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    if revoke:
+        await revoke_user_tokens(db, [user.id])
+    invalidate_principal(old_email, user.email)
+    await db.refresh(user, ["role"])
     return user
 
 
@@ -165,18 +198,13 @@ def update_user(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete user (admin only)",
 )
-def delete_user(
+async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_admin: Annotated[UserModel, Depends(get_current_admin_user)] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Annotated[Principal, Depends(get_current_admin_user)] = None,
 ) -> None:
     """Delete a user."""
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found.",
-        )
+    user = await _get_user(db, user_id)
 
     # Optional: prevent admin from deleting self
     if current_admin and current_admin.id == user.id:
@@ -185,5 +213,10 @@ def delete_user(
             detail="Admin user cannot delete themself.",
         )
 
-    db.delete(user)
-    db.commit()
+    user_id = user.id
+    email = user.email
+    await db.delete(user)
+    await db.commit()
+    if settings.AUTH_STATELESS:
+        record_token_versions({user_id: None})
+    invalidate_principal(email)
@@ -4,17 +4,104 @@ Database Configuration Module
 # pylint: disable=invalid-name
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.db_metrics import PoolMetrics
 
+# Async drivers for the sync URLs accepted in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL used by the API from a sync database URL.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'.")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def engine_options(url: str, metrics: PoolMetrics, pool_base) -> dict:
+    """
+    Pool and connection options from Settings for an engine on `url`.
+    """
+    options = {
+        "pool_pre_ping": True,
+        "poolclass": metrics.pool_class(pool_base),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+# Sync engine, used by scripts/
+sync_pool_metrics = PoolMetrics("primary-sync")
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    **engine_options(settings.DATABASE_URL, sync_pool_metrics, QueuePool),
 )
+sync_pool_metrics.bind(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
 
+# Async engine, used by the API
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+pool_metrics = PoolMetrics("primary")
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(ASYNC_DATABASE_URL, pool_metrics, AsyncAdaptedQueuePool),
+)
+pool_metrics.bind(async_engine.sync_engine)
+
+# Objects stay usable after commit; lazy loads are not possible on an AsyncSession
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Optional async read replica
+replica_engine = None
+ReplicaSessionLocal = None
+if settings.DATABASE_REPLICA_URL:
+    REPLICA_DATABASE_URL = async_database_url(settings.DATABASE_REPLICA_URL)
+    replica_pool_metrics = PoolMetrics("replica")
+    replica_engine = create_async_engine(
+        REPLICA_DATABASE_URL,
+        **engine_options(REPLICA_DATABASE_URL, replica_pool_metrics, AsyncAdaptedQueuePool),
+    )
+    replica_pool_metrics.bind(replica_engine.sync_engine)
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def get_replica_sessionmaker():
+    """
+    Session factory of the read replica, or None when no replica is configured.
+    """
+    return ReplicaSessionLocal
+
 # Dependency for FastAPI routes
 def get_db():
     """
@@ -27,3 +114,13 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency to get an async database session.
+    Yields:
+        AsyncSession: SQLAlchemy async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
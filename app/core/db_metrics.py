@@ -0,0 +1,142 @@
+"""
+Connection Pool Metrics Module
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool
+
+# Upper bounds (milliseconds) of the checkout wait histogram; the last bucket is unbounded
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolMetrics:
+    """
+    Counters for one engine's connection pool. Checkouts, check-ins and new
+    connections come from pool events once bound to an engine; checkout wait
+    times come from the instrumented pool class returned by `pool_class`.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def pool_class(self, base: Type[Pool]) -> Type[Pool]:
+        """
+        Return a subclass of `base` that reports to these metrics.
+        The class is per engine, so it survives the pool being recreated.
+        """
+        metrics = self
+
+        class InstrumentedPool(base):  # pylint: disable=too-few-public-methods
+            """Pool that times how long each checkout waits for a connection."""
+
+            def connect(self):
+                """Check out a connection, recording the wait."""
+                start = time.perf_counter()
+                try:
+                    connection = super().connect()
+                except exc.TimeoutError:
+                    metrics.record_wait(time.perf_counter() - start, timed_out=True)
+                    raise
+                metrics.record_wait(time.perf_counter() - start)
+                return connection
+
+        InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+        return InstrumentedPool
+
+    def bind(self, engine) -> None:
+        """
+        Listen to the pool events of a (sync) engine and report its pool state.
+        Listeners on the engine carry over when its pool is recreated.
+        """
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        _registry[self.name] = self
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record how long a checkout waited for a connection."""
+        millis = seconds * 1000
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.wait_total += millis
+            self.wait_max = max(self.wait_max, millis)
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_MS, millis)] += 1
+
+    def _on_connect(self, *_args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, *_args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, *_args) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def _on_invalidate(self, *_args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        """Current pool state and cumulative counters."""
+        pool = self.engine.pool if self.engine is not None else None
+        size = pool.size() if hasattr(pool, "size") else None
+        max_overflow = getattr(pool, "_max_overflow", None)
+        capacity = size + max(max_overflow, 0) if size is not None else None
+
+        with self._lock:
+            waits = sum(self.wait_buckets)
+            return {
+                "name": self.name,
+                "size": size,
+                "max_overflow": max_overflow,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "saturation": round(self.checked_out / capacity, 3) if capacity else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / waits, 3) if waits else 0.0,
+                "wait_max_ms": round(self.wait_max, 3),
+                "wait_histogram": [
+                    {"le_ms": bound, "count": count}
+                    for bound, count in zip((*WAIT_BUCKETS_MS, None), self.wait_buckets)
+                ],
+            }
+
+
+# name -> metrics of every bound engine
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def pool_snapshots() -> List[dict]:
+    """Snapshots of every registered pool."""
+    return [metrics.snapshot() for metrics in _registry.values()]
+
+
+def get_pool_metrics(name: str) -> Optional[PoolMetrics]:
+    """Metrics registered under `name`, if any."""
+    return _registry.get(name)
@@ -0,0 +1,227 @@
+"""
+Release Event Broker Module
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Set
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres LISTEN/NOTIFY channel shared by every worker
+CHANNEL = "release_events"
+# NOTIFY payloads must be shorter than 8000 bytes
+MAX_NOTIFY_BYTES = 7900
+
+_PENDING = "pending_release_events"
+
+
+def encode_event(payload: dict) -> str:
+    """
+    Serialize an event for the wire. An event too large for NOTIFY loses its
+    data and is marked truncated, telling clients to refetch instead.
+    """
+    message = to_json(payload).decode()
+    if len(message.encode()) > MAX_NOTIFY_BYTES:
+        message = to_json({
+            "type": payload["type"],
+            "release_id": payload.get("release_id"),
+            "truncated": True,
+        }).decode()
+    return message
+
+
+class Subscription:  # pylint: disable=too-few-public-methods
+    """One stream's queue of encoded events, optionally limited to a release."""
+
+    def __init__(self, release_id: Optional[str], maxsize: int):
+        self.release_id = release_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        # Set when events were dropped; the stream ends once drained so the client resyncs
+        self.overflowed = False
+
+    def offer(self, release_id: Optional[str], message: str) -> None:
+        """Queue a message if it concerns this subscription."""
+        if self.overflowed or (self.release_id and self.release_id != release_id):
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """
+    Delivers events to the subscribers of this worker. Events published on a
+    session are held until it commits and dropped if it rolls back, so clients
+    never see a change that did not happen.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscriptions: Set[Subscription] = set()
+
+    async def publish(self, db: AsyncSession, events: List[dict]) -> None:
+        """Publish events once the session's transaction commits."""
+        if not events:
+            return
+        session = db.sync_session
+        if _PENDING not in session.info:
+            session.info[_PENDING] = []
+            event.listen(session, "after_commit", self._after_commit)
+            event.listen(session, "after_rollback", self._after_rollback)
+        session.info[_PENDING].extend(events)
+
+    def _after_commit(self, session) -> None:
+        for payload in session.info[_PENDING]:
+            self.deliver(encode_event(payload))
+        session.info[_PENDING].clear()
+
+    @staticmethod
+    def _after_rollback(session) -> None:
+        session.info[_PENDING].clear()
+
+    def deliver(self, message: str) -> None:
+        """Fan an encoded event out to matching subscribers of this worker."""
+        try:
+            release_id = json.loads(message).get("release_id")
+        except ValueError:
+            return
+        for subscription in list(self._subscriptions):
+            subscription.offer(release_id, message)
+
+    @asynccontextmanager
+    async def subscribe(self, release_id: Optional[str] = None) -> AsyncIterator[Subscription]:
+        """Receive events of one release, or of all releases."""
+        await self.start()
+        subscription = Subscription(release_id, self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def start(self) -> None:
+        """Start receiving events from other workers; nothing to do locally."""
+
+    async def stop(self) -> None:
+        """Stop receiving events from other workers."""
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Publishes with NOTIFY inside the writing transaction, so Postgres delivers
+    the event to every worker's LISTEN connection exactly when it commits.
+    The listener connects on the first subscription and reconnects if dropped.
+    """
+
+    def __init__(self, dsn: str, queue_size: int = 256):
+        super().__init__(queue_size)
+        self.dsn = dsn
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, db: AsyncSession, events: List[dict]) -> None:
+        """NOTIFY all workers on commit; sessions on other backends stay local."""
+        if db.bind.dialect.name != "postgresql":
+            await super().publish(db, events)
+            return
+        if events:
+            await db.execute(
+                text(
+                    "SELECT pg_notify(:channel, payload) "
+                    "FROM unnest(CAST(:payloads AS text[])) AS payload"
+                ),
+                {"channel": CHANNEL, "payloads": [encode_event(e) for e in events]},
+            )
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _listen(self) -> None:
+        import asyncpg  # pylint: disable=import-outside-toplevel
+
+        delay = 1
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Event listener cannot connect, retrying in %ss: %s", delay, exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+
+            delay = 1
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _conn: closed.set())
+            try:
+                await connection.add_listener(
+                    CHANNEL, lambda _conn, _pid, _channel, payload: self.deliver(payload)
+                )
+                await closed.wait()
+                logger.warning("Event listener connection closed, reconnecting")
+            finally:
+                await connection.close()
+
+
+def create_broker():
+    """
+    The broker chosen by EVENT_BROKER. "postgres" falls back to the local broker
+    when the database is not Postgres.
+    """
+    url = make_url(settings.ASYNC_DATABASE_URL or settings.DATABASE_URL)
+    if settings.EVENT_BROKER == "postgres" and url.get_backend_name() == "postgresql":
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresBroker(dsn, settings.EVENT_QUEUE_SIZE)
+    return LocalBroker(settings.EVENT_QUEUE_SIZE)
+
+
+release_events = create_broker()
+
+
+def event_stream_response(
+    request: Request, broker: LocalBroker, release_id: Optional[str] = None
+) -> StreamingResponse:
+    """
+    Server-Sent Events response relaying a broker's events, with periodic
+    comment lines to keep proxies from closing an idle stream.
+    """
+
+    async def stream():
+        async with broker.subscribe(release_id) as subscription:
+            yield f"retry: {settings.EVENT_RETRY_MS}\n\n"
+            while not (subscription.overflowed and subscription.queue.empty()):
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(), settings.EVENT_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                kind = json.loads(message)["type"]
+                yield f"event: {kind}\ndata: {message}\n\n"
+            # Dropped events; tell the client to reload before it reconnects
+            yield "event: resync\ndata: {}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
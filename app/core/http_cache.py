@@ -0,0 +1,98 @@
+"""
+HTTP Conditional Request Utilities
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.table_version import TableVersionModel
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that determine a representation.
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Format a naive-UTC or aware datetime as an HTTP date.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Evaluate If-None-Match (preferred) or If-Modified-Since against the current validators.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison, as required for If-None-Match
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def version_columns(*models) -> List[Any]:
+    """
+    Scalar subqueries selecting each model's table version from table_versions,
+    which every committed write to the table bumps.
+    """
+    return [
+        select(TableVersionModel.version)
+        .where(TableVersionModel.table_name == model.__tablename__)
+        .scalar_subquery()
+        for model in models
+    ]
+
+
+async def table_versions(db: AsyncSession, *models) -> Tuple[Any, ...]:
+    """
+    Versions of each model's table (see `version_columns`), in one round trip.
+    """
+    return tuple((await db.execute(select(*version_columns(*models)))).one())
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Set validators on `response`. Returns a 304 response to send instead when
+    the client's copy is current, so the body is never built.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
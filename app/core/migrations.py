@@ -0,0 +1,277 @@
+"""
+Schema Migration Runner Module
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+from sqlalchemy.engine import Connection, Engine
+
+# Held while migrating so concurrently starting instances apply migrations once
+ADVISORY_LOCK_ID = 7_013_016
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_ms", Integer, nullable=False),
+)
+
+
+class Step:
+    """
+    One unit of a migration. Steps must be idempotent: a migration that mixes
+    transactional and non-transactional steps is not atomic, and is re-run from
+    the start after a failure.
+    """
+
+    def __init__(self, description: str, dialects: Optional[Sequence[str]] = None):
+        self.description = description
+        # Dialect names the step applies to; None means all
+        self.dialects = tuple(dialects) if dialects else None
+
+    def applies_to(self, dialect: str) -> bool:
+        """Whether the step runs on this database backend."""
+        return self.dialects is None or dialect in self.dialects
+
+    def transactional(self, dialect: str) -> bool:  # pylint: disable=unused-argument
+        """Whether the step may run inside a transaction."""
+        return True
+
+    def statements(self, conn: Connection) -> List[str]:
+        """The SQL to execute on `conn`."""
+        raise NotImplementedError
+
+
+class Sql(Step):
+    """Plain SQL statements, run in order."""
+
+    def __init__(
+        self, description: str, *statements: str, dialects: Optional[Sequence[str]] = None
+    ):
+        super().__init__(description, dialects)
+        self.sql = statements
+
+    def statements(self, conn: Connection) -> List[str]:
+        return list(self.sql)
+
+
+class CreateIndex(Step):
+    """
+    CREATE INDEX IF NOT EXISTS. On Postgres the index is built CONCURRENTLY,
+    outside a transaction, so writes to the table are not blocked; an invalid
+    index left behind by an interrupted build is dropped and rebuilt.
+    `columns` may hold expressions and operator classes; `using` picks the
+    index method (e.g. "gin").
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        columns: Sequence[str],
+        *,
+        unique: bool = False,
+        where: Optional[str] = None,
+        concurrently: bool = True,
+        using: Optional[str] = None,
+        dialects: Optional[Sequence[str]] = None,
+    ):
+        super().__init__(f"create index {name} on {table}", dialects)
+        self.name = name
+        self.table = table
+        self.columns = tuple(columns)
+        self.unique = unique
+        self.where = where
+        self.concurrently = concurrently
+        self.using = using
+
+    def _concurrent(self, dialect: str) -> bool:
+        return self.concurrently and dialect == "postgresql"
+
+    def transactional(self, dialect: str) -> bool:
+        return not self._concurrent(dialect)
+
+    def statements(self, conn: Connection) -> List[str]:
+        concurrent = self._concurrent(conn.dialect.name)
+        sql = []
+        if concurrent and self._is_invalid(conn):
+            sql.append(f"DROP INDEX CONCURRENTLY IF EXISTS {self.name}")
+        sql.append(
+            f"CREATE {'UNIQUE ' if self.unique else ''}INDEX "
+            f"{'CONCURRENTLY ' if concurrent else ''}IF NOT EXISTS {self.name} "
+            f"ON {self.table} "
+            + (f"USING {self.using} " if self.using else "")
+            + f"({', '.join(self.columns)})"
+            + (f" WHERE {self.where}" if self.where else "")
+        )
+        return sql
+
+    def _is_invalid(self, conn: Connection) -> bool:
+        return bool(conn.execute(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"
+            ),
+            {"name": self.name},
+        ).scalar())
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A numbered schema change, applied once in version order."""
+    version: int
+    name: str
+    steps: Tuple[Step, ...]
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step; `duration_ms` is None when it was not executed."""
+    version: int
+    description: str
+    statements: List[str]
+    duration_ms: Optional[int] = None
+    skipped: bool = False
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations in version order and records each one in the
+    `schema_migrations` table, with per-step timing and a dry-run mode.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        migrations: Sequence[Migration],
+        report: Optional[Callable[[str], None]] = print,
+    ):
+        versions = [m.version for m in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError("Migration versions must be unique and in ascending order.")
+        self.engine = engine
+        self.migrations = list(migrations)
+        self.report = report or (lambda _message: None)
+        self.dialect = engine.dialect.name
+
+    def applied_versions(self) -> Set[int]:
+        """Versions recorded in the tracking table."""
+        with self.engine.connect() as conn:
+            if not self.engine.dialect.has_table(conn, schema_migrations.name):
+                return set()
+            return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    def pending(self, target: Optional[int] = None) -> List[Migration]:
+        """Migrations not applied yet, up to and including `target`."""
+        applied = self.applied_versions()
+        return [
+            m for m in self.migrations
+            if m.version not in applied and (target is None or m.version <= target)
+        ]
+
+    def run(self, target: Optional[int] = None, dry_run: bool = False) -> List[StepResult]:
+        """
+        Apply pending migrations up to `target`. With `dry_run`, report the SQL
+        each step would execute without changing anything.
+        """
+        if dry_run:
+            return self._plan(target)
+
+        with self.engine.connect() as lock_conn:
+            self._lock(lock_conn, True)
+            try:
+                migration_metadata.create_all(self.engine)
+                results = []
+                for migration in self.pending(target):
+                    results.extend(self._apply(migration))
+                return results
+            finally:
+                self._lock(lock_conn, False)
+
+    def _plan(self, target: Optional[int]) -> List[StepResult]:
+        results = []
+        with self.engine.connect() as conn:
+            for migration in self.pending(target):
+                self.report(f"[dry-run] {migration.version:04d} {migration.name}")
+                for step in migration.steps:
+                    result = self._result(migration, step)
+                    if not result.skipped:
+                        result.statements = step.statements(conn)
+                    for statement in result.statements:
+                        self.report(f"    {statement};")
+                    results.append(result)
+        return results
+
+    def _apply(self, migration: Migration) -> List[StepResult]:
+        self.report(f"Applying {migration.version:04d} {migration.name}...")
+        start = time.perf_counter()
+        results = [self._result(migration, step) for step in migration.steps]
+        runnable = [(s, r) for s, r in zip(migration.steps, results) if not r.skipped]
+
+        if all(step.transactional(self.dialect) for step, _ in runnable):
+            # Steps and bookkeeping commit together
+            with self.engine.begin() as conn:
+                for step, result in runnable:
+                    self._execute(conn, step, result)
+                self._record(conn, migration, start)
+        else:
+            for step, result in runnable:
+                if step.transactional(self.dialect):
+                    with self.engine.begin() as conn:
+                        self._execute(conn, step, result)
+                else:
+                    with self.engine.connect() as conn:
+                        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                        self._execute(conn, step, result)
+            with self.engine.begin() as conn:
+                self._record(conn, migration, start)
+
+        self.report(f"Applied {migration.version:04d} in {_elapsed_ms(start)} ms")
+        return results
+
+    def _result(self, migration: Migration, step: Step) -> StepResult:
+        return StepResult(
+            version=migration.version,
+            description=step.description,
+            statements=[],
+            skipped=not step.applies_to(self.dialect),
+        )
+
+    def _execute(self, conn: Connection, step: Step, result: StepResult) -> None:
+        if self.dialect == "postgresql":
+            # Index builds and backfills may take longer than the API's statement_timeout
+            conn.execute(text("SET statement_timeout = 0"))
+        start = time.perf_counter()
+        result.statements = step.statements(conn)
+        for statement in result.statements:
+            conn.execute(text(statement))
+        result.duration_ms = _elapsed_ms(start)
+        self.report(f"    {step.description}: {result.duration_ms} ms")
+
+    @staticmethod
+    def _record(conn: Connection, migration: Migration, start: float) -> None:
+        conn.execute(schema_migrations.insert().values(
+            version=migration.version,
+            name=migration.name,
+            applied_at=datetime.utcnow(),
+            duration_ms=_elapsed_ms(start),
+        ))
+
+    def _lock(self, conn: Connection, acquire: bool) -> None:
+        if self.dialect != "postgresql":
+            return
+        function = "pg_advisory_lock" if acquire else "pg_advisory_unlock"
+        conn.execute(text(f"SELECT {function}(:id)"), {"id": ADVISORY_LOCK_ID})
+        conn.commit()
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.perf_counter() - start) * 1000)
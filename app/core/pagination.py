@@ -0,0 +1,140 @@
+"""
+Keyset (Cursor) Pagination Module
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+
+
+def encode_cursor(sort: str, order: str, value: Any, row_id: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps(
+        {"s": sort, "o": order, "v": value, "id": str(row_id)},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> Tuple[Any, Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+    Returns the raw (value, id) pair of the row the next page starts after.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+    if not isinstance(data, dict) or "id" not in data:
+        raise InvalidCursorError("Malformed cursor.")
+    if data.get("s") != sort or data.get("o") != order:
+        raise InvalidCursorError("Cursor does not match the requested sort order.")
+    return data.get("v"), data["id"]
+
+
+def like_pattern(term: str, prefix: bool = False) -> str:
+    """ILIKE pattern matching `term` anywhere (or at the start), wildcards escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def _coerce(column, raw: Any) -> Any:
+    """Convert a JSON cursor value back to the column's python type."""
+    if raw is None:
+        return None
+    python_type = column.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        return python_type(raw)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor.") from exc
+
+
+def _after(column, value, descending: bool):
+    return column < value if descending else column > value
+
+
+def apply_keyset(
+    query,
+    column,
+    id_column,
+    *,
+    sort: str,
+    order: str,
+    cursor: Optional[str],
+    limit: int,
+    nullable: bool = False,
+):
+    """
+    Order `query` by (column, id_column) and restrict it to the rows after `cursor`.
+
+    One extra row beyond `limit` is fetched so `build_page` can tell whether a
+    next page exists. Works with both `Query` and `Select` objects.
+    Nullable columns keep Postgres' default NULL placement (last when ascending,
+    first when descending) so a plain (column, id) b-tree index serves both orders.
+    """
+    # pylint: disable=too-many-arguments
+    descending = order == "desc"
+
+    if cursor:
+        raw_value, raw_id = decode_cursor(cursor, sort, order)
+        value = _coerce(column, raw_value)
+        row_id = _coerce(id_column, raw_id)
+
+        if value is None:
+            if not nullable:
+                raise InvalidCursorError("Malformed cursor.")
+            condition = and_(column.is_(None), _after(id_column, row_id, descending))
+            if descending:
+                # NULLs come first when descending; every non-NULL row is still ahead.
+                condition = or_(condition, column.is_not(None))
+        else:
+            condition = or_(
+                _after(column, value, descending),
+                and_(column == value, _after(id_column, row_id, descending)),
+            )
+            if nullable and not descending:
+                condition = or_(condition, column.is_(None))
+        query = query.filter(condition)
+
+    if descending:
+        sort_expr = column.desc().nulls_first() if nullable else column.desc()
+        query = query.order_by(sort_expr, id_column.desc())
+    else:
+        sort_expr = column.asc().nulls_last() if nullable else column.asc()
+        query = query.order_by(sort_expr, id_column.asc())
+
+    return query.limit(limit + 1)
+
+
+def build_page(
+    rows: Sequence[Any],
+    *,
+    sort: str,
+    order: str,
+    limit: int,
+    sort_attr: Optional[str] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the extra row fetched by `apply_keyset` and compute the next cursor.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor(sort, order, getattr(last, sort_attr or sort), last.id)
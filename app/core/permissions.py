@@ -0,0 +1,94 @@
+"""
+Permission Registry Module
+"""
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+from uuid import UUID
+
+from app.core.cache import LRUCache
+
+# Every bit set: admins hold all permissions, including ones not yet interned
+ALL_PERMISSIONS = -1
+
+
+def parse_permissions(raw: Optional[str]) -> FrozenSet[str]:
+    """
+    Parse a comma-separated permission string into a set.
+    """
+    if not raw:
+        return frozenset()
+    return frozenset(p.strip() for p in raw.split(",") if p.strip())
+
+
+class PermissionRegistry:
+    """
+    Interns permission names to bit positions and caches each role's compiled
+    bitmask, so checking any number of permissions is a single AND.
+    """
+
+    def __init__(self):
+        self._bits: Dict[str, int] = {}
+        # role_id -> (raw permission string, compiled mask)
+        self._roles: Dict[UUID, Tuple[Optional[str], int]] = {}
+        # raw permission string -> compiled mask, for roles known only from token claims
+        self._claims = LRUCache(maxsize=1024)
+        self._lock = threading.Lock()
+
+    def bit(self, permission: str) -> int:
+        """Return the bit assigned to a permission, assigning one if new."""
+        bit = self._bits.get(permission)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(permission, 1 << len(self._bits))
+        return bit
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        """Compile permission names into a bitmask."""
+        mask = 0
+        for permission in permissions:
+            mask |= self.bit(permission)
+        return mask
+
+    def compile_role(self, role_id: Optional[UUID], name: Optional[str], raw: Optional[str]) -> int:
+        """
+        Return the compiled mask of a role, reusing the cached one while the
+        role's permission string is unchanged.
+        """
+        if name == "admin":
+            return ALL_PERMISSIONS
+        if role_id is None:
+            return self.compile_permissions(raw)
+
+        cached = self._roles.get(role_id)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        mask = self.mask(parse_permissions(raw))
+        with self._lock:
+            self._roles[role_id] = (raw, mask)
+        return mask
+
+    def compile_permissions(self, raw: Optional[str]) -> int:
+        """Compile a raw permission string, caching the result by its value."""
+        mask = self._claims.get(raw or "")
+        if mask is None:
+            mask = self.mask(parse_permissions(raw))
+            self._claims.set(raw or "", mask)
+        return mask
+
+    def invalidate(self, role_id: Optional[UUID] = None) -> None:
+        """Forget the compiled mask of one role, or of all roles."""
+        with self._lock:
+            if role_id is None:
+                self._roles.clear()
+            else:
+                self._roles.pop(role_id, None)
+
+
+permission_registry = PermissionRegistry()
+
+
+def has_permissions(granted: int, required: int) -> bool:
+    """
+    Check a compiled permission mask against a compiled requirement.
+    """
+    return granted & required == required
@@ -0,0 +1,129 @@
+"""
+Authenticated Principal Module
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.permissions import has_permissions, permission_registry
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Immutable snapshot of an authenticated user and their role, safe to share
+    between requests and threads.
+    """
+    # pylint: disable=too-many-instance-attributes
+    id: UUID
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    role_id: Optional[UUID]
+    role_name: Optional[str]
+    # Role permissions compiled by the permission registry
+    permission_mask: int
+    token_version: int = 0
+
+    @property
+    def is_admin(self) -> bool:
+        """Admins implicitly hold every permission."""
+        return self.role_name == "admin"
+
+    def has_permission(self, permission: str) -> bool:
+        """Check a single permission."""
+        return self.has_permissions(permission_registry.bit(permission))
+
+    def has_permissions(self, required_mask: int) -> bool:
+        """Check a precompiled set of permissions in one step."""
+        return has_permissions(self.permission_mask, required_mask)
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        """Build a principal from a UserModel with its role loaded."""
+        role = user.role
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            role_id=user.role_id,
+            role_name=role.name if role else None,
+            permission_mask=permission_registry.compile_role(
+                role.id, role.name, role.permissions
+            ) if role else 0,
+            token_version=user.token_version or 0,
+        )
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        """Build a principal from verified stateless token claims."""
+        role_id = payload.get("rid")
+        return cls(
+            id=UUID(payload["uid"]),
+            email=payload["sub"],
+            full_name=payload.get("name"),
+            is_active=True,
+            role_id=UUID(role_id) if role_id else None,
+            role_name=payload.get("role"),
+            permission_mask=permission_registry.compile_role(
+                None, payload.get("role"), payload.get("permissions")
+            ),
+            token_version=payload["ver"],
+        )
+
+
+# email -> Principal
+principal_cache = LRUCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# str(user_id) -> lowest stateless token version still accepted, i.e. the
+# user's token_version, or None once the user was deleted or deactivated.
+# Entries are read from the users row and expire like principals, so a
+# revocation made by one worker reaches the others within
+# PRINCIPAL_CACHE_TTL_SECONDS; the worker that made it records it at once.
+token_versions = LRUCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+_UNKNOWN = object()
+
+
+def is_token_revoked(user_id: str, version: int) -> Optional[bool]:
+    """
+    Check a token version against the user's cached token version.
+    Returns None when it is not cached and must be read from the database.
+    """
+    minimum = token_versions.get(user_id, _UNKNOWN)
+    if minimum is _UNKNOWN:
+        return None
+    return minimum is None or version < minimum
+
+
+def record_token_versions(versions: Dict[UUID, Optional[int]]) -> None:
+    """
+    Cache the current token version of users, None for users whose tokens
+    are all revoked.
+    """
+    for user_id, version in versions.items():
+        token_versions.set(str(user_id), version)
+
+
+def invalidate_principal(*emails: Optional[str]) -> None:
+    """
+    Drop cached principals after a user changed or was deleted.
+    """
+    for email in emails:
+        if email:
+            principal_cache.pop(email)
+
+
+def invalidate_all_principals() -> None:
+    """
+    Drop every cached principal, e.g. after a role changed.
+    """
+    principal_cache.clear()
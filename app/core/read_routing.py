@@ -0,0 +1,77 @@
+"""
+Read Replica Routing Module
+"""
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# Carries the read-your-writes window to other workers
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# str(principal_id) -> epoch seconds until which their reads go to the primary
+recent_writers = LRUCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+def mark_write(principal_id: str) -> int:
+    """
+    Pin a principal's reads to the primary for the read-your-writes window.
+    Returns the end of the window as epoch seconds.
+    """
+    until = int(time.time()) + settings.READ_YOUR_WRITES_SECONDS
+    recent_writers.set(principal_id, until)
+    return until
+
+
+def reads_pinned_to_primary(principal_id: str, cookie: Optional[str] = None) -> bool:
+    """
+    Whether a principal wrote recently, according to this worker or their cookie.
+    """
+    if recent_writers.get(principal_id) is not None:
+        return True
+    try:
+        return cookie is not None and int(cookie) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:  # pylint: disable=too-few-public-methods
+    """
+    Records successful writes by an authenticated principal so their following
+    reads skip the replica until it has caught up. Sets a cookie as well, so
+    the window holds when the next request lands on another worker.
+    """
+
+    def __init__(self, app, cookie: bool = True):
+        self.app = app
+        self.cookie = cookie
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                # Set by get_current_principal
+                principal_id = scope.get("state", {}).get("principal_id")
+                if principal_id:
+                    until = mark_write(principal_id)
+                    if self.cookie:
+                        MutableHeaders(scope=message).append(
+                            "set-cookie",
+                            f"{READ_PRIMARY_COOKIE}={until}; "
+                            f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}; "
+                            "Path=/; HttpOnly; SameSite=Lax",
+                        )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,207 @@
+"""
+Deployment History Retention Module
+"""
+import gzip
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.release import DeploymentHistoryArchiveModel, DeploymentHistoryModel
+
+HISTORY = DeploymentHistoryModel.__table__
+ARCHIVE = DeploymentHistoryArchiveModel.__table__
+DEFAULT_PARTITION = "deployment_history_default"
+PARTITION_NAME = re.compile(r"^deployment_history_p(\d{4})(\d{2})$")
+# Rows moved per statement when archiving without partitions
+ARCHIVE_BATCH_SIZE = 5000
+
+
+def month_start(value: datetime, months: int = 0) -> datetime:
+    """First instant of the month `months` away from `value`'s month."""
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the monthly partition holding `month`."""
+    return f"deployment_history_p{month:%Y%m}"
+
+
+@dataclass
+class ArchiveResult:
+    """Outcome of archiving one partition (or a batch of rows on other backends)."""
+    source: str
+    rows: int
+    destination: str
+
+
+class DeploymentHistoryRetention:
+    """
+    Keeps `deployment_history` small. On Postgres it creates monthly range
+    partitions ahead of time, and retires whole partitions past the retention
+    window by detaching them, copying their rows to `deployment_history_archive`
+    or a gzipped JSON Lines export, and dropping them. Other backends move the
+    expired rows in batches instead.
+    """
+
+    def __init__(self, engine: Engine, report: Optional[Callable[[str], None]] = print):
+        self.engine = engine
+        self.report = report or (lambda _message: None)
+
+    @property
+    def partitioned(self) -> bool:
+        """Whether the history table is range partitioned (Postgres only)."""
+        return self.engine.dialect.name == "postgresql"
+
+    def ensure_partitions(
+        self, months_ahead: int = 3, now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create the partitions for this month and the next `months_ahead`.
+        Rows already in the default partition for a new month are moved into it.
+        """
+        if not self.partitioned:
+            return []
+        now = now or datetime.utcnow()
+        with self.engine.connect() as conn:
+            existing = set(inspect(conn).get_table_names())
+        created = []
+        for offset in range(months_ahead + 1):
+            lower, upper = month_start(now, offset), month_start(now, offset + 1)
+            name = partition_name(lower)
+            if name in existing:
+                continue
+            bounds = {"lower": lower, "upper": upper}
+            with self.engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE {name} (LIKE deployment_history INCLUDING DEFAULTS)"
+                ))
+                conn.execute(text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE recorded_at >= :lower AND recorded_at < :upper RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ), bounds)
+                conn.execute(text(
+                    f"ALTER TABLE deployment_history ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+                ))
+            self.report(f"Created partition {name}")
+            created.append(name)
+        return created
+
+    def archive(
+        self,
+        retain_months: int,
+        export_dir: Optional[str] = None,
+        dry_run: bool = False,
+        now: Optional[datetime] = None,
+    ) -> List[ArchiveResult]:
+        """
+        Retire history recorded before the start of the month `retain_months`
+        ago. Rows go to `export_dir` as gzipped JSON Lines when given, otherwise
+        to the archive table.
+        """
+        cutoff = month_start(now or datetime.utcnow(), -retain_months)
+        self.report(f"Archiving deployment history before {cutoff:%Y-%m-%d}")
+        results = []
+        if self.partitioned:
+            for name in self._expired_partitions(cutoff):
+                results.append(self._archive_partition(name, export_dir, dry_run))
+        # The default partition (or an unpartitioned table) may hold stray old rows
+        results.extend(self._archive_rows(cutoff, export_dir, dry_run))
+        return results
+
+    def _expired_partitions(self, cutoff: datetime) -> List[str]:
+        with self.engine.connect() as conn:
+            names = inspect(conn).get_table_names()
+        expired = []
+        for name in sorted(names):
+            match = PARTITION_NAME.match(name)
+            if match and month_start(datetime(int(match[1]), int(match[2]), 1), 1) <= cutoff:
+                expired.append(name)
+        return expired
+
+    def _archive_partition(self, name: str, export_dir: Optional[str], dry_run: bool):
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        destination = self._destination(name, export_dir)
+        if dry_run:
+            self.report(f"[dry-run] {name}: {rows} rows -> {destination}")
+            return ArchiveResult(name, rows, destination)
+
+        # Detached first, so archiving never blocks inserts into the parent.
+        # A partition left detached by an interrupted run is picked up by name.
+        with self.engine.begin() as conn:
+            attached = conn.execute(text(
+                "SELECT 1 FROM pg_inherits WHERE inhrelid = CAST(:name AS regclass)"
+            ), {"name": name}).first()
+            if attached:
+                conn.execute(text(f"ALTER TABLE deployment_history DETACH PARTITION {name}"))
+        with self.engine.begin() as conn:
+            if export_dir:
+                self._export(conn, select(text("*")).select_from(text(name)), destination)
+            else:
+                conn.execute(text(
+                    f"INSERT INTO {ARCHIVE.name} SELECT * FROM {name} ON CONFLICT DO NOTHING"
+                ))
+            conn.execute(text(f"DROP TABLE {name}"))
+        self.report(f"Archived {name}: {rows} rows -> {destination}")
+        return ArchiveResult(name, rows, destination)
+
+    def _archive_rows(self, cutoff: datetime, export_dir: Optional[str], dry_run: bool):
+        source = DEFAULT_PARTITION if self.partitioned else HISTORY.name
+        destination = self._destination(f"{HISTORY.name}_before_{cutoff:%Y%m}", export_dir)
+        expired = HISTORY.c.recorded_at < cutoff
+        if dry_run:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    select(func.count()).select_from(HISTORY).where(expired)
+                ).scalar()
+            if rows:
+                self.report(f"[dry-run] {source}: {rows} rows -> {destination}")
+            return [ArchiveResult(source, rows, destination)] if rows else []
+
+        total = 0
+        while True:
+            with self.engine.begin() as conn:
+                batch = select(HISTORY).where(expired).limit(ARCHIVE_BATCH_SIZE)
+                rows = [dict(row) for row in conn.execute(batch).mappings()]
+                if not rows:
+                    break
+                if export_dir:
+                    self._write(rows, destination)
+                else:
+                    conn.execute(insert(ARCHIVE), rows)
+                conn.execute(delete(HISTORY).where(
+                    HISTORY.c.id.in_([row["id"] for row in rows]), expired
+                ))
+                total += len(rows)
+        if not total:
+            return []
+        self.report(f"Archived {total} rows from {source} -> {destination}")
+        return [ArchiveResult(source, total, destination)]
+
+    @staticmethod
+    def _destination(name: str, export_dir: Optional[str]) -> str:
+        if export_dir:
+            return os.path.join(export_dir, f"{name}.jsonl.gz")
+        return ARCHIVE.name
+
+    def _export(self, conn: Connection, query, path: str) -> None:
+        result = conn.execution_options(stream_results=True).execute(query).mappings()
+        for rows in iter(lambda: result.fetchmany(ARCHIVE_BATCH_SIZE), []):
+            self._write([dict(row) for row in rows], path)
+
+    @staticmethod
+    def _write(rows: List[dict], path: str) -> None:
+        """Append rows to a gzipped JSON Lines file; appends add gzip members."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as export:
+            for row in rows:
+                export.write(json.dumps(row, default=str) + "\n")
@@ -1,8 +1,11 @@
 """
 Security Utilities Module
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union, Optional
+from typing import Any, Callable, Union, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -27,11 +30,75 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+
+class PasswordHashQueueFullError(RuntimeError):
+    """Raised when the password hashing queue is at its limit."""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a small dedicated thread pool so it never blocks
+    the event loop. Work beyond `max_pending` is rejected instead of queued,
+    so a login storm cannot stall every other request on the worker.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `func(*args)` on the hashing pool and await its result.
+        Raises PasswordHashQueueFullError when the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHashQueueFullError("Too many logins in progress; retry shortly.")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash",
+                )
+            self._pending += 1
+            # Count the job until the thread finishes, even if the request is cancelled
+            future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """
+        Stop the hashing threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the bounded hashing pool.
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(
     subject: str,
     role: Optional[str] = None,
     permissions: Optional[str] = None,
     expires_delta: Union[timedelta, None] = None,
+    extra_claims: Optional[dict[str, Any]] = None,
 ) -> str:
     """
     Create a JWT access token.
@@ -44,6 +111,8 @@ def create_access_token(
         to_encode["role"] = role
     if permissions:
         to_encode["permissions"] = permissions
+    if extra_claims:
+        to_encode.update(extra_claims)
     expire = datetime.now(tz=timezone.utc) + expires_delta
     to_encode.update({"exp": expire})
 
@@ -0,0 +1,65 @@
+"""
+JSON Serialization Module
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """
+    TypeAdapter for a response type, built once per type. Building one compiles
+    the validator and serializer, which costs far more than using them.
+    """
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type: Any, value: Any) -> bytes:
+    """
+    Validate `value` (ORM objects are read by attribute) against
+    `response_type` and serialize it straight to JSON bytes in pydantic-core.
+    """
+    adapter = get_type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(
+    response_type: Any,
+    value: Any,
+    response: Optional[Response] = None,
+    status_code: int = 200,
+) -> Any:
+    """
+    Return `value` as a pre-serialized JSON response, keeping headers already
+    set on the endpoint's injected `response`. With FAST_JSON_RESPONSES off,
+    `value` is returned unchanged for FastAPI's response_model handling.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return value
+    fast = Response(
+        content=dump_json(response_type, value),
+        status_code=status_code,
+        media_type="application/json",
+    )
+    if response is not None:
+        for name, header in response.headers.items():
+            if name != "content-length":
+                fast.headers.append(name, header)
+    return fast
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by pydantic-core's encoder, which handles UUIDs,
+    datetimes and pydantic models natively and is much faster than json.dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
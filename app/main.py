@@ -1,11 +1,24 @@
 """
 Main Application Module
 """
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Request, status
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.config import settings
-from app.api.v1.endpoints import service, environment, role, auth, user, releases
-from app.api.v1.endpoints.auth import get_current_user
+from app.api.v1.endpoints import (
+    service, environment, role, auth, user, releases, metrics, delivery_metrics, search
+)
+from app.api.v1.endpoints.auth import get_current_principal
+from app.core.database import async_engine, replica_engine
+from app.core.events import release_events
+from app.core.read_routing import ReadYourWritesMiddleware
+from app.core.security import password_hasher
+from app.core.serialization import FastJSONResponse
+from app.reports.jobs import report_jobs
 
 tags_metadata = [
     {
@@ -22,6 +35,18 @@ tags_metadata = [
     }
 ]
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Application startup and shutdown hooks."""
+    report_jobs.cleanup(force=True)
+    yield
+    await release_events.stop()
+    report_jobs.shutdown()
+    password_hasher.shutdown()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
@@ -30,6 +55,12 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_tags=tags_metadata,
+    lifespan=lifespan,
+    # Wrapped in Default so routes with a response_model keep FastAPI's own
+    # pydantic-core serialization; the class renders everything else.
+    default_response_class=Default(
+        FastJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse
+    ),
 )
 
 # CORS
@@ -47,6 +78,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ReadYourWritesMiddleware, cookie=bool(settings.DATABASE_REPLICA_URL))
+
+# Pool exhaustion surfaces as a retryable 503 instead of a 500
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(_request: Request, _exc: PoolTimeoutError):
+    """Database connection pool exhausted."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy; retry shortly."},
+        headers={"Retry-After": "1"},
+    )
+
 # Health endpoint
 @app.get("/health", tags=["health"])
 def health():
@@ -58,28 +101,43 @@ def health():
 app.include_router(
     service.router,
     prefix=settings.API_V1_STR,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 app.include_router(
     environment.router,
     prefix=settings.API_V1_STR,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 app.include_router(
     role.router,
     prefix=settings.API_V1_STR,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 app.include_router(
     user.router,
     prefix=settings.API_V1_STR,
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
 app.include_router(auth.router, prefix=settings.API_V1_STR)
+app.include_router(
+    metrics.router,
+    prefix=settings.API_V1_STR,
+    dependencies=[Depends(get_current_principal)],
+)
+app.include_router(
+    search.router,
+    prefix=settings.API_V1_STR,
+    dependencies=[Depends(get_current_principal)],
+)
+app.include_router(
+    delivery_metrics.router,
+    prefix=settings.API_V1_STR,
+    dependencies=[Depends(get_current_principal)],
+)
 
 app.include_router(
     releases.router,
     prefix=f"{settings.API_V1_STR}/releases",
     tags=["releases"],
-    dependencies=[Depends(get_current_user)],
+    dependencies=[Depends(get_current_principal)],
 )
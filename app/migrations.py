@@ -0,0 +1,187 @@
+"""
+Schema Migrations Module
+"""
+from app.core.migrations import CreateIndex, Migration, Sql
+from app.models.release import RELEASE_SEARCH_DOCUMENT
+from app.models.service import SERVICE_SEARCH_DOCUMENT
+
+# Columns of deployment_history and deployment_history_archive
+_HISTORY_COLUMNS = (
+    "id UUID NOT NULL, recorded_at TIMESTAMP NOT NULL, deployment_id UUID NOT NULL, "
+    "release_id UUID NOT NULL, environment_id UUID NOT NULL, service_id UUID, "
+    "status VARCHAR(50) NOT NULL, action VARCHAR(20) NOT NULL, "
+    "PRIMARY KEY (id, recorded_at)"
+)
+
+# Append new migrations with the next version number; never edit applied ones.
+# Tables created by Base.metadata.create_all already match the models, so
+# every step must be a no-op against a fresh schema.
+MIGRATIONS = (
+    Migration(1, "deployments_service_id", (
+        Sql(
+            "add deployments.service_id",
+            "ALTER TABLE deployments ADD COLUMN IF NOT EXISTS service_id UUID "
+            "REFERENCES services (id) ON DELETE SET NULL",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(2, "release_columns", (
+        Sql(
+            "add releases.planned_release_date and role assignments",
+            "ALTER TABLE releases ADD COLUMN IF NOT EXISTS planned_release_date TIMESTAMP",
+            "ALTER TABLE releases ADD COLUMN IF NOT EXISTS owner_id UUID REFERENCES users (id)",
+            "ALTER TABLE releases "
+            "ADD COLUMN IF NOT EXISTS product_owner_id UUID REFERENCES users (id)",
+            "ALTER TABLE releases ADD COLUMN IF NOT EXISTS qa_id UUID REFERENCES users (id)",
+            "ALTER TABLE releases "
+            "ADD COLUMN IF NOT EXISTS security_analyst_id UUID REFERENCES users (id)",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(3, "release_service_version", (
+        Sql(
+            "add release_services_link.version",
+            "ALTER TABLE release_services_link ADD COLUMN IF NOT EXISTS version VARCHAR(50)",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(4, "release_updated_at", (
+        Sql(
+            "add and backfill releases.updated_at",
+            "ALTER TABLE releases ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP",
+            # Backfill from created_at so existing reports get a stable version
+            "UPDATE releases SET updated_at = created_at WHERE updated_at IS NULL",
+            "ALTER TABLE releases ALTER COLUMN updated_at SET NOT NULL",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(5, "user_token_version", (
+        Sql(
+            "add users.token_version",
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(6, "deployment_uniqueness", (
+        # Keep the most recent row of each (release, environment, service); window
+        # partitions group NULL service_ids together, covering release-level rows too.
+        Sql(
+            "collapse duplicate deployments",
+            "DELETE FROM deployments d USING ("
+            "SELECT id, row_number() OVER ("
+            "PARTITION BY release_id, environment_id, service_id "
+            "ORDER BY deployed_at DESC, id DESC) AS rn FROM deployments"
+            ") ranked WHERE d.id = ranked.id AND ranked.rn > 1",
+            dialects=("postgresql",),
+        ),
+        CreateIndex(
+            "uq_deployments_release_env_service",
+            "deployments",
+            ("release_id", "environment_id", "service_id"),
+            unique=True,
+            where="service_id IS NOT NULL",
+        ),
+        CreateIndex(
+            "uq_deployments_release_env_release_level",
+            "deployments",
+            ("release_id", "environment_id"),
+            unique=True,
+            where="service_id IS NULL",
+        ),
+    )),
+    Migration(7, "hot_path_indexes", (
+        CreateIndex(
+            "ix_deployments_release_env_service",
+            "deployments",
+            ("release_id", "environment_id", "service_id"),
+        ),
+        CreateIndex(
+            "ix_release_services_link_service_id", "release_services_link", ("service_id",)
+        ),
+        CreateIndex("ix_releases_owner_id", "releases", ("owner_id",)),
+        CreateIndex("ix_releases_product_owner_id", "releases", ("product_owner_id",)),
+        CreateIndex("ix_releases_qa_id", "releases", ("qa_id",)),
+        CreateIndex("ix_releases_security_analyst_id", "releases", ("security_analyst_id",)),
+    )),
+    Migration(8, "deployment_history", (
+        # Monthly partitions are created by scripts/archive_deployment_history.py;
+        # until then rows land in the default partition.
+        Sql(
+            "create partitioned deployment_history and its archive",
+            "CREATE TABLE IF NOT EXISTS deployment_history ("
+            + _HISTORY_COLUMNS + ") PARTITION BY RANGE (recorded_at)",
+            "CREATE TABLE IF NOT EXISTS deployment_history_default "
+            "PARTITION OF deployment_history DEFAULT",
+            "CREATE INDEX IF NOT EXISTS ix_deployment_history_release_recorded "
+            "ON deployment_history (release_id, recorded_at)",
+            "CREATE TABLE IF NOT EXISTS deployment_history_archive (" + _HISTORY_COLUMNS + ")",
+            "CREATE INDEX IF NOT EXISTS ix_deployment_history_archive_release_recorded "
+            "ON deployment_history_archive (release_id, recorded_at)",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(9, "delivery_metrics", (
+        # Backfill with scripts/rebuild_delivery_metrics.py once applied
+        Sql(
+            "create delivery metric rollups",
+            "CREATE TABLE IF NOT EXISTS delivery_metrics_daily ("
+            "day DATE NOT NULL, service_id UUID NOT NULL, environment_id UUID NOT NULL, "
+            "deployments INTEGER NOT NULL, successful_deployments INTEGER NOT NULL, "
+            "failed_deployments INTEGER NOT NULL, lead_time_samples INTEGER NOT NULL, "
+            "lead_time_seconds FLOAT NOT NULL, "
+            "PRIMARY KEY (day, service_id, environment_id))",
+            "CREATE INDEX IF NOT EXISTS ix_delivery_metrics_daily_environment_day "
+            "ON delivery_metrics_daily (environment_id, day)",
+            "CREATE TABLE IF NOT EXISTS release_first_deployments ("
+            "release_id UUID NOT NULL, environment_id UUID NOT NULL, service_id UUID NOT NULL, "
+            "deployed_at TIMESTAMP NOT NULL, lead_time_seconds BIGINT NOT NULL, "
+            "PRIMARY KEY (release_id, environment_id, service_id))",
+            dialects=("postgresql",),
+        ),
+    )),
+    Migration(10, "search_indexes", (
+        # Full-text and trigram (ILIKE '%term%') indexes behind /api/v1/search
+        Sql("enable pg_trgm", "CREATE EXTENSION IF NOT EXISTS pg_trgm", dialects=("postgresql",)),
+        *(
+            CreateIndex(name, table, (expression,), using="gin", dialects=("postgresql",))
+            for name, table, expression in (
+                ("ix_releases_search", "releases", RELEASE_SEARCH_DOCUMENT),
+                ("ix_releases_name_trgm", "releases", "name gin_trgm_ops"),
+                ("ix_releases_version_trgm", "releases", "version gin_trgm_ops"),
+                ("ix_services_search", "services", SERVICE_SEARCH_DOCUMENT),
+                ("ix_services_name_trgm", "services", "name gin_trgm_ops"),
+                ("ix_services_owner_trgm", "services", "owner gin_trgm_ops"),
+                ("ix_services_description_trgm", "services", "description gin_trgm_ops"),
+            )
+        ),
+    )),
+    Migration(11, "service_catalog_indexes", (
+        # Keyset pagination of /api/v1/service; name prefixes use ix_services_name_trgm
+        CreateIndex("ix_services_name_id", "services", ("name", "id")),
+        CreateIndex("ix_services_created_at_id", "services", ("created_at", "id")),
+        CreateIndex(
+            "ix_services_environment_id_name_id", "services", ("environment_id", "name", "id")
+        ),
+        CreateIndex("ix_services_status_name_id", "services", ("status", "name", "id")),
+        CreateIndex("ix_services_owner_name_id", "services", ("owner", "name", "id")),
+    )),
+    Migration(12, "release_keyset_indexes", (
+        # Keyset pagination of /api/v1/releases, declared on ReleaseModel
+        CreateIndex("ix_releases_created_at_id", "releases", ("created_at", "id")),
+        CreateIndex(
+            "ix_releases_planned_release_date_id", "releases", ("planned_release_date", "id")
+        ),
+        CreateIndex("ix_releases_name_id", "releases", ("name", "id")),
+    )),
+    Migration(13, "table_versions", (
+        # Conditional GETs version tables by a counter each writing transaction
+        # bumps as it commits, instead of counting rows on every request
+        Sql(
+            "create table_versions",
+            "CREATE TABLE IF NOT EXISTS table_versions ("
+            "table_name VARCHAR(64) PRIMARY KEY, version BIGINT NOT NULL, "
+            "updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL)",
+            dialects=("postgresql",),
+        ),
+    )),
+)
@@ -0,0 +1,90 @@
+"""
+Delivery Metrics Database Models
+"""
+# pylint: disable=too-few-public-methods
+from typing import List
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, Float, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.database import Base
+
+
+class DeliveryMetricsDailyModel(Base):
+    """
+    Daily rollup of service deployments per environment, maintained on every
+    deployment write. Rates and averages are derived from the counters at read
+    time, so rollups of any range or grouping are plain sums.
+    """
+    __tablename__ = "delivery_metrics_daily"
+    __table_args__ = (
+        Index("ix_delivery_metrics_daily_environment_day", "environment_id", "day"),
+    )
+
+    # UTC day of the deployment
+    day = Column(Date, primary_key=True)
+    service_id = Column(UUID(as_uuid=True), primary_key=True)
+    environment_id = Column(UUID(as_uuid=True), primary_key=True)
+    deployments = Column(Integer, nullable=False, default=0)
+    successful_deployments = Column(Integer, nullable=False, default=0)
+    failed_deployments = Column(Integer, nullable=False, default=0)
+    # First successful deployments of a release's service, and their summed
+    # lead time from release creation
+    lead_time_samples = Column(Integer, nullable=False, default=0)
+    lead_time_seconds = Column(Float, nullable=False, default=0)
+
+
+class FirstDeploymentModel(Base):
+    """
+    First successful deployment of each release's service to an environment.
+    Inserting here decides, race-free, whether a deployment counts toward
+    lead time: only the insert that creates the row does.
+    """
+    __tablename__ = "release_first_deployments"
+
+    release_id = Column(UUID(as_uuid=True), primary_key=True)
+    environment_id = Column(UUID(as_uuid=True), primary_key=True)
+    service_id = Column(UUID(as_uuid=True), primary_key=True)
+    deployed_at = Column(DateTime, nullable=False)
+    lead_time_seconds = Column(BigInteger, nullable=False)
+
+
+# Counters added on conflict when a day's rollup row already exists
+ROLLUP_COUNTERS = (
+    "deployments",
+    "successful_deployments",
+    "failed_deployments",
+    "lead_time_samples",
+    "lead_time_seconds",
+)
+
+
+def _insert(dialect_name: str, model):
+    if dialect_name == "postgresql":
+        return pg_insert(model)
+    if dialect_name == "sqlite":
+        return sqlite_insert(model)
+    raise NotImplementedError(f"Delivery metric upserts are not supported on {dialect_name}")
+
+
+def upsert_daily_rollups(dialect_name: str, rows: List[dict]):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE adding each row's counters to the
+    existing rollup of its (day, service, environment).
+    """
+    stmt = _insert(dialect_name, DeliveryMetricsDailyModel).values(rows)
+    table = DeliveryMetricsDailyModel.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "service_id", "environment_id"],
+        set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_COUNTERS},
+    )
+
+
+def insert_first_deployments(dialect_name: str, rows: List[dict]):
+    """
+    Build an INSERT of first-deployment rows that skips existing ones and
+    returns only the rows it inserted.
+    """
+    stmt = _insert(dialect_name, FirstDeploymentModel).values(rows)
+    return stmt.on_conflict_do_nothing().returning(*FirstDeploymentModel.__table__.c)
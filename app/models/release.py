@@ -4,12 +4,21 @@ Release Database Models
 # pylint: disable=too-few-public-methods
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from typing import List
+from sqlalchemy import DDL, Column, String, ForeignKey, DateTime, Index, event
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import relationship, selectinload, joinedload, raiseload
 
 from app.core.database import Base
 
+# Full-text document of a release. Search queries must use this exact
+# expression to be served by the ix_releases_search GIN index.
+RELEASE_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(version, ''))"
+)
+
+
 class ReleaseServiceLinkModel(Base):
     """
     Association table/model for Release <-> Service.
@@ -17,7 +26,10 @@ class ReleaseServiceLinkModel(Base):
     __tablename__ = "release_services_link"
 
     release_id = Column(UUID(as_uuid=True), ForeignKey("releases.id"), primary_key=True)
-    service_id = Column(UUID(as_uuid=True), ForeignKey("services.id"), primary_key=True)
+    # Leads no primary key index, so lookups by service need their own
+    service_id = Column(
+        UUID(as_uuid=True), ForeignKey("services.id"), primary_key=True, index=True
+    )
     pipeline_link = Column(String(512), nullable=True)
     version = Column(String(50), nullable=True)
 
@@ -31,6 +43,12 @@ class ReleaseModel(Base):
     Release database model.
     """
     __tablename__ = "releases"
+    __table_args__ = (
+        # Composite indexes backing keyset pagination on the releases list
+        Index("ix_releases_created_at_id", "created_at", "id"),
+        Index("ix_releases_planned_release_date_id", "planned_release_date", "id"),
+        Index("ix_releases_name_id", "name", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -43,13 +61,28 @@ class ReleaseModel(Base):
     version = Column(String(50), nullable=False)
     # pipeline_link removed, now per-service
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped on any change to the release, its service links or its deployments
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+    )
     planned_release_date = Column(DateTime, nullable=True)
 
-    # User Roles
-    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    product_owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    qa_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    security_analyst_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    # User Roles; indexed for lookups by user and FK checks on user deletes
+    owner_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
+    )
+    product_owner_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
+    )
+    qa_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
+    )
+    security_analyst_id = Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
+    )
 
     # Establish relationship to ReleaseServiceLinkModel
     service_links = relationship(
@@ -92,3 +125,155 @@ class DeploymentModel(Base):
     release = relationship("ReleaseModel", back_populates="deployments")
     environment = relationship("EnvironmentModel")
     service = relationship("ServiceModel")
+
+    # One row per (release, environment, service); recording a deployment again
+    # upserts it. Release-level rows (no service) get their own partial index,
+    # since NULLs never conflict in a plain unique index.
+    __table_args__ = (
+        # Backs rollout and report lookups, which also read release-level rows
+        Index("ix_deployments_release_env_service", "release_id", "environment_id", "service_id"),
+        Index(
+            "uq_deployments_release_env_service",
+            "release_id",
+            "environment_id",
+            "service_id",
+            unique=True,
+            postgresql_where=service_id.is_not(None),
+            sqlite_where=service_id.is_not(None),
+        ),
+        Index(
+            "uq_deployments_release_env_release_level",
+            "release_id",
+            "environment_id",
+            unique=True,
+            postgresql_where=service_id.is_(None),
+            sqlite_where=service_id.is_(None),
+        ),
+    )
+
+
+class DeploymentHistoryColumns:
+    """
+    Columns of the append-only deployment log. No foreign keys: history outlives
+    the releases, services and environments it mentions.
+    """
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    # Partition key, so part of the primary key
+    recorded_at = Column(DateTime, primary_key=True, default=datetime.utcnow, nullable=False)
+    deployment_id = Column(UUID(as_uuid=True), nullable=False)
+    release_id = Column(UUID(as_uuid=True), nullable=False)
+    environment_id = Column(UUID(as_uuid=True), nullable=False)
+    service_id = Column(UUID(as_uuid=True), nullable=True)
+    status = Column(String(50), nullable=False)
+    action = Column(String(20), nullable=False)  # deployed, undeployed
+
+
+class DeploymentHistoryModel(DeploymentHistoryColumns, Base):
+    """
+    Every deployment and undeployment, as `deployments` only keeps the latest
+    state. Range partitioned by month on Postgres (see app.core.retention);
+    rows outside the monthly partitions land in a default partition.
+    """
+    __tablename__ = "deployment_history"
+    __table_args__ = (
+        Index("ix_deployment_history_release_recorded", "release_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"},
+    )
+
+
+class DeploymentHistoryArchiveModel(DeploymentHistoryColumns, Base):
+    """
+    Deployment history past the retention window, moved out of the hot table.
+    """
+    __tablename__ = "deployment_history_archive"
+    __table_args__ = (
+        Index("ix_deployment_history_archive_release_recorded", "release_id", "recorded_at"),
+    )
+
+
+# A partitioned table rejects rows no partition accepts
+event.listen(
+    DeploymentHistoryModel.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS deployment_history_default "
+        "PARTITION OF deployment_history DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+def deployment_history_rows(deployments: List[dict], action: str) -> List[dict]:
+    """History rows for stored deployment rows (as returned by upsert_deployments)."""
+    now = datetime.utcnow()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "recorded_at": now,
+            "deployment_id": row["id"],
+            "release_id": row["release_id"],
+            "environment_id": row["environment_id"],
+            "service_id": row["service_id"],
+            "status": row["status"],
+            "action": action,
+        }
+        for row in deployments
+    ]
+
+
+def upsert_deployments(dialect_name: str, rows: List[dict], release_level: bool = False):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE for deployment rows that refreshes
+    status and deployed_at of existing rows and returns the stored rows.
+    Rows must all be service deployments, or all release-level (`release_level`).
+    """
+    if dialect_name == "postgresql":
+        stmt = pg_insert(DeploymentModel)
+    elif dialect_name == "sqlite":
+        stmt = sqlite_insert(DeploymentModel)
+    else:
+        raise NotImplementedError(f"Deployment upserts are not supported on {dialect_name}")
+
+    stmt = stmt.values(rows)
+    if release_level:
+        target = ["release_id", "environment_id"]
+        target_where = DeploymentModel.service_id.is_(None)
+    else:
+        target = ["release_id", "environment_id", "service_id"]
+        target_where = DeploymentModel.service_id.is_not(None)
+    return stmt.on_conflict_do_update(
+        index_elements=target,
+        index_where=target_where,
+        set_={"status": stmt.excluded.status, "deployed_at": stmt.excluded.deployed_at},
+    ).returning(*DeploymentModel.__table__.c)
+
+
+# Loader profiles: batch-load exactly the relationships each endpoint serializes,
+# and refuse any other lazy load so N+1 regressions fail loudly.
+_SERVICE_LINKS = selectinload(ReleaseModel.service_links).selectinload(
+    ReleaseServiceLinkModel.service
+)
+_DEPLOYMENTS = selectinload(ReleaseModel.deployments)
+_USERS = tuple(
+    joinedload(rel)
+    for rel in (
+        ReleaseModel.owner,
+        ReleaseModel.product_owner,
+        ReleaseModel.qa,
+        ReleaseModel.security_analyst,
+    )
+)
+
+RELEASE_LOADER_PROFILES = {
+    # Release schema: links with nested services, deployments, user summaries
+    "list": (_SERVICE_LINKS, _DEPLOYMENTS, *_USERS, raiseload("*")),
+    "detail": (_SERVICE_LINKS, _DEPLOYMENTS, *_USERS, raiseload("*")),
+    # PDF report: services and role assignments; the deployment matrix is aggregated in SQL
+    "report": (_SERVICE_LINKS, *_USERS, raiseload("*")),
+}
+
+
+def release_loader_options(profile: str) -> tuple:
+    """
+    Return the loader options for a named profile ("list", "detail" or "report").
+    """
+    return RELEASE_LOADER_PROFILES[profile]
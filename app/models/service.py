@@ -4,17 +4,32 @@ Service Database Model
 # pylint: disable=too-few-public-methods
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+# Full-text document of a service, served by the ix_services_search GIN index
+SERVICE_SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(owner, '') "
+    "|| ' ' || coalesce(description, ''))"
+)
+
 class ServiceModel(Base):
     """
     Service database model.
     """
     __tablename__ = "services"
+    __table_args__ = (
+        # Composite indexes backing keyset pagination of the catalog, alone or
+        # filtered by environment, status or owner
+        Index("ix_services_name_id", "name", "id"),
+        Index("ix_services_created_at_id", "created_at", "id"),
+        Index("ix_services_environment_id_name_id", "environment_id", "name", "id"),
+        Index("ix_services_status_name_id", "status", "name", "id"),
+        Index("ix_services_owner_name_id", "owner", "name", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
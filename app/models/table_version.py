@@ -0,0 +1,85 @@
+"""
+Table Version Database Model
+"""
+# pylint: disable=too-few-public-methods
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, String, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, object_session
+
+from app.core.database import Base
+
+# session.info key: names of versioned tables the session's transaction wrote
+_WRITTEN_TABLES = "versioned_tables_written"
+
+
+class TableVersionModel(Base):
+    """
+    Write counter of each table that has an updated_at column, versioning it
+    for conditional GETs. Every transaction that inserts, updates or deletes
+    rows bumps the counter as it commits, so a new version is never visible
+    before the data it stands for.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    # When the last bump committed; only feeds Last-Modified
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+def is_versioned(table) -> bool:
+    """Whether writes to `table` bump its version."""
+    return table.name != TableVersionModel.__tablename__ and "updated_at" in table.c
+
+
+def bump_version(dialect_name: str, table_name: str):
+    """Build an upsert adding one to a table's version."""
+    insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+    now = datetime.utcnow()
+    stmt = insert(TableVersionModel).values(table_name=table_name, version=1, updated_at=now)
+    return stmt.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"version": TableVersionModel.version + 1, "updated_at": now},
+    )
+
+
+def _record_write(session: Session, table) -> None:
+    if session is not None and is_versioned(table):
+        session.info.setdefault(_WRITTEN_TABLES, set()).add(table.name)
+
+
+def _record_flushed_row(mapper, _connection, target):
+    _record_write(object_session(target), mapper.local_table)
+
+
+def _record_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            _record_write(orm_execute_state.session, table)
+
+
+def _bump_written_tables(session: Session):
+    # Flush first: commit only flushes after before_commit hooks have run
+    session.flush()
+    tables = session.info.pop(_WRITTEN_TABLES, None)
+    if tables:
+        connection = session.connection()
+        # Sorted, so concurrent writers lock version rows in the same order
+        for name in sorted(tables):
+            connection.execute(bump_version(connection.dialect.name, name))
+
+
+def _forget_written_tables(session: Session, *_args):
+    session.info.pop(_WRITTEN_TABLES, None)
+
+
+# ORM flushes, and insert/update/delete statements run through a session
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Base, _event, _record_flushed_row, propagate=True)
+event.listen(Session, "do_orm_execute", _record_statement)
+event.listen(Session, "before_commit", _bump_written_tables)
+event.listen(Session, "after_rollback", _forget_written_tables)
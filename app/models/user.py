@@ -5,7 +5,7 @@ User Database Model
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -29,6 +29,8 @@ class UserModel(Base):
     full_name = Column(String(255), nullable=True)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Bumped to revoke every token issued before the change
+    token_version = Column(Integer, default=0, nullable=False)
 
     # FK to roles.id
     role_id = Column(
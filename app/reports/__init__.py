@@ -0,0 +1,3 @@
+"""
+Reports Package
+"""
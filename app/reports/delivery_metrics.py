@@ -0,0 +1,215 @@
+"""
+Delivery Metrics (DORA) Module
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, exists, func, insert, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.delivery_metrics import (
+    ROLLUP_COUNTERS,
+    DeliveryMetricsDailyModel,
+    FirstDeploymentModel,
+    insert_first_deployments,
+    upsert_daily_rollups,
+)
+from app.models.release import DeploymentHistoryModel, DeploymentModel, ReleaseModel
+
+# Rows per multi-row INSERT when rebuilding
+REBUILD_BATCH_SIZE = 1000
+
+CellKey = Tuple[date, UUID, UUID]
+
+
+def first_deployment_rows(
+    deployments: Iterable[Mapping], release_created_at: Optional[datetime]
+) -> List[dict]:
+    """Candidate first-deployment rows for the successful service deployments."""
+    if release_created_at is None:
+        return []
+    return [
+        {
+            "release_id": row["release_id"],
+            "environment_id": row["environment_id"],
+            "service_id": row["service_id"],
+            "deployed_at": row["deployed_at"],
+            "lead_time_seconds": max(
+                0, int((row["deployed_at"] - release_created_at).total_seconds())
+            ),
+        }
+        for row in deployments
+        if row["service_id"] is not None and row["status"] == "success"
+    ]
+
+
+def accumulate(
+    cells: Dict[CellKey, dict], deployments: Iterable[Mapping], firsts: Iterable[Mapping]
+) -> None:
+    """Add deployments and first deployments to per-day rollup cells."""
+
+    def cell(at: datetime, row: Mapping) -> dict:
+        key = (at.date(), row["service_id"], row["environment_id"])
+        if key not in cells:
+            cells[key] = {
+                "day": key[0],
+                "service_id": key[1],
+                "environment_id": key[2],
+                **dict.fromkeys(ROLLUP_COUNTERS, 0),
+            }
+        return cells[key]
+
+    for row in deployments:
+        if row["service_id"] is None:
+            continue
+        counters = cell(row["deployed_at"], row)
+        counters["deployments"] += 1
+        if row["status"] == "success":
+            counters["successful_deployments"] += 1
+        elif row["status"] == "failed":
+            counters["failed_deployments"] += 1
+    for row in firsts:
+        counters = cell(row["deployed_at"], row)
+        counters["lead_time_samples"] += 1
+        counters["lead_time_seconds"] += row["lead_time_seconds"]
+
+
+async def record_deployments(
+    db: AsyncSession, deployments: Sequence[Mapping], release_created_at: Optional[datetime]
+) -> None:
+    """
+    Fold freshly written deployment rows of one release into the daily
+    rollups, in the caller's transaction. Costs at most two statements however
+    many rows were written. Release-level deployments (no service) are not
+    rolled up.
+    """
+    rows = [row for row in deployments if row["service_id"] is not None]
+    if not rows:
+        return
+    dialect = db.bind.dialect.name
+    firsts = first_deployment_rows(rows, release_created_at)
+    if firsts:
+        firsts = (await db.execute(insert_first_deployments(dialect, firsts))).mappings().all()
+    cells: Dict[CellKey, dict] = {}
+    accumulate(cells, rows, firsts)
+    # Sorted, so concurrent writers lock shared rollup rows in the same order
+    await db.execute(upsert_daily_rollups(dialect, [cells[key] for key in sorted(cells)]))
+
+
+def _deployment_events():
+    """Every recorded service deployment, plus current ones that predate the history."""
+    history = DeploymentHistoryModel
+    recorded = select(
+        history.release_id,
+        history.environment_id,
+        history.service_id,
+        history.status,
+        history.recorded_at.label("deployed_at"),
+    ).where(history.action == "deployed", history.service_id.is_not(None))
+    untracked = select(
+        DeploymentModel.release_id,
+        DeploymentModel.environment_id,
+        DeploymentModel.service_id,
+        DeploymentModel.status,
+        DeploymentModel.deployed_at,
+    ).where(
+        DeploymentModel.service_id.is_not(None),
+        ~exists().where(history.deployment_id == DeploymentModel.id),
+    )
+    return recorded.union_all(untracked).subquery()
+
+
+def rebuild_delivery_metrics(engine: Engine) -> int:
+    """
+    Recompute every rollup from the deployment history, plus current
+    deployments that predate it. On Postgres the rollup tables stay locked
+    until the rebuild commits, so concurrent deployments queue behind it and
+    then add their own counts. Returns the number of rollup rows written.
+    """
+    events = _deployment_events()
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text(
+                "LOCK TABLE delivery_metrics_daily, release_first_deployments IN EXCLUSIVE MODE"
+            ))
+        created = dict(conn.execute(select(ReleaseModel.id, ReleaseModel.created_at)).all())
+        cells: Dict[CellKey, dict] = {}
+        firsts: Dict[Tuple[UUID, UUID, UUID], dict] = {}
+        result = conn.execution_options(stream_results=True).execute(
+            select(events).order_by(events.c.deployed_at)
+        ).mappings()
+        for rows in iter(lambda: result.fetchmany(REBUILD_BATCH_SIZE), []):
+            for row in rows:
+                key = (row["release_id"], row["environment_id"], row["service_id"])
+                if key not in firsts:
+                    candidates = first_deployment_rows([row], created.get(row["release_id"]))
+                    if candidates:
+                        firsts[key] = candidates[0]
+                        accumulate(cells, [], candidates)
+            accumulate(cells, rows, [])
+
+        conn.execute(delete(DeliveryMetricsDailyModel))
+        conn.execute(delete(FirstDeploymentModel))
+        for model, values in ((FirstDeploymentModel, list(firsts.values())),
+                              (DeliveryMetricsDailyModel, list(cells.values()))):
+            for start in range(0, len(values), REBUILD_BATCH_SIZE):
+                conn.execute(insert(model), values[start:start + REBUILD_BATCH_SIZE])
+    return len(cells)
+
+
+def metric_bucket(counters: Mapping) -> dict:
+    """Counters of a rollup group with the rates derived from them."""
+    bucket = {name: counters[name] or 0 for name in ROLLUP_COUNTERS}
+    deployments, samples = bucket["deployments"], bucket["lead_time_samples"]
+    return {
+        **{key: counters.get(key) for key in ("day", "service_id", "environment_id")},
+        **bucket,
+        "change_failure_rate": bucket["failed_deployments"] / deployments if deployments else None,
+        "lead_time_seconds_avg": bucket["lead_time_seconds"] / samples if samples else None,
+    }
+
+
+async def query_delivery_metrics(  # pylint: disable=too-many-arguments
+    db: AsyncSession,
+    start: date,
+    end: date,
+    group_by: Sequence[str] = ("day",),
+    *,
+    environment_ids: Optional[Sequence[UUID]] = None,
+    service_ids: Optional[Sequence[UUID]] = None,
+) -> dict:
+    """
+    Sum the daily rollups between `start` and `end` (inclusive), grouped by any
+    of "day", "service" and "environment". Shaped like `DeliveryMetrics`.
+    """
+    rollup = DeliveryMetricsDailyModel
+    columns = {
+        "day": rollup.day,
+        "service": rollup.service_id,
+        "environment": rollup.environment_id,
+    }
+    keys = [columns[name] for name in dict.fromkeys(group_by)]
+    query = (
+        select(*keys, *(func.sum(getattr(rollup, name)).label(name) for name in ROLLUP_COUNTERS))
+        .where(rollup.day >= start, rollup.day <= end)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    if environment_ids:
+        query = query.where(rollup.environment_id.in_(environment_ids))
+    if service_ids:
+        query = query.where(rollup.service_id.in_(service_ids))
+
+    groups = (await db.execute(query)).mappings().all()
+    totals = {name: sum(group[name] or 0 for group in groups) for name in ROLLUP_COUNTERS}
+    days = (end - start).days + 1
+    return {
+        "start": start,
+        "end": end,
+        "group_by": list(dict.fromkeys(group_by)),
+        "deployment_frequency": totals["successful_deployments"] / days,
+        "totals": metric_bucket(totals),
+        "series": [metric_bucket(group) for group in groups if keys],
+    }
@@ -0,0 +1,157 @@
+"""
+Asynchronous Report Job Module
+"""
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.reports.pdf import write_release_report
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ReportQueueFullError(RuntimeError):
+    """Raised when this process already has the maximum number of queued report jobs."""
+
+
+class ReportJobManager:
+    """
+    Submits report renders to a bounded process pool and tracks them as files on
+    disk: `<job_id>.json` holds the job state and `<job_id>.pdf` the finished report.
+    Keeping state on disk lets any worker process on the host answer polls.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, directory: str, workers: int, max_pending: int, ttl_seconds: int):
+        self.directory = directory
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.{suffix}")
+
+    def _write(self, job: dict) -> None:
+        path = self._path(job["id"], "json")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+            json.dump(job, fh)
+        os.replace(f"{path}.tmp", path)
+
+    def submit(self, release_id: UUID, filename: str, context: dict) -> dict:
+        """
+        Queue a render of `context` and return the new job's state.
+        Raises ReportQueueFullError when the pending-job limit is reached.
+        """
+        self.cleanup()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ReportQueueFullError("Too many report jobs queued; retry shortly.")
+            executor = self._get_executor()
+            self._pending += 1
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "release_id": str(release_id),
+            "status": "pending",
+            "filename": filename,
+            "created_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "error": None,
+        }
+        try:
+            self._write(job)
+            future = executor.submit(write_release_report, context, self._path(job["id"], "pdf"))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(lambda f: self._finish(job["id"], f))
+        return job
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+        job = self.get(job_id)
+        if job is None:
+            return
+        if future.cancelled():
+            job["status"], job["error"] = "failed", "Cancelled"
+        elif future.exception() is not None:
+            exc = future.exception()
+            job["status"], job["error"] = "failed", str(exc) or exc.__class__.__name__
+        else:
+            job["status"] = "done"
+        job["finished_at"] = datetime.utcnow().isoformat()
+        self._write(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Return a job's state, or None if it is unknown or expired.
+        """
+        if not _JOB_ID.match(job_id):
+            return None
+        try:
+            with open(self._path(job_id, "json"), encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def artifact_path(self, job_id: str) -> str:
+        """
+        Path of a finished job's PDF.
+        """
+        return self._path(job_id, "pdf")
+
+    def cleanup(self, force: bool = False) -> None:
+        """
+        Delete job files older than the TTL. Runs at most once a minute unless forced.
+        """
+        now = time.time()
+        if not force and now - self._last_cleanup < min(self.ttl_seconds, 60):
+            return
+        self._last_cleanup = now
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl_seconds:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes, cancelling jobs that have not started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_jobs = ReportJobManager(
+    directory=settings.REPORT_ARTIFACT_DIR,
+    workers=settings.REPORT_WORKERS,
+    max_pending=settings.REPORT_MAX_PENDING_JOBS,
+    ttl_seconds=settings.REPORT_ARTIFACT_TTL_SECONDS,
+)
@@ -0,0 +1,171 @@
+"""
+Release PDF Report Rendering Module
+"""
+import os
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+
+def render_release_report(context: dict) -> bytes:
+    """
+    Render a release report to PDF bytes.
+
+    `context` is plain data built by `app.reports.release_report.build_report_context`,
+    so rendering needs no database session.
+    """
+    # pylint: disable=too-many-locals, too-many-statements
+    # Create PDF buffer
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch
+    )
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Title
+    title_style = ParagraphStyle(
+        'Title',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=20
+    )
+    elements.append(Paragraph(f"Release Report: {context['name']}", title_style))
+    elements.append(Spacer(1, 12))
+
+    # Release Info Section
+    elements.append(Paragraph("Release Information", styles['Heading2']))
+    created_str = context["created_at"].strftime("%Y-%m-%d %H:%M:%S") \
+        if context["created_at"] else "—"
+    planned_str = context["planned_release_date"].strftime("%Y-%m-%d %H:%M:%S") \
+        if context["planned_release_date"] else "—"
+
+    release_info = [
+        ["Field", "Value"],
+        ["Release Name", context["name"]],
+        ["Version", context["version"]],
+        ["Created At", created_str],
+        ["Planned Date", planned_str],
+    ]
+
+    t = Table(release_info, colWidths=[2*inch, 4*inch])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    elements.append(t)
+    elements.append(Spacer(1, 20))
+
+    # Role Assignments Section
+    elements.append(Paragraph("Role Assignments", styles['Heading2']))
+    roles_data = [["Role", "Assigned To"]]
+    roles_data.extend([label, name or "—"] for label, name in context["roles"])
+
+    t2 = Table(roles_data, colWidths=[2*inch, 4*inch])
+    t2.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    elements.append(t2)
+    elements.append(Spacer(1, 20))
+
+    # Services Section
+    elements.append(Paragraph("Included Services", styles['Heading2']))
+    services_data = [["Service Name", "Owner", "Version", "Pipeline Link"]]
+
+    for service in context["services"]:
+        services_data.append([
+            service["name"] or "—",
+            service["owner"] or "—",
+            service["version"] or "—",
+            service["pipeline_link"] or "—"
+        ])
+
+    if len(services_data) > 1:
+        t3 = Table(services_data, colWidths=[1.5*inch, 1.2*inch, 1*inch, 2.3*inch])
+        t3.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]))
+        elements.append(t3)
+    else:
+        elements.append(Paragraph("No services included.", styles['Normal']))
+
+    elements.append(Spacer(1, 20))
+
+    # Deployment Status Section
+    elements.append(Paragraph("Deployment Status", styles['Heading2']))
+
+    # Build deployment matrix
+    rollout = context["rollout"]
+    environments = rollout["environments"]
+    if rollout["services"] and environments:
+        deploy_header = ["Service"] + [e["environment_name"] for e in environments]
+        deploy_data = [deploy_header]
+
+        for service_row in rollout["services"]:
+            row = [service_row["service_name"]]
+            for env in environments:
+                deployed_at = service_row["deployments"].get(env["environment_id"])
+                if deployed_at:
+                    row.append(deployed_at.strftime("%Y-%m-%d %H:%M"))
+                else:
+                    row.append("Not Deployed")
+            deploy_data.append(row)
+
+        col_widths = [1.5*inch] + [1.2*inch] * len(environments)
+        t4 = Table(deploy_data, colWidths=col_widths)
+        t4.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 7),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ]))
+        elements.append(t4)
+    else:
+        elements.append(Paragraph("No deployment data available.", styles['Normal']))
+
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def write_release_report(context: dict, path: str) -> str:
+    """
+    Render a release report and write it to `path` atomically.
+    Entry point for report worker processes.
+    """
+    pdf = render_release_report(context)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(pdf)
+    os.replace(tmp_path, path)
+    return path
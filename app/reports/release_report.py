@@ -0,0 +1,107 @@
+"""
+Release Report Data and Cache Module
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.http_cache import make_etag, table_versions
+from app.models.environment import EnvironmentModel
+from app.models.release import ReleaseModel, release_loader_options
+from app.models.service import ServiceModel
+from app.models.table_version import TableVersionModel
+from app.models.user import UserModel
+from app.reports.rollout import build_rollouts
+
+# release_id -> (etag, pdf bytes). Entries are also checked against the current
+# version on read, so a worker that missed an invalidation never serves stale bytes.
+report_cache = LRUCache(maxsize=settings.REPORT_CACHE_MAX_ENTRIES)
+
+
+class ReportVersion(NamedTuple):
+    """Validators identifying the current content of a release report."""
+    etag: str
+    last_modified: datetime
+    filename: str
+
+
+async def report_version(db: AsyncSession, release_id: UUID) -> Optional[ReportVersion]:
+    """
+    Compute the report's content version without loading the release graph.
+    Returns None if the release does not exist.
+    """
+    release = (await db.execute(
+        select(
+            ReleaseModel.name,
+            ReleaseModel.version,
+            ReleaseModel.updated_at,
+        ).where(ReleaseModel.id == release_id)
+    )).first()
+    if not release:
+        return None
+
+    # The deployment matrix has one column per environment; the service rows
+    # and role assignments embed service and user names
+    models = (EnvironmentModel, ServiceModel, UserModel)
+    versions = await table_versions(db, *models)
+    bumped_at = (await db.execute(
+        select(func.max(TableVersionModel.updated_at)).where(
+            TableVersionModel.table_name.in_([model.__tablename__ for model in models])
+        )
+    )).scalar()
+
+    last_modified = max(filter(None, [release.updated_at, bumped_at]))
+    return ReportVersion(
+        etag=make_etag(release_id, release.updated_at, *versions),
+        last_modified=last_modified,
+        filename=f"release_report_{release.name.replace(' ', '_')}_{release.version}.pdf",
+    )
+
+
+async def build_report_context(db: AsyncSession, release_id: UUID) -> dict:
+    """
+    Collect everything the PDF renderer needs as plain data.
+    """
+    release = (await db.scalars(
+        select(ReleaseModel)
+        .options(*release_loader_options("report"))
+        .where(ReleaseModel.id == release_id)
+    )).one()
+
+    def user_name(user):
+        return (user.full_name or user.email) if user else None
+
+    return {
+        "name": release.name,
+        "version": release.version,
+        "created_at": release.created_at,
+        "planned_release_date": release.planned_release_date,
+        "roles": [
+            ("Release Owner", user_name(release.owner)),
+            ("Product Owner", user_name(release.product_owner)),
+            ("QA Engineer", user_name(release.qa)),
+            ("Security Analyst", user_name(release.security_analyst)),
+        ],
+        "services": [
+            {
+                "name": link.service.name if link.service else None,
+                "owner": link.service.owner if link.service else None,
+                "version": link.version,
+                "pipeline_link": link.pipeline_link,
+            }
+            for link in release.service_links
+        ],
+        "rollout": (await build_rollouts(db, [release_id]))[release_id],
+    }
+
+
+def invalidate_report(release_id: UUID) -> None:
+    """
+    Drop the cached report of a release after it changed.
+    """
+    report_cache.pop(release_id)
@@ -0,0 +1,90 @@
+"""
+Deployment Rollout Aggregation Module
+"""
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.environment import EnvironmentModel
+from app.models.release import DeploymentModel, ReleaseServiceLinkModel
+from app.models.service import ServiceModel
+
+
+async def build_rollouts(db: AsyncSession, release_ids: Iterable[UUID]) -> Dict[UUID, dict]:
+    """
+    Build the service x environment rollout matrix for each release.
+
+    A cell holds the latest successful deployment time of a linked service in an
+    environment. Cells come from a single GROUP BY over the links outer-joined to
+    their successful deployments; releases without links get an empty matrix.
+    Returns {release_id: rollout} shaped like the `ReleaseRollout` schema.
+    """
+    rollouts = {
+        release_id: {"release_id": release_id, "services": {}}
+        for release_id in release_ids
+    }
+    if not rollouts:
+        return {}
+
+    environments = (await db.execute(
+        select(EnvironmentModel.id, EnvironmentModel.name).order_by(EnvironmentModel.name)
+    )).all()
+
+    cells = await db.execute(
+        select(
+            ReleaseServiceLinkModel.release_id,
+            ReleaseServiceLinkModel.service_id,
+            ServiceModel.name,
+            DeploymentModel.environment_id,
+            func.max(DeploymentModel.deployed_at),
+        )
+        .join(ServiceModel, ServiceModel.id == ReleaseServiceLinkModel.service_id)
+        .outerjoin(
+            DeploymentModel,
+            (DeploymentModel.release_id == ReleaseServiceLinkModel.release_id)
+            & (DeploymentModel.service_id == ReleaseServiceLinkModel.service_id)
+            & (DeploymentModel.status == "success"),
+        )
+        .where(ReleaseServiceLinkModel.release_id.in_(list(rollouts)))
+        .group_by(
+            ReleaseServiceLinkModel.release_id,
+            ReleaseServiceLinkModel.service_id,
+            ServiceModel.name,
+            DeploymentModel.environment_id,
+        )
+    )
+
+    for release_id, service_id, service_name, environment_id, deployed_at in cells:
+        services = rollouts[release_id]["services"]
+        row = services.setdefault(
+            service_id,
+            {"service_id": service_id, "service_name": service_name, "deployments": {}},
+        )
+        if environment_id is not None:
+            row["deployments"][environment_id] = deployed_at
+
+    for rollout in rollouts.values():
+        rollout["services"] = sorted(
+            rollout["services"].values(), key=lambda row: row["service_name"]
+        )
+        rollout["total_services"] = len(rollout["services"])
+        rollout["environments"] = _environment_progress(
+            environments, rollout["services"], rollout["total_services"]
+        )
+    return rollouts
+
+
+def _environment_progress(environments, services: List[dict], total: int) -> List[dict]:
+    """Per-environment deployed counts and percentages."""
+    progress = []
+    for environment_id, name in environments:
+        deployed = sum(1 for row in services if environment_id in row["deployments"])
+        progress.append({
+            "environment_id": environment_id,
+            "environment_name": name,
+            "deployed_count": deployed,
+            "percent": round(deployed * 100 / total) if total else 0,
+        })
+    return progress
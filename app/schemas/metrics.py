@@ -0,0 +1,66 @@
+"""
+Metrics Pydantic Schemas
+"""
+# pylint: disable=too-few-public-methods
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class WaitBucket(BaseModel):
+    """Checkouts that waited at most `le_ms` (None: longer than every bound)."""
+    le_ms: Optional[int] = None
+    count: int
+
+
+class PoolStats(BaseModel):
+    """State and cumulative counters of one connection pool."""
+    name: str
+    size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    checked_out: int
+    peak_checked_out: int
+    saturation: Optional[float] = None
+    connects: int
+    checkouts: int
+    invalidations: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+    wait_histogram: List[WaitBucket]
+
+
+class DatabaseMetrics(BaseModel):
+    """Metrics of every database connection pool in this process."""
+    pools: List[PoolStats]
+
+
+class DeliveryMetricsBucket(BaseModel):
+    """
+    Deployment counters of one group (or of the whole range) with the DORA
+    rates derived from them. Grouping keys not requested are null.
+    """
+    day: Optional[date] = None
+    service_id: Optional[UUID] = None
+    environment_id: Optional[UUID] = None
+    deployments: int
+    successful_deployments: int
+    failed_deployments: int
+    # failed / all deployments
+    change_failure_rate: Optional[float] = None
+    # First successful deployments of a release's service, and their mean lead
+    # time from release creation
+    lead_time_samples: int
+    lead_time_seconds_avg: Optional[float] = None
+
+
+class DeliveryMetrics(BaseModel):
+    """Delivery metrics of a date range, read from the daily rollups."""
+    start: date
+    end: date
+    group_by: List[str]
+    # Successful deployments per day over the range
+    deployment_frequency: float
+    totals: DeliveryMetricsBucket
+    series: List[DeliveryMetricsBucket]
@@ -0,0 +1,21 @@
+"""
+Pagination Pydantic Schemas
+"""
+# pylint: disable=too-few-public-methods
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Keyset-paginated response envelope."""
+    items: List[T]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page; null on the last page.",
+    )
+    has_more: bool = False
+    limit: int
+    sort: str
+    order: str
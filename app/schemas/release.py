@@ -4,8 +4,8 @@ Release Pydantic Schemas
 # pylint: disable=too-few-public-methods
 from datetime import datetime
 from uuid import UUID
-from typing import List, Optional
-from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.schemas.service import Service
 
@@ -21,6 +21,29 @@ class DeploymentCreate(BaseModel):
     service_id: Optional[UUID] = None
     status: str = "success"
 
+class BulkDeploymentEntry(BaseModel):
+    """One service deployment inside a bulk request."""
+    service_id: UUID
+    environment_id: UUID
+    status: str = "success"
+
+class BulkDeploymentCreate(BaseModel):
+    """
+    Schema for recording many deployments of a release at once.
+    Either list `deployments`, or set `environment_id` to deploy every
+    linked service of the release to that environment.
+    """
+    deployments: List[BulkDeploymentEntry] = Field(default_factory=list, max_length=1000)
+    environment_id: Optional[UUID] = None
+    status: str = "success"
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        """Require exactly one of `deployments` or `environment_id`."""
+        if bool(self.deployments) == (self.environment_id is not None):
+            raise ValueError("Provide either deployments or environment_id")
+        return self
+
 class Deployment(BaseModel):
     """Deployment response schema."""
     id: UUID
@@ -34,6 +57,21 @@ class Deployment(BaseModel):
         """Pydantic Config."""
         from_attributes = True
 
+class DeploymentHistoryEntry(BaseModel):
+    """One recorded deployment or undeployment."""
+    id: UUID
+    recorded_at: datetime
+    deployment_id: UUID
+    release_id: UUID
+    environment_id: UUID
+    service_id: Optional[UUID] = None
+    status: str
+    action: str
+
+    class Config:
+        """Pydantic Config."""
+        from_attributes = True
+
 # Release Schemas
 
 class ReleaseServiceLinkCreate(BaseModel):
@@ -128,3 +166,70 @@ class Release(ReleaseBase):
     class Config:
         """Pydantic Config."""
         from_attributes = True
+
+
+class ServiceLinkChanges(BaseModel):
+    """Service ids whose links a release update added, updated or removed."""
+    added: List[UUID] = []
+    updated: List[UUID] = []
+    removed: List[UUID] = []
+
+
+class ReleaseUpdateResult(Release):
+    """Release response of an update, with the service links it changed."""
+    service_link_changes: ServiceLinkChanges = ServiceLinkChanges()
+
+
+class EnvironmentRolloutCount(BaseModel):
+    """Number of a release's services successfully deployed to one environment."""
+    environment_id: UUID
+    deployed_count: int
+
+
+class ReleaseSummary(ReleaseBase):
+    """Lightweight release projection for list views."""
+    id: UUID
+    created_at: datetime
+    owner_id: Optional[UUID] = None
+    service_count: int = 0
+    rollout: List[EnvironmentRolloutCount] = []
+
+
+# Rollout Schemas
+
+class EnvironmentRollout(BaseModel):
+    """Rollout progress of a release in one environment."""
+    environment_id: UUID
+    environment_name: str
+    deployed_count: int
+    percent: int
+
+
+class ServiceRollout(BaseModel):
+    """One matrix row: latest successful deployment per environment for a service."""
+    service_id: UUID
+    service_name: str
+    deployments: Dict[UUID, datetime] = Field(
+        default={},
+        description="Environment ID -> latest successful deployment time.",
+    )
+
+
+class ReleaseRollout(BaseModel):
+    """Service x environment rollout matrix for a release."""
+    release_id: UUID
+    total_services: int
+    environments: List[EnvironmentRollout] = []
+    services: List[ServiceRollout] = []
+
+
+# Report Job Schemas
+
+class ReportJob(BaseModel):
+    """Asynchronous report generation job."""
+    id: str
+    release_id: UUID
+    status: str = Field(..., example="pending", description="pending, done or failed")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
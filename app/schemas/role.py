@@ -30,6 +30,10 @@ class RoleUpdate(BaseModel):
     """Schema for updating a Role."""
     name: Optional[str] = Field(default=None)
     description: Optional[str] = Field(default=None)
+    permissions: Optional[str] = Field(
+        default=None,
+        description="Comma-separated list of permissions"
+    )
 
 
 class Role(RoleBase):
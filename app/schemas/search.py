@@ -0,0 +1,19 @@
+"""
+Search Pydantic Schemas
+"""
+# pylint: disable=too-few-public-methods
+from typing import Literal, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """A release or service matching a search, with its relevance."""
+    type: Literal["release", "service"]
+    id: UUID
+    # Release or service name
+    title: str
+    # Release version, or service owner
+    subtitle: Optional[str] = None
+    description: Optional[str] = None
+    rank: float
@@ -0,0 +1,56 @@
+"""
+Script to maintain deployment history partitions and archive old history.
+
+    python scripts/archive_deployment_history.py                   # partitions + archive
+    python scripts/archive_deployment_history.py --partitions-only # create partitions
+    python scripts/archive_deployment_history.py --export-dir var/history --dry-run
+
+Run it daily (e.g. from cron); partitions are created three months ahead.
+"""
+# pylint: disable=wrong-import-position
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.retention import DeploymentHistoryRetention
+
+
+def main():
+    """Parse arguments, create upcoming partitions and archive expired history."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--retain-months",
+        type=int,
+        default=settings.DEPLOYMENT_HISTORY_RETAIN_MONTHS,
+        help="months of history to keep in deployment_history",
+    )
+    parser.add_argument("--months-ahead", type=int, default=3, help="partitions to pre-create")
+    parser.add_argument(
+        "--export-dir", help="write expired history here as .jsonl.gz instead of the archive table"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report without changing anything")
+    parser.add_argument("--partitions-only", action="store_true", help="skip archiving")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    retention = DeploymentHistoryRetention(engine)
+
+    if not args.dry_run:
+        retention.ensure_partitions(args.months_ahead)
+    if args.partitions_only:
+        return
+    results = retention.archive(args.retain_months, args.export_dir, args.dry_run)
+    if not results:
+        print("Nothing to archive.")
+    elif not args.dry_run:
+        print(f"Done: {sum(r.rows for r in results)} rows archived.")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,7 @@ from app.models.environment import EnvironmentModel # pylint: disable=unused-imp
 from app.models.role import RoleModel
 from app.models.user import UserModel
 from app.models.release import ReleaseModel, DeploymentModel # pylint: disable=unused-import
+from app.models.table_version import TableVersionModel # pylint: disable=unused-import
 from app.core.security import get_password_hash
 
 
@@ -0,0 +1,52 @@
+"""
+Script to apply pending schema migrations.
+
+    python scripts/migrate.py                # apply everything pending
+    python scripts/migrate.py --dry-run      # print the SQL without running it
+    python scripts/migrate.py --status       # list applied and pending versions
+    python scripts/migrate.py --target 6     # stop after version 6
+"""
+# pylint: disable=wrong-import-position
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.migrations import MigrationRunner
+from app.migrations import MIGRATIONS
+
+
+def main():
+    """Parse arguments and run the migrations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing it")
+    parser.add_argument("--status", action="store_true", help="list migration versions")
+    parser.add_argument("--target", type=int, help="highest version to apply")
+    args = parser.parse_args()
+
+    # A dedicated engine without the API's pool and statement timeout
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    runner = MigrationRunner(engine, MIGRATIONS)
+
+    if args.status:
+        applied = runner.applied_versions()
+        for migration in MIGRATIONS:
+            state = "applied" if migration.version in applied else "pending"
+            print(f"{migration.version:04d} {migration.name:<32} {state}")
+        return
+
+    results = runner.run(target=args.target, dry_run=args.dry_run)
+    if not results:
+        print("No pending migrations.")
+    elif not args.dry_run:
+        executed = [r for r in results if r.duration_ms is not None]
+        print(f"Done: {len(executed)} steps in {sum(r.duration_ms for r in executed)} ms.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Script to rebuild the delivery metric rollups from deployment history.
+
+    python scripts/rebuild_delivery_metrics.py
+
+Needed once after migration 9, and whenever rollups are suspected to drift;
+deployment writes keep them current otherwise.
+"""
+# pylint: disable=wrong-import-position
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+# Models referenced by name in relationships must be imported before release's
+from app.models.environment import EnvironmentModel  # pylint: disable=unused-import
+from app.models.role import RoleModel  # pylint: disable=unused-import
+from app.models.service import ServiceModel  # pylint: disable=unused-import
+from app.models.user import UserModel  # pylint: disable=unused-import
+from app.reports.delivery_metrics import rebuild_delivery_metrics
+
+
+def main():
+    """Rebuild the rollups and report how many were written."""
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    print(f"Rebuilt {rebuild_delivery_metrics(engine)} daily rollups.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import SessionLocal
 from app.models.user import UserModel
+from app.models.table_version import TableVersionModel # pylint: disable=unused-import
 from app.core.security import get_password_hash
 
 def reset_admin_password():
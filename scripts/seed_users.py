@@ -14,6 +14,7 @@ if PROJECT_ROOT not in sys.path:
 from app.core.database import SessionLocal
 from app.models.user import UserModel
 from app.models.role import RoleModel
+from app.models.table_version import TableVersionModel # pylint: disable=unused-import
 from app.core.security import get_password_hash
 
 def seed_users():
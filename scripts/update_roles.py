@@ -13,6 +13,7 @@ if PROJECT_ROOT not in sys.path:
 
 from app.core.database import SessionLocal
 from app.models.role import RoleModel
+from app.models.table_version import TableVersionModel # pylint: disable=unused-import
 
 def update_roles():
     """Update roles with defined permissions."""
@@ -49,10 +49,9 @@ else
 fi
 
 # Run migrations
-if [ -f "scripts/migrate_release_columns.py" ]; then
-    echo "Running migration scripts..."
-    ./venv/bin/python3 scripts/migrate_release_columns.py
-fi
+echo "Running migrations..."
+./venv/bin/python3 scripts/migrate.py || exit 1
+./venv/bin/python3 scripts/archive_deployment_history.py --partitions-only || exit 1
 
 # 4. Start Application Components
 echo -e "${BLUE}[4/5] Starting Application components...${NC}"
@@ -0,0 +1,100 @@
+"""
+Shared test fixtures.
+"""
+# pylint: disable=redefined-outer-name
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.database import Base, async_database_url, get_async_db
+from app.core.principal import principal_cache, token_versions
+from app.core.security import create_access_token
+from app.main import app
+from app.models.environment import EnvironmentModel  # pylint: disable=unused-import
+from app.models.release import ReleaseModel  # pylint: disable=unused-import
+from app.models.role import RoleModel
+from app.models.service import ServiceModel  # pylint: disable=unused-import
+from app.models.user import UserModel
+
+
+@pytest.fixture()
+def database_url(tmp_path):
+    """SQLite database file shared by the sync and async engines."""
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture()
+def engine(database_url):
+    """Sync SQLite engine with the full schema, used to arrange test data."""
+    test_engine = create_engine(database_url)
+    Base.metadata.create_all(bind=test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture()
+def async_engine(engine):
+    """
+    Async engine the API runs on, over the same database file.
+    Without pooling, no connection outlives the test client's event loop.
+    """
+    return create_async_engine(
+        async_database_url(engine.url.render_as_string()),
+        poolclass=NullPool,
+    )
+
+
+@pytest.fixture()
+def session_factory(engine):
+    """Session factory bound to the test engine."""
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+@pytest.fixture()
+def db(session_factory):
+    """Session for arranging test data."""
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def admin_user(db):
+    """Admin user persisted in the test database."""
+    role = RoleModel(name="admin", description="Administrator")
+    user = UserModel(
+        email="admin@example.com",
+        full_name="Admin User",
+        hashed_password="not-used",
+        is_active=True,
+        role=role,
+    )
+    db.add_all([role, user])
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture()
+def client(async_engine, admin_user):
+    """Test client using the test database and authenticated as the admin user."""
+    async_session_factory = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    async def override_get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    principal_cache.clear()
+    token_versions.clear()
+    token = create_access_token(subject=admin_user.email, role="admin")
+    with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
@@ -0,0 +1,174 @@
+"""
+Authentication and authorization tests.
+"""
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.permissions import PermissionRegistry, has_permissions
+from app.core.principal import token_versions
+from app.core.security import create_access_token, get_password_hash, password_hasher
+from app.models.role import RoleModel
+from app.models.user import UserModel
+
+
+def _queries(engine, client, method, url, **kwargs):
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = client.request(method, url, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return resp, statements
+
+
+def test_principal_is_cached_between_requests(client, async_engine):
+    """Only the first request resolves the principal from the database."""
+    resp, first = _queries(async_engine.sync_engine, client, "GET", "/api/v1/environment/")
+    assert resp.status_code == 200
+    resp, second = _queries(async_engine.sync_engine, client, "GET", "/api/v1/environment/")
+    assert resp.status_code == 200
+    assert len(second) == len(first) - 1
+    assert not any("FROM users" in stmt for stmt in second)
+
+
+def test_user_changes_invalidate_cache(client, db):
+    """Deactivating a user takes effect on their next request."""
+    role = RoleModel(name="viewer", permissions="read:services")
+    user = UserModel(email="viewer@example.com", hashed_password="x", role=role)
+    db.add_all([role, user])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=user.email)}"}
+
+    assert client.get("/api/v1/service/", headers=headers).status_code == 200
+    assert client.get("/api/v1/releases/", headers=headers).status_code == 403
+
+    resp = client.patch(f"/api/v1/users/{user.id}", json={"is_active": False})
+    assert resp.status_code == 200
+    assert client.get("/api/v1/service/", headers=headers).status_code == 401
+
+
+def test_role_permission_update_recompiles(client, db):
+    """Changing a role's permissions through update_role applies to existing tokens."""
+    role = RoleModel(name="viewer", permissions="read:services")
+    user = UserModel(email="viewer@example.com", hashed_password="x", role=role)
+    db.add_all([role, user])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=user.email)}"}
+    assert client.get("/api/v1/releases/", headers=headers).status_code == 403
+
+    resp = client.patch(
+        f"/api/v1/roles/{role.id}",
+        json={"permissions": "read:services, read:releases"},
+    )
+    assert resp.status_code == 200
+    # Principals are re-read, so the same token gets the new permissions
+    assert client.get("/api/v1/releases/", headers=headers).status_code == 200
+
+
+def test_permission_registry_masks():
+    """Compiled masks check several permissions at once; admin holds everything."""
+    registry = PermissionRegistry()
+    granted = registry.compile_role(None, "viewer", "read:a,read:b")
+    assert has_permissions(granted, registry.mask(["read:a", "read:b"]))
+    assert not has_permissions(granted, registry.mask(["read:a", "write:a"]))
+    assert has_permissions(registry.compile_role(None, "admin", None), registry.mask(["x", "y"]))
+
+
+def test_stateless_mode_authorizes_from_claims(client, db, async_engine, monkeypatch):
+    """Stateless tokens need no principal queries and are revoked by a token version bump."""
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    role = RoleModel(name="viewer", permissions="read:services")
+    user = UserModel(
+        email="viewer@example.com",
+        hashed_password=get_password_hash("secret"),
+        role=role,
+    )
+    db.add_all([role, user])
+    db.commit()
+
+    resp = client.post(
+        "/api/v1/auth/login",
+        data={"username": "viewer@example.com", "password": "secret"},
+    )
+    assert resp.status_code == 200
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    # Only the first request reads the token version, never the role
+    resp, statements = _queries(
+        async_engine.sync_engine, client, "GET", "/api/v1/service/", headers=headers
+    )
+    assert resp.status_code == 200
+    assert not any("FROM roles" in stmt or "JOIN roles" in stmt for stmt in statements)
+    resp, statements = _queries(
+        async_engine.sync_engine, client, "GET", "/api/v1/service/", headers=headers
+    )
+    assert resp.status_code == 200
+    assert not any("FROM users" in stmt for stmt in statements)
+    assert client.get("/api/v1/releases/", headers=headers).status_code == 403
+
+    # Tokens embedding the old permissions are revoked
+    resp = client.patch(f"/api/v1/roles/{role.id}", json={"permissions": "read:releases"})
+    assert resp.status_code == 200
+    assert client.get("/api/v1/service/", headers=headers).status_code == 401
+
+
+def test_stateless_revocation_reaches_other_workers(client, db, monkeypatch):
+    """A token version bumped elsewhere is rejected once the cached version expires."""
+    monkeypatch.setattr(settings, "AUTH_STATELESS", True)
+    role = RoleModel(name="viewer", permissions="read:services")
+    user = UserModel(
+        email="viewer@example.com",
+        hashed_password=get_password_hash("secret"),
+        role=role,
+    )
+    db.add_all([role, user])
+    db.commit()
+    resp = client.post(
+        "/api/v1/auth/login",
+        data={"username": "viewer@example.com", "password": "secret"},
+    )
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    assert client.get("/api/v1/service/", headers=headers).status_code == 200
+
+    # As if another worker revoked the token: only the database knows
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    assert client.get("/api/v1/service/", headers=headers).status_code == 200
+    token_versions.clear()
+    assert client.get("/api/v1/service/", headers=headers).status_code == 401
+
+    # Deactivated users are rejected whatever their token version
+    user.token_version -= 1
+    user.is_active = False
+    db.commit()
+    token_versions.clear()
+    assert client.get("/api/v1/service/", headers=headers).status_code == 401
+
+
+def test_login_rejects_when_hash_queue_is_full(client, db, monkeypatch):
+    """A saturated hashing pool returns 503 instead of queueing more logins."""
+    user = UserModel(email="viewer@example.com", hashed_password=get_password_hash("secret"))
+    db.add(user)
+    db.commit()
+    form = {"username": "viewer@example.com", "password": "secret"}
+
+    assert client.post("/api/v1/auth/login", data=form).status_code == 200
+    assert client.post(
+        "/api/v1/auth/login", data=dict(form, password="wrong")
+    ).status_code == 401
+
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    resp = client.post("/api/v1/auth/login", data=form)
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+    # Creating users and changing passwords hash on the same pool
+    resp = client.post(
+        "/api/v1/users/", json={"email": "new@example.com", "password": "secret123"}
+    )
+    assert resp.status_code == 503
+    resp = client.patch(f"/api/v1/users/{user.id}", json={"password": "changed123"})
+    assert resp.status_code == 503
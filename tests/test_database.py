@@ -0,0 +1,89 @@
+"""
+Database engine and pool metrics tests.
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.core import database
+from app.core.database import Base, async_database_url
+from app.core.db_metrics import PoolMetrics
+from app.core.read_routing import reads_pinned_to_primary
+from app.models.service import ServiceModel
+
+
+def test_async_database_url():
+    """Sync URLs map to the matching async driver."""
+    assert async_database_url("postgresql+psycopg2://u:p@db:5432/app") == (
+        "postgresql+asyncpg://u:p@db:5432/app"
+    )
+    assert async_database_url("sqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+
+
+def test_pool_metrics_record_saturation_and_timeouts(tmp_path):
+    """An exhausted pool reports full saturation and counts the timed-out checkout."""
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=metrics.pool_class(QueuePool),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics.bind(engine)
+
+    with engine.connect():
+        stats = metrics.snapshot()
+        assert stats["checked_out"] == 1
+        assert stats["saturation"] == 1.0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = metrics.snapshot()
+    assert stats["checked_out"] == 0
+    assert stats["peak_checked_out"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait_max_ms"] >= 50
+    assert sum(bucket["count"] for bucket in stats["wait_histogram"]) == 2
+    engine.dispose()
+
+
+def test_metrics_endpoint_lists_pools(client):
+    """The internal metrics endpoint reports the API's pools."""
+    resp = client.get("/api/v1/internal/metrics/db")
+    assert resp.status_code == 200
+    assert "primary" in [pool["name"] for pool in resp.json()["pools"]]
+
+
+def test_reads_use_replica_until_the_user_writes(client, tmp_path, monkeypatch):
+    """GETs are served by the replica, except right after the same user wrote."""
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_sync = create_engine(replica_url)
+    Base.metadata.create_all(bind=replica_sync)
+    with Session(replica_sync) as session:
+        session.add(ServiceModel(name="replica-only"))
+        session.commit()
+    replica_sync.dispose()
+    replica = create_async_engine(async_database_url(replica_url), poolclass=NullPool)
+    monkeypatch.setattr(
+        database, "ReplicaSessionLocal", async_sessionmaker(bind=replica, expire_on_commit=False)
+    )
+
+    def service_names():
+        return [row["name"] for row in client.get("/api/v1/service/").json()["items"]]
+
+    assert service_names() == ["replica-only"]
+    assert client.post("/api/v1/service/", json={"name": "fresh"}).status_code == 201
+    assert service_names() == ["fresh"]
+
+
+def test_read_primary_cookie_pins_reads():
+    """A read-your-writes cookie from another worker pins reads until it expires."""
+    assert reads_pinned_to_primary("someone", str(int(time.time()) + 5))
+    assert not reads_pinned_to_primary("someone", str(int(time.time()) - 1))
+    assert not reads_pinned_to_primary("someone", "garbage")
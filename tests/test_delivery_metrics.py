@@ -0,0 +1,72 @@
+"""
+Delivery metrics rollup tests.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.delivery_metrics import DeliveryMetricsDailyModel
+from app.models.environment import EnvironmentModel
+from app.models.release import ReleaseModel, ReleaseServiceLinkModel
+from app.models.service import ServiceModel
+from app.reports.delivery_metrics import rebuild_delivery_metrics
+
+
+def _rollups(engine):
+    with engine.connect() as conn:
+        return sorted(tuple(row) for row in conn.execute(
+            select(DeliveryMetricsDailyModel.__table__)
+        ))
+
+
+def test_rollups_track_deployments_and_match_a_rebuild(client, db, engine):
+    """Each deployment write updates the rollups exactly as a full rebuild would."""
+    env = EnvironmentModel(name="prod")
+    services = [ServiceModel(name=f"svc-{i}") for i in range(2)]
+    release = ReleaseModel(
+        name="Release-1", version="v1.0.0", created_at=datetime.utcnow() - timedelta(days=2)
+    )
+    db.add_all([env, release, *services])
+    db.flush()
+    db.add_all(
+        ReleaseServiceLinkModel(release_id=release.id, service_id=s.id) for s in services
+    )
+    db.commit()
+    url = f"/api/v1/releases/{release.id}/deploy"
+
+    def deploy(service, deployment_status="success"):
+        resp = client.post(url, json={
+            "environment_id": str(env.id), "service_id": str(service.id),
+            "status": deployment_status,
+        })
+        assert resp.status_code == 200
+
+    deploy(services[0])
+    deploy(services[0])  # a redeploy is not a first deployment
+    resp = client.post(f"{url}/bulk", json={"environment_id": str(env.id), "status": "failed"})
+    assert resp.status_code == 200
+    deploy(services[1])
+
+    resp = client.get("/api/v1/metrics/delivery/", params={"group_by": ["service"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    totals = body["totals"]
+    assert (totals["deployments"], totals["successful_deployments"]) == (5, 3)
+    assert totals["failed_deployments"] == 2
+    assert totals["change_failure_rate"] == 0.4
+    assert totals["lead_time_samples"] == 2
+    assert 2 * 86400 <= totals["lead_time_seconds_avg"] < 2 * 86400 + 60
+    assert body["deployment_frequency"] == 3 / 30
+    assert {row["service_id"]: row["deployments"] for row in body["series"]} == {
+        str(services[0].id): 3, str(services[1].id): 2,
+    }
+
+    incremental = _rollups(engine)
+    assert rebuild_delivery_metrics(engine) == 2
+    assert _rollups(engine) == incremental
+
+    today = datetime.utcnow().date()
+    resp = client.get("/api/v1/metrics/delivery/", params={
+        "start": str(today + timedelta(days=1)), "end": str(today),
+    })
+    assert resp.status_code == 400
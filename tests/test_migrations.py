@@ -0,0 +1,134 @@
+"""
+Schema migration runner tests.
+"""
+import gzip
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+
+from app.core.migrations import CreateIndex, Migration, MigrationRunner, Sql, schema_migrations
+from app.core.retention import DeploymentHistoryRetention, month_start
+from app.migrations import MIGRATIONS
+from app.models.release import DeploymentHistoryArchiveModel, DeploymentHistoryModel
+
+
+def test_migrations_are_noops_on_a_fresh_schema(engine):
+    """Every migration applies cleanly over create_all and leaves the hot-path indexes."""
+    # As in databases created before the release keyset indexes were declared
+    with engine.begin() as conn:
+        for name in (
+            "ix_releases_created_at_id",
+            "ix_releases_planned_release_date_id",
+            "ix_releases_name_id",
+        ):
+            conn.execute(text(f"DROP INDEX {name}"))
+    runner = MigrationRunner(engine, MIGRATIONS, report=None)
+    results = runner.run()
+
+    assert runner.applied_versions() == {m.version for m in MIGRATIONS}
+    assert all(r.skipped or r.duration_ms is not None for r in results)
+    assert not runner.run()
+
+    indexes = {
+        table: {index["name"] for index in inspect(engine).get_indexes(table)}
+        for table in ("deployments", "release_services_link", "releases", "services")
+    }
+    assert "ix_deployments_release_env_service" in indexes["deployments"]
+    assert "ix_release_services_link_service_id" in indexes["release_services_link"]
+    assert {
+        "ix_releases_owner_id",
+        "ix_releases_product_owner_id",
+        "ix_releases_qa_id",
+        "ix_releases_security_analyst_id",
+        "ix_releases_created_at_id",
+        "ix_releases_planned_release_date_id",
+        "ix_releases_name_id",
+    } <= indexes["releases"]
+    assert {"ix_services_name_id", "ix_services_environment_id_name_id"} <= indexes["services"]
+
+
+def test_dry_run_and_target(engine):
+    """A dry run reports SQL without applying it; a target stops at that version."""
+    migrations = [
+        Migration(1, "widgets", (Sql("create widgets", "CREATE TABLE widgets (id INTEGER)"),)),
+        Migration(2, "widgets_id", (CreateIndex("ix_widgets_id", "widgets", ("id",)),)),
+        Migration(3, "pg_only", (Sql("noop", "SELECT pg_sleep(0)", dialects=("postgresql",)),)),
+    ]
+    messages = []
+    runner = MigrationRunner(engine, migrations, report=messages.append)
+
+    planned = runner.run(dry_run=True)
+    assert [r.statements for r in planned] == [
+        ["CREATE TABLE widgets (id INTEGER)"],
+        ["CREATE INDEX IF NOT EXISTS ix_widgets_id ON widgets (id)"],
+        [],
+    ]
+    assert planned[2].skipped
+    assert "widgets" not in inspect(engine).get_table_names()
+
+    runner.run(target=1)
+    assert runner.applied_versions() == {1}
+    runner.run()
+    with engine.connect() as conn:
+        rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.name)).all()
+    assert rows == [(1, "widgets"), (2, "widgets_id"), (3, "pg_only")]
+    assert any(message.startswith("    create widgets:") for message in messages)
+
+
+def test_failed_migration_is_not_recorded(engine):
+    """A failing transactional migration rolls back its steps and stays pending."""
+    migrations = [Migration(1, "broken", (
+        Sql("create gadgets", "CREATE TABLE gadgets (id INTEGER)", "NOT VALID SQL"),
+    ))]
+    runner = MigrationRunner(engine, migrations, report=None)
+    with pytest.raises(Exception):
+        runner.run()
+
+    assert runner.applied_versions() == set()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM schema_migrations")).scalar() == 0
+    assert [m.version for m in runner.pending()] == [1]
+
+
+def test_versions_must_ascend(engine):
+    """Out-of-order or duplicate versions are rejected up front."""
+    with pytest.raises(ValueError):
+        MigrationRunner(engine, [Migration(2, "b", ()), Migration(1, "a", ())])
+
+
+def test_history_retention_moves_expired_rows(engine, tmp_path):
+    """Rows before the retention cutoff move to the archive table or a gzip export."""
+    now = datetime(2026, 10, 16)
+    assert month_start(now, -12) == datetime(2025, 10, 1)
+    history = DeploymentHistoryModel.__table__
+    ids = [uuid.uuid4() for _ in range(3)]
+    with engine.begin() as conn:
+        conn.execute(history.insert(), [
+            {
+                "id": uuid.uuid4(), "recorded_at": recorded_at, "deployment_id": ids[0],
+                "release_id": ids[1], "environment_id": ids[2], "status": "success",
+                "action": "deployed",
+            }
+            for recorded_at in (datetime(2025, 3, 1), datetime(2025, 9, 30), datetime(2026, 1, 1))
+        ])
+
+    retention = DeploymentHistoryRetention(engine, report=None)
+    assert not retention.ensure_partitions(now=now)  # partitions are Postgres only
+    assert retention.archive(12, dry_run=True, now=now)[0].rows == 2
+    assert [r.rows for r in retention.archive(12, now=now)] == [2]
+    assert not retention.archive(12, now=now)
+
+    export_dir = tmp_path / "history"
+    results = retention.archive(6, export_dir=str(export_dir), now=now)
+    assert len(results) == 1
+    with gzip.open(results[0].destination, "rt") as export:
+        assert [json.loads(line)["recorded_at"] for line in export] == ["2026-01-01 00:00:00"]
+
+    with engine.connect() as conn:
+        count = func.count()
+        assert conn.execute(select(count).select_from(history)).scalar() == 0
+        archived = select(count).select_from(DeploymentHistoryArchiveModel.__table__)
+        assert conn.execute(archived).scalar() == 2
@@ -0,0 +1,594 @@
+"""
+Release endpoint tests.
+"""
+# pylint: disable=redefined-outer-name
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, select, update
+
+from app.api.v1.endpoints import releases as releases_endpoints
+from app.core.config import settings
+from app.core.events import LocalBroker, encode_event, event_stream_response
+from app.models.environment import EnvironmentModel
+from app.models.release import (
+    DeploymentHistoryArchiveModel,
+    DeploymentHistoryModel,
+    DeploymentModel,
+    ReleaseModel,
+    ReleaseServiceLinkModel,
+)
+from app.models.service import ServiceModel
+from app.models.user import UserModel
+from app.reports.jobs import report_jobs
+
+
+@pytest.fixture()
+def releases(db):
+    """Seven releases with distinct creation times and a few shared names."""
+    base = datetime(2024, 1, 1)
+    rows = [
+        ReleaseModel(
+            name=f"Release-{i % 3}",
+            version=f"v1.{i}.0",
+            created_at=base + timedelta(days=i),
+            planned_release_date=base + timedelta(days=30 + i) if i % 2 else None,
+        )
+        for i in range(7)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def _walk(client, **params):
+    """Follow next_cursor until the last page; return all ids in order."""
+    ids, cursor = [], None
+    while True:
+        query = dict(params, limit=3)
+        if cursor:
+            query["cursor"] = cursor
+        resp = client.get("/api/v1/releases/", params=query)
+        assert resp.status_code == 200
+        body = resp.json()
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        assert body["has_more"] == (cursor is not None)
+        if not cursor:
+            return ids
+
+
+@pytest.mark.parametrize("sort", ["created_at", "planned_release_date", "name"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pagination_visits_every_release_once(client, releases, sort, order):
+    """Walking the cursor yields each release exactly once, in sort order."""
+    ids = _walk(client, sort=sort, order=order)
+    assert sorted(ids) == sorted(str(r.id) for r in releases)
+
+    if sort == "created_at":
+        expected = sorted(releases, key=lambda r: r.created_at, reverse=order == "desc")
+        assert ids == [str(r.id) for r in expected]
+
+
+def test_cursor_rejects_mismatched_sort(client, releases):
+    """A cursor issued for one sort order cannot be replayed against another."""
+    resp = client.get("/api/v1/releases/", params={"limit": 2, "sort": "name"})
+    cursor = resp.json()["next_cursor"]
+    assert len(releases) > 2 and cursor
+
+    resp = client.get("/api/v1/releases/", params={"cursor": cursor, "sort": "created_at"})
+    assert resp.status_code == 400
+
+    resp = client.get("/api/v1/releases/", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+def test_summary_reports_rollout_counts(client, db):
+    """The summary view counts distinct linked services deployed per environment."""
+    env = EnvironmentModel(name="prod")
+    services = [ServiceModel(name=f"svc-{i}") for i in range(3)]
+    release = ReleaseModel(name="Release-X", version="v2.0.0")
+    db.add_all([env, release, *services])
+    db.flush()
+    db.add_all(
+        [ReleaseServiceLinkModel(release_id=release.id, service_id=s.id) for s in services]
+    )
+    db.add_all([
+        DeploymentModel(release_id=release.id, environment_id=env.id, service_id=services[0].id),
+        # failed rows must not inflate the count
+        DeploymentModel(
+            release_id=release.id,
+            environment_id=env.id,
+            service_id=services[1].id,
+            status="failed",
+        ),
+    ])
+    db.commit()
+
+    resp = client.get("/api/v1/releases/summary")
+    assert resp.status_code == 200
+    (item,) = resp.json()["items"]
+    assert item["service_count"] == 3
+    assert item["rollout"] == [{"environment_id": str(env.id), "deployed_count": 1}]
+    assert "service_links" not in item
+
+
+def _seed_release(db, env, index, service_count=3):
+    """Release with linked services, deployments and all four role assignments."""
+    users = [
+        UserModel(email=f"user{index}-{role}@example.com", hashed_password="x")
+        for role in ("owner", "po", "qa", "sec")
+    ]
+    services = [ServiceModel(name=f"svc-{index}-{i}") for i in range(service_count)]
+    release = ReleaseModel(name=f"Release-{index}", version="v1.0.0")
+    db.add_all([release, *users, *services])
+    db.flush()
+    release.owner_id, release.product_owner_id, release.qa_id, release.security_analyst_id = (
+        u.id for u in users
+    )
+    for service in services:
+        db.add(ReleaseServiceLinkModel(release_id=release.id, service_id=service.id))
+        db.add(DeploymentModel(release_id=release.id, environment_id=env.id, service_id=service.id))
+    db.commit()
+    return release
+
+
+def _statements(engine, client, method, url, **kwargs):
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        resp = client.request(method, url, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return resp, statements
+
+
+def _count_queries(engine, client, url):
+    resp, statements = _statements(engine, client, "GET", url)
+    assert resp.status_code == 200
+    return len(statements)
+
+
+def test_release_reads_issue_bounded_queries(client, db, async_engine):
+    """Query count per request does not grow with the number of rows serialized."""
+    engine = async_engine.sync_engine
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+
+    small = _seed_release(db, env, 0, service_count=1)
+    client.get("/api/v1/releases/")  # warm the principal cache
+    list_small = _count_queries(engine, client, "/api/v1/releases/")
+    detail_small = _count_queries(engine, client, f"/api/v1/releases/{small.id}")
+    report_small = _count_queries(engine, client, f"/api/v1/releases/{small.id}/report")
+
+    for index in range(1, 10):
+        _seed_release(db, env, index)
+    large = _seed_release(db, env, 10, service_count=12)
+    list_large = _count_queries(engine, client, "/api/v1/releases/")
+    detail_large = _count_queries(engine, client, f"/api/v1/releases/{large.id}")
+    report_large = _count_queries(engine, client, f"/api/v1/releases/{large.id}/report")
+
+    assert list_large == list_small
+    assert detail_large == detail_small
+    assert report_large == report_small
+
+
+def test_rollout_matrix(client, db):
+    """The rollout endpoint aggregates the latest successful deployment per cell."""
+    prod, dev = EnvironmentModel(name="prod"), EnvironmentModel(name="dev")
+    db.add_all([prod, dev])
+    db.commit()
+    release = _seed_release(db, prod, 0, service_count=2)
+    db.add(DeploymentModel(
+        release_id=release.id,
+        environment_id=dev.id,
+        service_id=release.service_links[0].service_id,
+        status="failed",
+    ))
+    db.commit()
+
+    resp = client.get(f"/api/v1/releases/{release.id}/rollout")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_services"] == 2
+    assert [(e["environment_name"], e["percent"]) for e in body["environments"]] == [
+        ("dev", 0),
+        ("prod", 100),
+    ]
+    assert all(list(row["deployments"]) == [str(prod.id)] for row in body["services"])
+
+    resp = client.get("/api/v1/releases/rollout", params={"release_id": [str(release.id)]})
+    assert resp.json() == [body]
+
+
+def test_report_is_cached_and_revalidated(client, db):
+    """Repeat downloads hit the cache or get a 304; deploying changes the ETag."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=2)
+    url = f"/api/v1/releases/{release.id}/report"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    etag = first.headers["etag"]
+
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url).content == first.content
+
+    resp = client.post(
+        f"/api/v1/releases/{release.id}/deploy",
+        json={"environment_id": str(env.id), "status": "failed"},
+    )
+    assert resp.status_code == 200
+
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    # Renaming an embedded service invalidates the report too
+    service_id = release.service_links[0].service_id
+    resp = client.patch(f"/api/v1/service/{service_id}", json={"name": "renamed"})
+    assert resp.status_code == 200
+    renamed = client.get(url, headers={"If-None-Match": changed.headers["etag"]})
+    assert renamed.status_code == 200
+
+
+def test_report_job_renders_in_background(client, db, tmp_path, monkeypatch):
+    """A queued report job finishes in the process pool and its PDF can be downloaded."""
+    monkeypatch.setattr(report_jobs, "directory", str(tmp_path))
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0)
+
+    resp = client.post(f"/api/v1/releases/{release.id}/report/jobs")
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+
+    deadline = time.monotonic() + 30
+    while True:
+        job = client.get(f"/api/v1/releases/report/jobs/{job_id}").json()
+        if job["status"] != "pending" or time.monotonic() > deadline:
+            break
+        time.sleep(0.05)
+    assert job["status"] == "done", job
+
+    resp = client.get(f"/api/v1/releases/report/jobs/{job_id}/download")
+    assert resp.status_code == 200
+    assert resp.content.startswith(b"%PDF")
+    report_jobs.shutdown()
+
+
+def test_bulk_deploy(client, db, async_engine):
+    """Bulk deploys validate links up front and insert every row in one statement."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=3)
+    other = ServiceModel(name="unlinked")
+    db.add(other)
+    db.commit()
+    url = f"/api/v1/releases/{release.id}/deploy/bulk"
+
+    resp = client.post(url, json={"deployments": [
+        {"service_id": str(other.id), "environment_id": str(env.id)},
+    ]})
+    assert resp.status_code == 400
+    assert str(other.id) in resp.json()["detail"]
+    assert client.post(url, json={}).status_code == 422
+
+    client.get("/api/v1/releases/")  # warm the principal cache
+    resp, statements = _statements(
+        async_engine.sync_engine, client, "POST", url,
+        json={"environment_id": str(env.id), "status": "failed"},
+    )
+    assert resp.status_code == 200
+    assert len(resp.json()) == 3
+    assert {row["status"] for row in resp.json()} == {"failed"}
+    assert sum(stmt.startswith("INSERT INTO deployments") for stmt in statements) == 1
+
+
+def test_deploy_is_idempotent(client, db, engine):
+    """Recording the same deployment again updates the existing row instead of adding one."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=2)
+    service_id = str(release.service_links[0].service_id)
+    url = f"/api/v1/releases/{release.id}/deploy"
+
+    first = client.post(url, json={"environment_id": str(env.id), "service_id": service_id})
+    again = client.post(
+        url, json={"environment_id": str(env.id), "service_id": service_id, "status": "failed"}
+    )
+    assert first.status_code == again.status_code == 200
+    assert again.json()["id"] == first.json()["id"]
+    assert again.json()["status"] == "failed"
+
+    for _ in range(2):
+        assert client.post(url, json={"environment_id": str(env.id)}).status_code == 200
+        assert client.post(
+            f"{url}/bulk", json={"environment_id": str(env.id)}
+        ).status_code == 200
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(DeploymentModel.service_id).where(DeploymentModel.release_id == release.id)
+        ).all()
+    # two linked services plus one release-level row
+    assert len(rows) == 3
+
+
+def test_create_release_in_one_transaction(client, db, async_engine):
+    """Creation validates services up front and does not grow with the service list."""
+    services = [ServiceModel(name=f"svc-{i}") for i in range(12)]
+    db.add_all(services)
+    db.commit()
+    payload = {"name": "Release-Y", "version": "v3.0.0"}
+
+    resp = client.post("/api/v1/releases/", json=dict(payload, services=[
+        {"service_id": str(services[0].id)},
+        {"service_id": "00000000-0000-0000-0000-000000000000"},
+    ]))
+    assert resp.status_code == 400
+    assert "00000000-0000-0000-0000-000000000000" in resp.json()["detail"]
+    assert db.scalar(select(func.count()).select_from(ReleaseModel)) == 0
+
+    client.get("/api/v1/releases/")  # warm the principal cache
+    counts = []
+    for size in (1, 12):
+        resp, statements = _statements(
+            async_engine.sync_engine, client, "POST", "/api/v1/releases/",
+            json=dict(payload, services=[
+                {"service_id": str(s.id), "version": f"1.{i}"}
+                for i, s in enumerate(services[:size])
+            ]),
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [link["service"]["name"] for link in body["service_links"]] == [
+            s.name for s in services[:size]
+        ]
+        assert body["owner"]["email"] == "admin@example.com"
+        assert sum(s.startswith("INSERT INTO release_services_link") for s in statements) == 1
+        counts.append(len(statements))
+    assert counts[0] == counts[1]
+
+
+def test_update_syncs_only_changed_links(client, db, async_engine):
+    """Editing one link touches one row; adds and removals are reported."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=5)
+    links = [
+        {"service_id": str(link.service_id), "pipeline_link": None, "version": None}
+        for link in release.service_links
+    ]
+    links[1]["pipeline_link"] = "https://ci.example.com/1"
+    url = f"/api/v1/releases/{release.id}"
+
+    client.get("/api/v1/releases/")  # warm the principal cache
+    resp, statements = _statements(
+        async_engine.sync_engine, client, "PATCH", url, json={"services": links}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["service_link_changes"] == {
+        "added": [], "updated": [links[1]["service_id"]], "removed": [],
+    }
+    assert not any(
+        s.startswith(("INSERT INTO release_services_link", "DELETE FROM release_services_link"))
+        for s in statements
+    )
+    assert sum(s.startswith("UPDATE release_services_link") for s in statements) == 1
+
+    extra = ServiceModel(name="svc-extra")
+    db.add(extra)
+    db.commit()
+    resp = client.patch(url, json={"services": links[1:] + [{"service_id": str(extra.id)}]})
+    assert resp.status_code == 200
+    assert resp.json()["service_link_changes"] == {
+        "added": [str(extra.id)], "updated": [], "removed": [links[0]["service_id"]],
+    }
+    assert {link["service_id"] for link in resp.json()["service_links"]} == {
+        link["service_id"] for link in links[1:]
+    } | {str(extra.id)}
+
+    duplicate = client.patch(url, json={"services": links[1:2] * 2})
+    assert duplicate.status_code == 400
+
+
+def test_reads_answer_if_none_match(client, db, async_engine):
+    """GET endpoints return 304 for a current ETag and a new ETag after a change."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=2)
+    urls = [
+        f"/api/v1/releases/{release.id}",
+        "/api/v1/releases/?limit=5",
+        "/api/v1/service/",
+        "/api/v1/environment/",
+        "/api/v1/users/",
+        "/api/v1/roles/",
+    ]
+    etags = {}
+    for url in urls:
+        first = client.get(url)
+        assert first.status_code == 200
+        etags[url] = first.headers["etag"]
+        again = client.get(url, headers={"If-None-Match": etags[url]})
+        assert again.status_code == 304, url
+        assert again.content == b""
+    assert client.get("/api/v1/releases/?limit=6").headers["etag"] != etags[urls[1]]
+
+    resp = client.post(
+        f"/api/v1/releases/{release.id}/deploy",
+        json={"environment_id": str(env.id), "status": "failed"},
+    )
+    assert resp.status_code == 200
+    for url in urls[:2]:
+        changed = client.get(url, headers={"If-None-Match": etags[url]})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etags[url]
+    assert client.get(urls[2], headers={"If-None-Match": etags[urls[2]]}).status_code == 304
+
+    resp = client.patch(
+        f"/api/v1/service/{release.service_links[0].service_id}", json={"owner": "team-b"}
+    )
+    assert resp.status_code == 200
+    for url in urls[:3]:
+        assert client.get(url, headers={"If-None-Match": etags[url]}).status_code == 200
+
+    # Writes change the version although max(updated_at) does not move, as
+    # when a worker flushed early or its clock lags
+    spare = ServiceModel(name="spare", updated_at=datetime(2000, 1, 1))
+    db.add(spare)
+    db.commit()
+    etag = client.get(urls[2]).headers["etag"]
+    spare.owner = "team-c"
+    spare.updated_at = datetime(2000, 1, 2)
+    db.commit()
+    assert client.get(urls[2], headers={"If-None-Match": etag}).status_code == 200
+    etag = client.get(urls[2]).headers["etag"]
+    db.execute(
+        update(ServiceModel)
+        .where(ServiceModel.id == spare.id)
+        .values(owner="team-d", updated_at=datetime(2000, 1, 3))
+    )
+    db.commit()
+    assert client.get(urls[2], headers={"If-None-Match": etag}).status_code == 200
+    etag = client.get(urls[2]).headers["etag"]
+    assert client.delete(f"/api/v1/service/{spare.id}").status_code == 204
+    resp, statements = _statements(
+        async_engine.sync_engine, client, "GET", urls[2], headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert not any("count(" in statement.lower() for statement in statements)
+
+
+def test_fast_json_matches_response_model(client, db, monkeypatch):
+    """The pre-serialized fast path returns the same JSON as FastAPI's response_model."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=2)
+    urls = ["/api/v1/releases/", f"/api/v1/releases/{release.id}", "/api/v1/releases/summary"]
+
+    fast = [client.get(url) for url in urls]
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+    slow = [client.get(url) for url in urls]
+    for fast_resp, slow_resp in zip(fast, slow):
+        assert fast_resp.headers["content-type"] == "application/json"
+        assert fast_resp.headers["etag"] == slow_resp.headers["etag"]
+        assert fast_resp.json() == slow_resp.json()
+
+
+class RecordingBroker(LocalBroker):
+    """Local broker that keeps every delivered event."""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def deliver(self, message):
+        self.events.append(json.loads(message))
+
+
+def test_release_events_are_published_on_commit(client, db, monkeypatch):
+    """Writes publish deltas once committed; rejected writes publish nothing."""
+    broker = RecordingBroker()
+    monkeypatch.setattr(releases_endpoints, "release_events", broker)
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=2)
+    service_id = str(release.service_links[0].service_id)
+    url = f"/api/v1/releases/{release.id}"
+
+    resp = client.post(
+        f"{url}/deploy", json={"environment_id": str(env.id), "service_id": service_id}
+    )
+    assert resp.status_code == 200
+    assert client.post(f"{url}/deploy/bulk", json={"deployments": [
+        {"service_id": str(env.id), "environment_id": str(env.id)},
+    ]}).status_code == 400
+    assert client.delete(f"{url}/deploy/{env.id}/{service_id}").status_code == 204
+    assert client.patch(url, json={"version": "v2.0.0"}).status_code == 200
+
+    assert [e["type"] for e in broker.events] == [
+        "deployment.created", "deployment.deleted", "release.updated",
+    ]
+    assert {e["release_id"] for e in broker.events} == {str(release.id)}
+    created, deleted, updated = (e["data"] for e in broker.events)
+    assert created["service_id"] == deleted["service_id"] == service_id
+    assert deleted["id"] == created["id"]
+    assert updated["fields"] == {"version": "v2.0.0"}
+
+
+def test_event_stream_relays_matching_events():
+    """The SSE stream filters by release and ends with a resync when it falls behind."""
+    class Connected:  # pylint: disable=too-few-public-methods
+        """Request stand-in that never disconnects."""
+
+        @staticmethod
+        async def is_disconnected():
+            """Always connected."""
+            return False
+
+    async def scenario():
+        broker = LocalBroker(queue_size=2)
+        body = event_stream_response(Connected(), broker, "r1").body_iterator
+        # anext() is not a builtin before Python 3.10
+        assert (await body.__anext__()).startswith("retry:")  # pylint: disable=unnecessary-dunder-call
+        for release_id in ("r2", "r1", "r1", "r1"):
+            broker.deliver(encode_event(
+                {"type": "deployment.created", "release_id": release_id, "data": {}}
+            ))
+        frames = [frame async for frame in body]
+        assert [frame.split("\n")[0] for frame in frames] == [
+            "event: deployment.created", "event: deployment.created", "event: resync",
+        ]
+        assert '"release_id":"r1"' in frames[0]
+
+    asyncio.run(scenario())
+
+
+def test_deployment_history_reads_the_hot_window(client, db):
+    """Deploys and undeploys are logged; old and archived history needs explicit asks."""
+    env = EnvironmentModel(name="prod")
+    db.add(env)
+    db.commit()
+    release = _seed_release(db, env, 0, service_count=1)
+    service_id = str(release.service_links[0].service_id)
+    url = f"/api/v1/releases/{release.id}"
+    client.post(f"{url}/deploy/bulk", json={"environment_id": str(env.id)})
+    client.delete(f"{url}/deploy/{env.id}/{service_id}")
+
+    old = datetime.utcnow() - timedelta(days=settings.DEPLOYMENT_HISTORY_HOT_DAYS + 30)
+    for model in (DeploymentHistoryModel, DeploymentHistoryArchiveModel):
+        db.add(model(
+            recorded_at=old, deployment_id=release.id, release_id=release.id,
+            environment_id=env.id, status="success", action="deployed",
+        ))
+    db.commit()
+
+    recent = client.get(f"{url}/deployments/history").json()
+    assert [entry["action"] for entry in recent] == ["undeployed", "deployed"]
+    assert {entry["service_id"] for entry in recent} == {service_id}
+    since = (old - timedelta(days=1)).isoformat()
+    assert len(client.get(f"{url}/deployments/history", params={"since": since}).json()) == 3
+    everything = client.get(
+        f"{url}/deployments/history", params={"since": since, "include_archived": True}
+    ).json()
+    assert len(everything) == 4
@@ -0,0 +1,48 @@
+"""
+Search endpoint tests.
+"""
+from app.api.v1.endpoints.search import prefix_tsquery
+from app.core.pagination import like_pattern
+from app.models.release import ReleaseModel
+from app.models.service import ServiceModel
+
+
+def test_search_ranks_and_pages_across_types(client, db):
+    """Releases and services come back in one ranked list, one page at a time."""
+    db.add_all([
+        ServiceModel(name="payments", owner="billing-team"),
+        ServiceModel(name="payments-gateway", description="Card processing"),
+        ServiceModel(name="ledger", owner="payments-platform"),
+        ServiceModel(name="search", description="100% uptime_required"),
+        ReleaseModel(name="Payments Q3", version="v2.0.0"),
+        ReleaseModel(name="Checkout", version="payments-1"),
+    ])
+    db.commit()
+
+    resp = client.get("/api/v1/search/", params={"q": "payments", "limit": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+    # Exact title match first, then one of the equally ranked prefix matches
+    assert [hit["title"] for hit in body["items"]][0] == "payments"
+    assert body["items"][1]["title"] in {"payments-gateway", "Payments Q3"}
+    titles = [hit["title"] for hit in body["items"]]
+    while body["next_cursor"]:
+        body = client.get("/api/v1/search/", params={
+            "q": "payments", "limit": 2, "cursor": body["next_cursor"],
+        }).json()
+        titles.extend(hit["title"] for hit in body["items"])
+    assert sorted(titles) == sorted(
+        ["payments", "payments-gateway", "ledger", "Payments Q3", "Checkout"]
+    )
+
+    resp = client.get("/api/v1/search/", params={"q": "payments", "type": "release"})
+    assert {hit["type"] for hit in resp.json()["items"]} == {"release"}
+    # LIKE wildcards in the query match literally
+    for term in ("0% up", "_"):
+        hits = client.get("/api/v1/search/", params={"q": term}).json()["items"]
+        assert [hit["title"] for hit in hits] == ["search"]
+    assert client.get("/api/v1/search/", params={"q": "x", "cursor": "bogus"}).status_code == 400
+
+    assert prefix_tsquery("Payments  gate") == "payments & gate:*"
+    assert prefix_tsquery("--") is None
+    assert like_pattern("50%_off") == "%50\\%\\_off%"
@@ -0,0 +1,45 @@
+"""
+Service catalog endpoint tests.
+"""
+from app.models.environment import EnvironmentModel
+from app.models.service import ServiceModel
+
+
+def test_list_services_filters_and_pages(client, db):
+    """Filters combine, names match by prefix, and pages follow the cursor in name order."""
+    prod, staging = EnvironmentModel(name="prod"), EnvironmentModel(name="staging")
+    db.add_all([prod, staging])
+    db.flush()
+    db.add_all([
+        ServiceModel(name="billing-api", owner="billing", status="active", environment_id=prod.id),
+        ServiceModel(name="Billing-worker", owner="billing", status="retired",
+                     environment_id=prod.id),
+        ServiceModel(name="billing_x", owner="billing", status="active",
+                     environment_id=staging.id),
+        ServiceModel(name="ledger", owner="finance", status="active", environment_id=prod.id),
+        ServiceModel(name="search", owner="platform", status="active"),
+    ])
+    db.commit()
+
+    def names(**params):
+        body = client.get("/api/v1/service/", params=params).json()
+        return [row["name"] for row in body["items"]]
+
+    assert names(name_prefix="billing") == ["Billing-worker", "billing-api", "billing_x"]
+    assert names(name_prefix="billing_") == ["billing_x"]  # wildcards match literally
+    assert names(environment_id=str(prod.id), status="active") == ["billing-api", "ledger"]
+    assert names(owner="billing", order="desc") == ["billing_x", "billing-api", "Billing-worker"]
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        body = client.get("/api/v1/service/", params=params).json()
+        assert "total" not in body and len(body["items"]) <= 2
+        seen.extend(row["name"] for row in body["items"])
+        if not body["has_more"]:
+            break
+        params["cursor"] = body["next_cursor"]
+    assert seen == ["Billing-worker", "billing-api", "billing_x", "ledger", "search"]
+
+    resp = client.get("/api/v1/service/", params={"cursor": "garbage"})
+    assert resp.status_code == 400
@@ -2,7 +2,8 @@
 
 import { useEffect, useState } from "react";
 import { authenticatedFetch } from "@/lib/api";
-import { getUserRole } from "@/lib/auth";
+import { getUserRole, hasPermission } from "@/lib/auth";
+import { DeliveryMetrics } from "@/types/metrics";
 
 type Summary = {
   total_users: number;
@@ -12,6 +13,7 @@ export default function DashboardPage() {
   const [summary, setSummary] = useState<Summary | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [role, setRole] = useState<string | null>(null);
+  const [delivery, setDelivery] = useState<DeliveryMetrics | null>(null);
 
   useEffect(() => {
     const userRole = getUserRole();
@@ -32,6 +34,16 @@ export default function DashboardPage() {
       }
     }
     load();
+
+    // Delivery metrics of the last 30 days, served from daily rollups
+    async function loadDelivery() {
+      if (!hasPermission("read:releases")) return;
+      const res = await authenticatedFetch("/api/v1/metrics/delivery/?group_by=day");
+      if (res.ok) {
+        setDelivery(await res.json());
+      }
+    }
+    loadDelivery();
   }, []);
 
   return (
@@ -51,6 +63,22 @@ export default function DashboardPage() {
             value={summary?.total_users ?? 0}
           />
         )}
+        {delivery && (
+          <>
+            <DashboardCard
+              label="Deployments / day (30d)"
+              value={delivery.deployment_frequency.toFixed(1)}
+            />
+            <DashboardCard
+              label="Change failure rate (30d)"
+              value={formatPercent(delivery.totals.change_failure_rate)}
+            />
+            <DashboardCard
+              label="Mean lead time (30d)"
+              value={formatDuration(delivery.totals.lead_time_seconds_avg)}
+            />
+          </>
+        )}
       </div>
 
       <div className="bg-white rounded-2xl shadow p-4">
@@ -64,7 +92,17 @@ export default function DashboardPage() {
   );
 }
 
-function DashboardCard({ label, value }: { label: string; value: number }) {
+function formatPercent(rate?: number) {
+  return rate == null ? "—" : `${Math.round(rate * 100)}%`;
+}
+
+function formatDuration(seconds?: number) {
+  if (seconds == null) return "—";
+  const hours = seconds / 3600;
+  return hours < 48 ? `${hours.toFixed(1)} h` : `${(hours / 24).toFixed(1)} d`;
+}
+
+function DashboardCard({ label, value }: { label: string; value: number | string }) {
   return (
     <div className="bg-white rounded-2xl shadow p-4">
       <p className="text-xs uppercase tracking-wide text-slate-500 mb-1">
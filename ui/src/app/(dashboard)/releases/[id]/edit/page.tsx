@@ -49,12 +49,19 @@ export default function EditReleasePage() {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                // Fetch available services
-                const servicesRes = await authenticatedFetch("/api/v1/service/");
-                if (servicesRes.ok) {
-                    const servicesData = await servicesRes.json();
-                    setServices(Array.isArray(servicesData) ? servicesData : []);
-                }
+                // Fetch available services, following the catalog's pages so every
+                // linked service stays listed
+                const allServices: Service[] = [];
+                let cursor: string | null = null;
+                do {
+                    const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+                    const servicesRes = await authenticatedFetch(`/api/v1/service/?limit=500${query}`);
+                    if (!servicesRes.ok) break;
+                    const page = await servicesRes.json();
+                    allServices.push(...(page.items ?? []));
+                    cursor = page.next_cursor ?? null;
+                } while (cursor);
+                setServices(allServices);
 
                 // Fetch users for role assignment
                 const usersRes = await authenticatedFetch("/api/v1/users/");
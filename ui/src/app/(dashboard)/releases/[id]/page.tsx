@@ -4,14 +4,43 @@ import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { authenticatedFetch } from "@/lib/api";
 import { API_BASE_URL } from "@/lib/config";
+import { subscribeToEvents } from "@/lib/events";
 import Link from "next/link";
-import { Release } from "@/types/release";
+import { Deployment, Release, ReleaseEvent, ReleaseRollout } from "@/types/release";
 
 import { Environment } from "@/types/release";
 
+// Apply a deployment delta to the rollout matrix and recount progress locally.
+// Returns null when the delta cannot be applied and the rollout must be reloaded.
+function applyDeploymentEvent(rollout: ReleaseRollout, event: ReleaseEvent<Deployment>): ReleaseRollout | null {
+    const deployment = event.data;
+    if (!deployment) return null;
+    // Release-level deployments are not part of the service matrix
+    if (!deployment.service_id) return rollout;
+    const row = rollout.services.find(s => s.service_id === deployment.service_id);
+    if (!row || !rollout.environments.some(e => e.environment_id === deployment.environment_id)) {
+        return null;
+    }
+
+    const deployments = { ...row.deployments };
+    if (event.type === "deployment.created" && deployment.status === "success") {
+        deployments[deployment.environment_id] = deployment.deployed_at;
+    } else {
+        delete deployments[deployment.environment_id];
+    }
+    const services = rollout.services.map(s => (s === row ? { ...row, deployments } : s));
+    const total = rollout.total_services;
+    const environments = rollout.environments.map(env => {
+        const deployed = services.filter(s => env.environment_id in s.deployments).length;
+        return { ...env, deployed_count: deployed, percent: total ? Math.round(deployed * 100 / total) : 0 };
+    });
+    return { ...rollout, services, environments };
+}
+
 export default function ReleaseDetailsPage({ params }: { params: { id: string } }) {
     const router = useRouter();
     const [release, setRelease] = useState<Release | null>(null);
+    const [rollout, setRollout] = useState<ReleaseRollout | null>(null);
     const [environments, setEnvironments] = useState<Environment[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
@@ -28,6 +57,7 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
                 }
                 const data = await res.json();
                 setRelease(data);
+                await fetchRollout();
 
                 // Fetch environments
                 const envRes = await authenticatedFetch("/api/v1/environment/");
@@ -44,35 +74,70 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
         }
 
         fetchData();
-    }, [params.id, router, deploying]); // Add deploying to refetch after deployment
+    }, [params.id, router]);
+
+    // Rollout matrix and per-environment progress are aggregated server-side
+    const fetchRollout = async () => {
+        const res = await authenticatedFetch(`/api/v1/releases/${params.id}/rollout`);
+        if (res.ok) {
+            setRollout(await res.json());
+        }
+    };
+
+    const fetchRelease = async () => {
+        const res = await authenticatedFetch(`/api/v1/releases/${params.id}`);
+        if (res.ok) {
+            setRelease(await res.json());
+        }
+    };
+
+    // Live updates: deployment deltas from anyone (including this page's own
+    // actions) are applied in place instead of refetching after each action
+    useEffect(() => {
+        const controller = new AbortController();
+        subscribeToEvents(`/api/v1/releases/${params.id}/events`, ({ type, data }) => {
+            const event = data as ReleaseEvent | null;
+            if (type === "deployment.created" || type === "deployment.deleted") {
+                if (event?.truncated) {
+                    fetchRollout();
+                    return;
+                }
+                setRollout(current => {
+                    if (!current) return current;
+                    const next = applyDeploymentEvent(current, event as ReleaseEvent<Deployment>);
+                    // Updaters may run during render, so reload outside of it
+                    if (!next) setTimeout(fetchRollout);
+                    return next ?? current;
+                });
+            } else if (type === "release.updated") {
+                fetchRelease();
+                fetchRollout();
+            } else if (type === "release.deleted") {
+                router.push("/releases");
+            } else if (type === "reconnect" || type === "resync") {
+                // Events may have been missed while disconnected
+                fetchRelease();
+                fetchRollout();
+            }
+        }, controller.signal);
+        return () => controller.abort();
+    }, [params.id]);
 
     // Helper: Get deployment progress stats
     const getDeploymentProgress = (envId: string) => {
-        if (!release || release.service_links.length === 0) return { deployed: 0, total: 0, percent: 0 };
-
-        const total = release.service_links.length;
-        // Count unique services deployed successfully to this env
-        const deployedServices = new Set(
-            release.deployments
-                .filter(d => d.environment_id === envId && d.status === "success" && d.service_id)
-                .map(d => d.service_id)
-        );
-
-        const deployed = deployedServices.size;
+        const total = rollout?.total_services ?? 0;
+        const env = rollout?.environments.find(e => e.environment_id === envId);
         return {
-            deployed,
+            deployed: env?.deployed_count ?? 0,
             total,
-            percent: Math.round((deployed / total) * 100)
+            percent: env?.percent ?? 0
         };
     };
 
-    // Helper: Check specific service status
+    // Helper: Latest successful deployment time of a service in an environment
     const getServiceStatus = (envId: string, serviceId: string) => {
-        if (!release) return null;
-        const deployment = release.deployments
-            .filter(d => d.environment_id === envId && d.service_id === serviceId && d.status === "success")
-            .sort((a, b) => new Date(b.deployed_at).getTime() - new Date(a.deployed_at).getTime())[0];
-        return deployment;
+        const row = rollout?.services.find(s => s.service_id === serviceId);
+        return row?.deployments[envId];
     };
 
     const handleDeploy = async (envId: string, serviceId: string) => {
@@ -88,12 +153,24 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
                     status: "success" // Simulating success
                 })
             });
-            // Result will be reflected by useEffect refetch because we depend on deploying
-            // Wait a bit to ensure backend update and re-fetch
-            const res = await authenticatedFetch(`/api/v1/releases/${params.id}`);
-            if (res.ok) {
-                const data = await res.json();
-                setRelease(data);
+        } catch (e: any) {
+            alert("Deployment failed: " + e.message);
+        } finally {
+            setDeploying(false);
+        }
+    };
+
+    const handleDeployAll = async (envId: string) => {
+        if (!release) return;
+        setDeploying(true);
+        try {
+            const res = await authenticatedFetch(`/api/v1/releases/${release.id}/deploy/bulk`, {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ environment_id: envId, status: "success" })
+            });
+            if (!res.ok) {
+                throw new Error(`Failed to deploy release: ${res.status}`);
             }
         } catch (e: any) {
             alert("Deployment failed: " + e.message);
@@ -117,13 +194,6 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
                 console.error("Undeploy failed:", res.status, errorText);
                 throw new Error(`Failed to undeploy service: ${res.status}`);
             }
-
-            // Refresh release data
-            const refreshRes = await authenticatedFetch(`/api/v1/releases/${params.id}`);
-            if (refreshRes.ok) {
-                const data = await refreshRes.json();
-                setRelease(data);
-            }
         } catch (e: any) {
             console.error("Undeploy error:", e);
             alert("Undeploy failed: " + e.message);
@@ -234,6 +304,15 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
                                     >
                                         <div className="flex justify-between items-center mb-3">
                                             <div className="font-semibold text-slate-900">{env.name}</div>
+                                            {total > 0 && deployed < total && (
+                                                <button
+                                                    onClick={() => handleDeployAll(env.id)}
+                                                    disabled={deploying}
+                                                    className="text-xs font-medium text-blue-600 hover:text-blue-800 disabled:opacity-50"
+                                                >
+                                                    Deploy all
+                                                </button>
+                                            )}
                                         </div>
 
                                         <div className="space-y-2">
@@ -335,7 +414,7 @@ export default function ReleaseDetailsPage({ params }: { params: { id: string }
                                                                 </button>
                                                             </div>
                                                             <span className="text-[10px] text-slate-400">
-                                                                {new Date(status.deployed_at).toLocaleDateString()}
+                                                                {new Date(status).toLocaleDateString()}
                                                             </span>
                                                         </div>
                                                     ) : (
@@ -6,6 +6,9 @@ import Link from "next/link";
 import { authenticatedFetch } from "@/lib/api";
 import { Service } from "@/types/service";
 
+// Services per picker page
+const SERVICE_PAGE_SIZE = 50;
+
 // Local interface for selected service with link
 interface SelectedService {
     id: string;
@@ -33,18 +36,60 @@ export default function NewReleasePage() {
 
     // Data
     const [services, setServices] = useState<Service[]>([]);
+    const [serviceQuery, setServiceQuery] = useState("");
+    const [servicesCursor, setServicesCursor] = useState<string | null>(null);
+    const [loadingServices, setLoadingServices] = useState(true);
     const [users, setUsers] = useState<any[]>([]);
 
+    // One page of the catalog, filtered by name prefix on the server
+    const fetchServices = async (query: string, cursor: string | null) => {
+        const params = new URLSearchParams({ limit: String(SERVICE_PAGE_SIZE) });
+        if (query.trim()) params.set("name_prefix", query.trim());
+        if (cursor) params.set("cursor", cursor);
+        const res = await authenticatedFetch(`/api/v1/service/?${params}`);
+        if (!res.ok) throw new Error("Failed to load services");
+        return res.json();
+    };
+
+    useEffect(() => {
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            setLoadingServices(true);
+            try {
+                const page = await fetchServices(serviceQuery, null);
+                if (cancelled) return;
+                setServices(page.items ?? []);
+                setServicesCursor(page.next_cursor ?? null);
+            } catch (err: any) {
+                if (!cancelled) setError(err.message);
+            } finally {
+                if (!cancelled) setLoadingServices(false);
+            }
+        }, serviceQuery ? 250 : 0);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [serviceQuery]);
+
+    const loadMoreServices = async () => {
+        if (!servicesCursor) return;
+        setLoadingServices(true);
+        try {
+            const page = await fetchServices(serviceQuery, servicesCursor);
+            setServices(prev => [...prev, ...page.items]);
+            setServicesCursor(page.next_cursor ?? null);
+        } catch (err: any) {
+            setError(err.message);
+        } finally {
+            setLoadingServices(false);
+        }
+    };
+
     useEffect(() => {
         async function fetchData() {
             setLoading(true);
             try {
-                // Fetch Services
-                const servicesRes = await authenticatedFetch("/api/v1/service/");
-                if (!servicesRes.ok) throw new Error("Failed to load services");
-                const servicesData = await servicesRes.json();
-                setServices(Array.isArray(servicesData) ? servicesData : []);
-
                 // Fetch Users (for dropdowns)
                 try {
                     const usersRes = await authenticatedFetch("/api/v1/users/");
@@ -253,7 +298,14 @@ export default function NewReleasePage() {
                         <label className="block text-sm font-medium text-slate-700 mb-2">
                             Include Services
                         </label>
-                        {loading ? (
+                        <input
+                            type="search"
+                            value={serviceQuery}
+                            onChange={(e) => setServiceQuery(e.target.value)}
+                            placeholder="Filter services by name..."
+                            className="w-full mb-2 px-3 py-2 bg-white border border-slate-200 rounded-xl text-sm focus:outline-none focus:border-blue-500"
+                        />
+                        {loadingServices && services.length === 0 ? (
                             <p className="text-sm text-slate-500 animate-pulse">Loading services...</p>
                         ) : services.length === 0 ? (
                             <p className="text-sm text-slate-500">No services found.</p>
@@ -311,10 +363,23 @@ export default function NewReleasePage() {
                                         </div>
                                     );
                                 })}
+                                {servicesCursor && (
+                                    <div className="flex justify-center py-2">
+                                        <button
+                                            type="button"
+                                            onClick={loadMoreServices}
+                                            disabled={loadingServices}
+                                            className="px-4 py-1.5 rounded-xl text-sm font-medium text-blue-600 hover:bg-blue-50 transition-colors disabled:opacity-50"
+                                        >
+                                            {loadingServices ? "Loading..." : "Load more"}
+                                        </button>
+                                    </div>
+                                )}
                             </div>
                         )}
                         <p className="text-xs text-slate-500 mt-2">
                             Select services and provide their pipeline links.
+                            {selectedServices.length > 0 && ` ${selectedServices.length} selected.`}
                         </p>
                     </div>
                 </div>
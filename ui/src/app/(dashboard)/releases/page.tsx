@@ -4,14 +4,16 @@ import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import Link from "next/link";
 import { authenticatedFetch } from "@/lib/api";
-import { Release, Environment } from "@/types/release";
+import { ReleaseSummary, Environment } from "@/types/release";
 import DeploymentTracker from "@/components/release/DeploymentTracker";
 import Modal from "@/components/Modal";
 import { hasPermission } from "@/lib/auth";
 
 export default function ReleasesPage() {
     const router = useRouter();
-    const [releases, setReleases] = useState<Release[]>([]);
+    const [releases, setReleases] = useState<ReleaseSummary[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [environments, setEnvironments] = useState<Environment[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
@@ -30,7 +32,7 @@ export default function ReleasesPage() {
         try {
             // Fetch releases, environments, and current user in parallel
             const [releasesRes, envsRes, userRes] = await Promise.all([
-                authenticatedFetch("/api/v1/releases/"),
+                authenticatedFetch("/api/v1/releases/summary"),
                 authenticatedFetch("/api/v1/environment/"),
                 authenticatedFetch("/api/v1/auth/me")
             ]);
@@ -46,7 +48,8 @@ export default function ReleasesPage() {
                 setIsAdmin(userData.role?.name === "admin");
             }
 
-            setReleases(Array.isArray(releasesData) ? releasesData : []);
+            setReleases(Array.isArray(releasesData.items) ? releasesData.items : []);
+            setNextCursor(releasesData.next_cursor ?? null);
             setEnvironments(Array.isArray(envsData) ? envsData : []);
         } catch (e: any) {
             setError(e.message);
@@ -59,6 +62,26 @@ export default function ReleasesPage() {
         fetchData();
     }, [router]);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+
+        setLoadingMore(true);
+        try {
+            const res = await authenticatedFetch(
+                `/api/v1/releases/summary?cursor=${encodeURIComponent(nextCursor)}`
+            );
+            if (!res.ok) throw new Error("Failed to load more releases");
+
+            const page = await res.json();
+            setReleases((prev) => [...prev, ...page.items]);
+            setNextCursor(page.next_cursor ?? null);
+        } catch (e: any) {
+            setError(e.message);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // Open Modal
     const promptDeleteRelease = (id: string) => {
         setDeleteModal({ isOpen: true, releaseId: id });
@@ -178,6 +201,17 @@ export default function ReleasesPage() {
                             </tbody>
                         </table>
                     </div>
+                    {nextCursor && (
+                        <div className="flex justify-center border-t border-slate-100 py-3">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="px-4 py-2 rounded-xl text-sm font-medium text-blue-600 hover:bg-blue-50 transition-colors disabled:opacity-50"
+                            >
+                                {loadingMore ? "Loading..." : "Load more"}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
@@ -11,6 +11,8 @@ import { hasPermission } from "@/lib/auth";
 export default function ServicesPage() {
     const router = useRouter();
     const [services, setServices] = useState<Service[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [loading, setLoading] = useState(true);
     const [canCreate, setCanCreate] = useState(false);
@@ -35,8 +37,9 @@ export default function ServicesPage() {
 
             if (!res.ok) throw new Error("Failed to load services");
 
-            const data = await res.json();
-            setServices(Array.isArray(data) ? data : []);
+            const page = await res.json();
+            setServices(page.items ?? []);
+            setNextCursor(page.next_cursor ?? null);
         } catch (e: any) {
             setError(e.message);
         } finally {
@@ -48,6 +51,26 @@ export default function ServicesPage() {
         loadServices();
     }, [router]);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+
+        setLoadingMore(true);
+        try {
+            const res = await authenticatedFetch(
+                `/api/v1/service/?cursor=${encodeURIComponent(nextCursor)}`
+            );
+            if (!res.ok) throw new Error("Failed to load more services");
+
+            const page = await res.json();
+            setServices((prev) => [...prev, ...page.items]);
+            setNextCursor(page.next_cursor ?? null);
+        } catch (e: any) {
+            setError(e.message);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const confirmDelete = async () => {
         if (!deleteModal.serviceId) return;
 
@@ -148,6 +171,17 @@ export default function ServicesPage() {
                             </tbody>
                         </table>
                     </div>
+                    {nextCursor && (
+                        <div className="flex justify-center border-t border-slate-100 py-3">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="px-4 py-2 rounded-xl text-sm font-medium text-blue-600 hover:bg-blue-50 transition-colors disabled:opacity-50"
+                            >
+                                {loadingMore ? "Loading..." : "Load more"}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
@@ -1,10 +1,10 @@
 "use client";
 
 import { Environment } from "@/types/environment";
-import { Release } from "@/types/release";
+import { ReleaseSummary } from "@/types/release";
 
 interface DeploymentTrackerProps {
-    release: Release;
+    release: ReleaseSummary;
     environments: Environment[];
 }
 
@@ -12,18 +12,14 @@ export default function DeploymentTracker({
     release,
     environments,
 }: DeploymentTrackerProps) {
-    const totalServices = release.service_links.length;
+    const totalServices = release.service_count;
 
     // Helper: Get deployment percentage for an environment
     const getEnvStatus = (envId: string) => {
         if (totalServices === 0) return { percent: 0, deployedCount: 0 };
 
-        const deployedServices = new Set(
-            release.deployments
-                .filter(d => d.environment_id === envId && d.status === "success" && d.service_id)
-                .map(d => d.service_id)
-        );
-        const deployedCount = deployedServices.size;
+        const deployedCount =
+            release.rollout.find(r => r.environment_id === envId)?.deployed_count ?? 0;
         return {
             percent: Math.round((deployedCount / totalServices) * 100),
             deployedCount
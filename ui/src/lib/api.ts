@@ -18,6 +18,8 @@ export async function authenticatedFetch(endpoint: string, options: RequestInit
     const response = await fetch(url, {
         ...options,
         headers,
+        // Sends the read-your-writes cookie so reads after a write skip the replica
+        credentials: "include",
     });
 
     if (response.status === 401) {
@@ -0,0 +1,70 @@
+import { API_BASE_URL } from "./config";
+
+export interface StreamEvent<T = any> {
+    type: string;
+    data: T;
+}
+
+// Server-Sent Events over fetch: EventSource cannot send the Authorization header.
+// Reconnects after the server's retry interval until the signal aborts; once a
+// reconnected stream is live, a "reconnect" event tells the caller to reload
+// whatever it may have missed.
+export async function subscribeToEvents(
+    endpoint: string,
+    onEvent: (event: StreamEvent) => void,
+    signal: AbortSignal,
+): Promise<void> {
+    let retryMs = 3000;
+    let reconnecting = false;
+
+    while (!signal.aborted) {
+        try {
+            const token = localStorage.getItem("access_token");
+            const response = await fetch(`${API_BASE_URL}${endpoint}`, {
+                headers: token ? { Authorization: `Bearer ${token}` } : {},
+                credentials: "include",
+                signal,
+            });
+            if (response.status === 401 || response.status === 403 || response.status === 404) {
+                return;
+            }
+            if (!response.ok || !response.body) {
+                throw new Error(`Event stream failed: ${response.status}`);
+            }
+
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = "";
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += value;
+                let boundary;
+                while ((boundary = buffer.indexOf("\n\n")) >= 0) {
+                    const frame = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    let type = "message";
+                    const data: string[] = [];
+                    for (const line of frame.split("\n")) {
+                        if (line.startsWith("event: ")) type = line.slice(7);
+                        else if (line.startsWith("data: ")) data.push(line.slice(6));
+                        else if (line.startsWith("retry: ")) retryMs = Number(line.slice(7)) || retryMs;
+                    }
+                    // The server sends retry first, once it is subscribed
+                    if (reconnecting && frame.startsWith("retry: ")) {
+                        reconnecting = false;
+                        onEvent({ type: "reconnect", data: null });
+                    }
+                    if (data.length) {
+                        onEvent({ type, data: JSON.parse(data.join("\n")) });
+                    }
+                }
+            }
+        } catch (e) {
+            if (signal.aborted) return;
+            console.error("Event stream error:", e);
+        }
+        // The stream ended (server restart, or a resync after falling behind)
+        reconnecting = true;
+        await new Promise(resolve => setTimeout(resolve, retryMs));
+    }
+}
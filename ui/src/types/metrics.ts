@@ -0,0 +1,20 @@
+export interface DeliveryMetricsBucket {
+    day?: string;
+    service_id?: string;
+    environment_id?: string;
+    deployments: number;
+    successful_deployments: number;
+    failed_deployments: number;
+    change_failure_rate?: number;
+    lead_time_samples: number;
+    lead_time_seconds_avg?: number;
+}
+
+export interface DeliveryMetrics {
+    start: string;
+    end: string;
+    group_by: string[];
+    deployment_frequency: number;
+    totals: DeliveryMetricsBucket;
+    series: DeliveryMetricsBucket[];
+}
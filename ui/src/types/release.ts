@@ -49,3 +49,48 @@ export interface Release {
     qa?: UserSummary;
     security_analyst?: UserSummary;
 }
+
+export interface EnvironmentRolloutCount {
+    environment_id: string;
+    deployed_count: number;
+}
+
+export interface ReleaseSummary {
+    id: string;
+    name: string;
+    version: string;
+    created_at: string;
+    planned_release_date?: string;
+    owner_id?: string;
+    service_count: number;
+    rollout: EnvironmentRolloutCount[];
+}
+
+export interface EnvironmentRollout {
+    environment_id: string;
+    environment_name: string;
+    deployed_count: number;
+    percent: number;
+}
+
+export interface ServiceRollout {
+    service_id: string;
+    service_name: string;
+    deployments: Record<string, string>;
+}
+
+export interface ReleaseRollout {
+    release_id: string;
+    total_services: number;
+    environments: EnvironmentRollout[];
+    services: ServiceRollout[];
+}
+
+// Payloads of /api/v1/releases/{id}/events
+export interface ReleaseEvent<T = any> {
+    type: "deployment.created" | "deployment.deleted" | "release.created" | "release.updated" | "release.deleted";
+    release_id: string;
+    data?: T;
+    // Set when the change was too large to send; reload instead
+    truncated?: boolean;
+}